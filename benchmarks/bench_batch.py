@@ -0,0 +1,60 @@
+"""批量获取基准测试 - 对比逐个调用 url_fetcher 与 url_fetcher_batch 并发获取的总耗时。
+
+在本地夹具服务器上获取同一批文章，分别以 fetch_mode=browser 和 fetch_mode=http 运行，
+关闭结果缓存以保证每次都真实获取。
+
+运行方式：
+    uv run python -m benchmarks.bench_batch
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.fixture_server import fixture_server
+from browser_service import close_global_browser, initialize_global_browser
+from url_fetcher import close_http_client, url_fetcher, url_fetcher_batch
+
+URL_COUNT = 20
+CONCURRENCY_LEVELS = (5, 10)
+
+
+async def _sequential(urls: list[str], fetch_mode: str) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        result = json.loads(await url_fetcher(url, fetch_mode=fetch_mode))
+        assert result["success"], result["error"]
+    return time.perf_counter() - start
+
+
+async def _batch(urls: list[str], fetch_mode: str, concurrency: int) -> float:
+    start = time.perf_counter()
+    result = json.loads(await url_fetcher_batch(urls, fetch_mode=fetch_mode, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    assert result["success"], result["error"]
+    assert result["metadata"]["failed"] == 0, [r["error"] for r in result["results"] if not r["success"]]
+    return elapsed
+
+
+async def main():
+    os.environ["FETCHER_CACHE"] = "false"
+    await initialize_global_browser()
+    try:
+        with fixture_server() as base_url:
+            urls = [f"{base_url}/article/{index}" for index in range(URL_COUNT)]
+            print(f"{'mode':>8} {'strategy':>14} {'total(ms)':>10} {'speedup':>8}")
+            for fetch_mode in ("browser", "http"):
+                sequential = await _sequential(urls, fetch_mode)
+                print(f"{fetch_mode:>8} {'sequential':>14} {sequential * 1000:>10.1f} {1.0:>7.2f}x")
+                for concurrency in CONCURRENCY_LEVELS:
+                    elapsed = await _batch(urls, fetch_mode, concurrency)
+                    label = f"batch x{concurrency}"
+                    print(f"{fetch_mode:>8} {label:>14} {elapsed * 1000:>10.1f} {sequential / elapsed:>7.2f}x")
+    finally:
+        await close_global_browser()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
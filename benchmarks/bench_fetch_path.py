@@ -0,0 +1,53 @@
+"""获取路径基准测试 - 对比 url_fetcher 的 HTTP 快速路径和浏览器路径处理静态页面的延迟。
+
+在本地夹具服务器上用同一批静态文章分别以 fetch_mode=http 和 fetch_mode=browser 获取，
+统计端到端延迟（含正文提取和 Markdown 转换）。
+
+运行方式：
+    uv run python -m benchmarks.bench_fetch_path
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+from benchmarks.fixture_server import fixture_server
+from browser_service import close_global_browser, initialize_global_browser
+from url_fetcher import close_http_client, url_fetcher
+
+ROUNDS = 30
+
+
+async def _bench(base_url: str, fetch_mode: str) -> dict:
+    latencies = []
+    paths = set()
+    for index in range(ROUNDS):
+        start = time.perf_counter()
+        result = json.loads(await url_fetcher(f"{base_url}/article/{index}", fetch_mode=fetch_mode))
+        latencies.append(time.perf_counter() - start)
+        assert result["success"], result["error"]
+        paths.add(result["metadata"]["fetch_path"])
+    return {
+        "mode": fetch_mode,
+        "paths": ",".join(sorted(paths)),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+async def main():
+    await initialize_global_browser()
+    try:
+        with fixture_server() as base_url:
+            print(f"{'mode':>8} {'path':>8} {'p50(ms)':>10} {'max(ms)':>10}")
+            for fetch_mode in ("browser", "http", "auto"):
+                r = await _bench(base_url, fetch_mode)
+                print(f"{r['mode']:>8} {r['paths']:>8} {r['p50_ms']:>10.1f} {r['max_ms']:>10.1f}")
+    finally:
+        await close_global_browser()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
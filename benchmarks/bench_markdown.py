@@ -0,0 +1,59 @@
+"""Markdown 转换基准测试 - 对比 markdownify 与 fast 引擎的 HTML 转 Markdown 吞吐量。
+
+语料为 tests/test_html_parser_files/ 中的 HTML 夹具加上不同长度的夹具文章，每种引擎对整个语料重复转换
+ROUNDS 轮，按输入 HTML 的 UTF-8 字节数计算吞吐量（MB/s），并确认两种引擎的输出一致。
+
+运行方式：
+    uv run python -m benchmarks.bench_markdown
+"""
+
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.fixture_server import render_article
+from url_fetcher.html_parser import HTMLParser
+
+ROUNDS = 5
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "test_html_parser_files"
+
+
+def _corpus() -> list[str]:
+    documents = [path.read_text(encoding="utf-8") for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    documents += [render_article(index, paragraphs=paragraphs, images=10).decode("utf-8")
+                  for index, paragraphs in enumerate((40, 400, 4000))]
+    return documents
+
+
+def _bench(engine: str, corpus: list[str], total_bytes: int) -> tuple[dict, list[str]]:
+    parser = HTMLParser(engine)
+    durations = []
+    outputs = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        outputs = [parser._html_to_markdown(html, retain_images=True) for html in corpus]
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {
+        "engine": engine,
+        "median_ms": median * 1000,
+        "mb_per_s": total_bytes / median / (1024 * 1024),
+    }, outputs
+
+
+def main():
+    corpus = _corpus()
+    total_bytes = sum(len(html.encode("utf-8")) for html in corpus)
+    print(f"corpus: {len(corpus)} documents, {total_bytes / 1024:.0f} KB, {ROUNDS} rounds")
+    print(f"{'engine':>12} {'median(ms)':>12} {'MB/s':>8}")
+
+    results = {}
+    for engine in ("markdownify", "fast"):
+        r, results[engine] = _bench(engine, corpus, total_bytes)
+        print(f"{r['engine']:>12} {r['median_ms']:>12.1f} {r['mb_per_s']:>8.2f}")
+    print(f"outputs identical: {results['markdownify'] == results['fast']}")
+
+
+if __name__ == "__main__":
+    main()
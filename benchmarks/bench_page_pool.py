@@ -0,0 +1,82 @@
+"""页面池竞争基准测试 - 测量不同池大小下 acquire 的延迟。
+
+对每个池大小 N（10/50/100），先预热 N 个页面，再启动 N 个并发协程反复执行
+acquire/release，统计 acquire 延迟的分位数。
+
+运行方式：
+    uv run python -m benchmarks.bench_page_pool
+"""
+
+import asyncio
+import statistics
+import time
+
+from browser_service import BrowserConfig, BrowserService
+
+POOL_SIZES = (10, 50, 100)
+ROUNDS_PER_WORKER = 50
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct))
+    return ordered[index]
+
+
+async def _worker(service: BrowserService, latencies: list[float]):
+    for _ in range(ROUNDS_PER_WORKER):
+        start = time.perf_counter()
+        page = await service.create_page()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+        await service.release_page(page)
+
+
+async def _bench_pool_size(pool_size: int) -> dict:
+    # 只测量池本身的开销：上限等于池大小、不为交互式请求保留页面，关闭释放时的页面重置、
+    # 回收指标采样和自动伸缩，避免 acquire 等待后台的 about:blank 导航或 CDP 调用
+    config = BrowserConfig(
+        headless=True,
+        max_pages=pool_size,
+        max_cached_pages=pool_size,
+        initial_page_count=0,
+        reserved_interactive_pages=0,
+        reset_pages_on_release=False,
+        recycle_max_navigations=0,
+        recycle_max_js_heap_mb=0,
+        recycle_max_dom_nodes=0,
+        autoscale=False,
+    )
+    async with BrowserService(config) as service:
+        # 预热：一次性创建 pool_size 个页面并全部释放
+        pages = [await service.create_page() for _ in range(pool_size)]
+        for page in pages:
+            await service.release_page(page)
+
+        latencies: list[float] = []
+        start = time.perf_counter()
+        await asyncio.gather(*(_worker(service, latencies) for _ in range(pool_size)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "pool_size": pool_size,
+        "acquires": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": _percentile(latencies, 0.99) * 1e6,
+        "max_us": max(latencies) * 1e6,
+    }
+
+
+async def main():
+    print(f"{'pages':>6} {'acquires':>9} {'ops/s':>10} {'p50(us)':>10} {'p99(us)':>10} {'max(us)':>10}")
+    for pool_size in POOL_SIZES:
+        r = await _bench_pool_size(pool_size)
+        print(
+            f"{r['pool_size']:>6} {r['acquires']:>9} {r['ops_per_sec']:>10.0f} "
+            f"{r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {r['max_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
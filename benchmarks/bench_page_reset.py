@@ -0,0 +1,65 @@
+"""页面重置基准测试 - 对比释放时是否重置页面对复用页面导航延迟的影响。
+
+每轮在复用页面上先加载一篇带定时器和大量 DOM 的夹具文章，释放后再获取同一页面并导航到
+另一篇文章，测量第二次 goto 的耗时。开启重置时，上一站点的拆除在后台完成，不计入导航延迟。
+
+运行方式：
+    uv run python -m benchmarks.bench_page_reset
+"""
+
+import asyncio
+import statistics
+import time
+
+from benchmarks.fixture_server import fixture_server
+from browser_service import BrowserConfig, BrowserService
+
+ROUNDS = 30
+
+# 注入定时器、WebSocket 风格的长连接模拟和大量 DOM 节点，放大页面拆除成本
+HEAVY_STATE_JS = """() => {
+    for (let i = 0; i < 50; i++) setInterval(() => document.title, 10);
+    const root = document.createElement('div');
+    for (let i = 0; i < 20000; i++) root.appendChild(document.createElement('span'));
+    document.body.appendChild(root);
+}"""
+
+
+async def _bench(base_url: str, reset: bool) -> list[float]:
+    config = BrowserConfig(
+        headless=True,
+        max_pages=1,
+        max_cached_pages=1,
+        initial_page_count=1,
+        reset_pages_on_release=reset,
+        recycle_max_navigations=0,
+    )
+    latencies = []
+    async with BrowserService(config) as service:
+        for index in range(ROUNDS):
+            page = await service.create_page()
+            await page.goto(f"{base_url}/article/{index}", wait_until="load")
+            await page.evaluate(HEAVY_STATE_JS)
+            await service.release_page(page)
+
+            page = await service.create_page()
+            start = time.perf_counter()
+            await page.goto(f"{base_url}/article/{index + ROUNDS}", wait_until="load")
+            latencies.append(time.perf_counter() - start)
+            await service.release_page(page)
+    return latencies
+
+
+async def main():
+    with fixture_server() as base_url:
+        print(f"{'reset':>6} {'p50(ms)':>10} {'mean(ms)':>10} {'max(ms)':>10}")
+        for reset in (False, True):
+            latencies = await _bench(base_url, reset)
+            print(
+                f"{str(reset):>6} {statistics.median(latencies) * 1000:>10.1f} "
+                f"{statistics.mean(latencies) * 1000:>10.1f} {max(latencies) * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
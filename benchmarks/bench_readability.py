@@ -0,0 +1,90 @@
+"""Readability 注入基准测试 - 对比每次获取注入完整 Readability.js 与页面初始化脚本方式的提取开销。
+
+在本地夹具服务器的文章页面上分别执行两种提取方式，统计每次获取通过 CDP 发送的脚本字节数
+（page.evaluate 的表达式长度，初始化脚本方式另计页面第一次注册时发送的脚本）和提取阶段延迟。
+页面池复用页面，初始化脚本只在每个页面第一次用于获取时发送。
+
+运行方式：
+    uv run python -m benchmarks.bench_readability
+"""
+
+import asyncio
+import statistics
+import time
+
+from benchmarks.fixture_server import fixture_server
+from browser_service import close_global_browser, get_global_browser_service, initialize_global_browser
+from url_fetcher.web_client import (
+    EXTRACT_ARTICLE_JS,
+    READABILITY_INIT_SCRIPT_NAME,
+    _load_readability_init_script,
+    _load_readability_js,
+)
+
+ROUNDS = 30
+
+LEGACY_EXTRACT_JS = """() => {
+    const article = new Readability(document.cloneNode(true)).parse();
+    return article;
+}"""
+
+
+async def _extract_legacy(page) -> int:
+    """旧方式：每次获取都注入完整源码后再调用，返回发送的脚本字节数。"""
+    source = _load_readability_js()
+    await page.evaluate(source)
+    article = await page.evaluate(LEGACY_EXTRACT_JS)
+    assert article
+    return len(source.encode("utf-8")) + len(LEGACY_EXTRACT_JS)
+
+
+async def _extract_init_script(page) -> int:
+    """新方式：通过页面初始化脚本定义的加载函数调用，返回发送的脚本字节数。"""
+    extracted = await page.evaluate(EXTRACT_ARTICLE_JS, {})
+    assert extracted["loaded"] and extracted["article"]
+    return len(EXTRACT_ARTICLE_JS)
+
+
+async def _bench(browser_service, base_url: str, name: str, extract, init_script: bool) -> dict:
+    latencies = []
+    sent = 0
+    registered = set()
+    for index in range(ROUNDS):
+        page = await browser_service.create_page()
+        if init_script and id(page) not in registered:
+            # 与 WebClient 相同：页面第一次用于获取时注册，之后复用该页面不再发送
+            registered.add(id(page))
+            script = _load_readability_init_script()
+            await browser_service.add_page_init_script(page, READABILITY_INIT_SCRIPT_NAME, script)
+            sent += len(script.encode("utf-8"))
+        try:
+            await page.goto(f"{base_url}/article/{index}", wait_until="domcontentloaded")
+            start = time.perf_counter()
+            sent += await extract(page)
+            latencies.append(time.perf_counter() - start)
+        finally:
+            await browser_service.release_page(page)
+    return {
+        "name": name,
+        "bytes_per_fetch": sent / ROUNDS,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+async def main():
+    await initialize_global_browser()
+    try:
+        browser_service = await get_global_browser_service()
+        with fixture_server() as base_url:
+            print(f"{'mode':>12} {'bytes/fetch':>12} {'p50(ms)':>10} {'mean(ms)':>10}")
+            for name, extract, init_script in (("evaluate", _extract_legacy, False),
+                                               ("init_script", _extract_init_script, True)):
+                r = await _bench(browser_service, base_url, name, extract, init_script)
+                print(f"{r['name']:>12} {r['bytes_per_fetch']:>12.0f} {r['p50_ms']:>10.1f} {r['mean_ms']:>10.1f}")
+    finally:
+        await close_global_browser()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
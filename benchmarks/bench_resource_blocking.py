@@ -0,0 +1,49 @@
+"""资源拦截基准测试 - 对比 url_fetcher 拦截/不拦截非必要资源时的获取延迟和传输字节数。
+
+夹具文章附带样式表、字体和 30 张各 200KB 的配图，每个资源有 50ms 服务端延迟，模拟媒体密集的新闻站点。
+字节数按夹具服务器实际发送的响应体统计。
+
+运行方式：
+    uv run python -m benchmarks.bench_resource_blocking
+"""
+
+import asyncio
+import statistics
+import time
+
+from benchmarks.fixture_server import fixture_server, served_bytes
+from browser_service import BrowserConfig, BrowserService
+from url_fetcher.config import FetcherConfig
+from url_fetcher.web_client import WebClient
+
+ROUNDS = 20
+
+
+async def _bench(service: BrowserService, base_url: str, block: bool) -> dict:
+    client = WebClient(FetcherConfig(), browser_service=service)
+    latencies = []
+    bytes_before = served_bytes()
+    for index in range(ROUNDS):
+        start = time.perf_counter()
+        await client.fetch(f"{base_url}/media-article/{index}", timeout=30, block_resources=block)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "block": block,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "kb_per_fetch": (served_bytes() - bytes_before) / ROUNDS / 1024,
+    }
+
+
+async def main():
+    config = BrowserConfig(headless=True, initial_page_count=1, max_cached_pages=1)
+    with fixture_server() as base_url:
+        async with BrowserService(config) as service:
+            print(f"{'block':>6} {'p50(ms)':>10} {'max(ms)':>10} {'KB/fetch':>10}")
+            for block in (False, True):
+                r = await _bench(service, base_url, block)
+                print(f"{str(r['block']):>6} {r['p50_ms']:>10.1f} {r['max_ms']:>10.1f} {r['kb_per_fetch']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
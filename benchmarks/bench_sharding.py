@@ -0,0 +1,58 @@
+"""浏览器分片吞吐量基准测试 - 对比 1 个与 N 个浏览器分片的页面加载吞吐量。
+
+在本地夹具服务器上，以固定并发数反复执行 goto + evaluate，统计每秒完成的页面加载数。
+
+运行方式：
+    uv run python -m benchmarks.bench_sharding [分片数 N，默认为 CPU 核心数 / 4]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.fixture_server import fixture_server
+from browser_service import BrowserConfig, BrowserService
+
+CONCURRENCY = 32
+TOTAL_LOADS = 320
+
+
+async def _bench_shards(base_url: str, shard_count: int) -> float:
+    config = BrowserConfig(
+        headless=True,
+        max_pages=CONCURRENCY,
+        max_cached_pages=CONCURRENCY,
+        initial_page_count=0,
+        shard_count=shard_count,
+    )
+    counter = iter(range(TOTAL_LOADS))
+
+    async def worker(service: BrowserService):
+        for index in counter:
+            page = await service.create_page()
+            try:
+                await page.goto(f"{base_url}/article/{index}", wait_until="load")
+                await page.evaluate("() => document.body.innerText.length")
+            finally:
+                await service.release_page(page)
+
+    async with BrowserService(config) as service:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(service) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+
+    return TOTAL_LOADS / elapsed
+
+
+async def main():
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else max(1, (os.cpu_count() or 1) // 4)
+    with fixture_server() as base_url:
+        print(f"{'shards':>6} {'loads/s':>10}")
+        for shard_count in sorted({1, shards}):
+            throughput = await _bench_shards(base_url, shard_count)
+            print(f"{shard_count:>6} {throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""服务器启动基准测试 - 对比不同浏览器启动模式的就绪时间。
+
+对每种 BROWSER_STARTUP_MODE（eager/background/lazy），以 stdio 方式启动 MCP 服务器，测量：
+- 从启动进程到首次 list_tools 返回的时间
+- 从启动进程到首次 url_fetcher（本地夹具服务器）返回的时间
+
+运行方式：
+    uv run python -m benchmarks.bench_startup
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+from benchmarks.fixture_server import fixture_server
+
+STARTUP_MODES = ("eager", "background", "lazy")
+SERVER_PATH = Path(__file__).parent.parent / "mcp_stdio.py"
+
+
+async def _bench_mode(base_url: str, mode: str) -> tuple[float, float]:
+    env = {**os.environ, "BROWSER_STARTUP_MODE": mode, "BROWSER_HEADLESS": "true"}
+    transport = PythonStdioTransport(SERVER_PATH, env=env, cwd=str(SERVER_PATH.parent))
+
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        await client.list_tools()
+        list_tools_time = time.perf_counter() - start
+
+        result = await client.call_tool("url_fetcher", {"url": f"{base_url}/article/1"})
+        first_fetch_time = time.perf_counter() - start
+        assert json.loads(result.content[0].text)["success"], result.content[0].text
+
+    return list_tools_time, first_fetch_time
+
+
+async def main():
+    with fixture_server() as base_url:
+        print(f"{'mode':>10} {'list_tools(s)':>14} {'first_fetch(s)':>15}")
+        for mode in STARTUP_MODES:
+            list_tools_time, first_fetch_time = await _bench_mode(base_url, mode)
+            print(f"{mode:>10} {list_tools_time:>14.2f} {first_fetch_time:>15.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
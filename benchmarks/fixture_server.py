@@ -0,0 +1,121 @@
+"""基准测试用的本地 HTTP 夹具服务器。"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+# 模拟一篇中等长度的文章，并附带一段需要渲染进程执行的脚本
+ARTICLE_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Fixture Article {index}</title></head>
+<body>
+<header><nav><a href="/">Home</a> <a href="/about">About</a></nav></header>
+<article>
+<h1>Fixture Article {index}</h1>
+<p class="byline">By Fixture Author</p>
+{paragraphs}
+</article>
+<footer>Footer links</footer>
+<script>
+  let acc = 0;
+  for (let i = 0; i < 200000; i++) {{ acc += Math.sqrt(i); }}
+  document.body.dataset.acc = acc;
+</script>
+</body>
+</html>
+"""
+
+PARAGRAPH = (
+    "<p>Paragraph {n}: The quick brown fox jumps over the lazy dog. "
+    "Performance engineering is the practice of measuring before optimizing, "
+    "and of optimizing only what the measurements say matters.</p>"
+)
+
+
+# 模拟新闻站点的静态资源：样式表、字体和大量配图，每个资源有固定的服务端延迟
+MEDIA_ASSETS = """<link rel="stylesheet" href="/asset/site.css">
+<style>@font-face {{ font-family: Fixture; src: url(/asset/font.woff2); }} body {{ font-family: Fixture; }}</style>
+{images}
+"""
+
+ASSET_SIZE = 200 * 1024
+ASSET_DELAY = 0.05
+
+_served_bytes = 0
+_served_lock = threading.Lock()
+
+
+def render_article(index: int, paragraphs: int = 40, images: int = 0) -> bytes:
+    """生成一篇夹具文章的 HTML，images 大于 0 时附带样式表、字体和配图。"""
+    body = "\n".join(PARAGRAPH.format(n=n) for n in range(paragraphs))
+    if images:
+        image_tags = "\n".join(f'<p><img src="/asset/{index}-{n}.jpg" alt="figure {n}"></p>' for n in range(images))
+        body = MEDIA_ASSETS.format(images=image_tags) + body
+    return ARTICLE_HTML.format(index=index, paragraphs=body).encode("utf-8")
+
+
+def served_bytes() -> int:
+    """夹具服务器累计发送的响应体字节数。"""
+    return _served_bytes
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """为 /article/<n> 返回夹具文章，/media-article/<n> 返回带配图的文章，/asset/* 返回静态资源。
+
+    文章响应带有 ETag，请求的 If-None-Match 与之相同时返回 304。
+    """
+
+    def do_GET(self):
+        if self.path.startswith("/asset/"):
+            time.sleep(ASSET_DELAY)
+            self._send(bytes(ASSET_SIZE), "application/octet-stream")
+            return
+
+        try:
+            index = int(self.path.rstrip("/").rsplit("/", 1)[-1])
+        except ValueError:
+            index = 0
+        images = 30 if self.path.startswith("/media-article/") else 0
+        body = render_article(index, images=images)
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send(body, "text/html; charset=utf-8", etag)
+
+    def _send(self, body: bytes, content_type: str, etag: str | None = None):
+        global _served_bytes
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            return  # 客户端拦截或取消了请求
+        with _served_lock:
+            _served_bytes += len(body)
+
+    def log_message(self, fmt, *args):
+        """禁止输出日志。"""
+        pass
+
+
+@contextmanager
+def fixture_server() -> Iterator[str]:
+    """在后台线程启动夹具服务器，返回基础 URL（使用 localhost 主机名）。"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://localhost:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -2,13 +2,15 @@
 
 import asyncio
 
-from .browser_service import BrowserService
+from .browser_service import BrowserService, PagePriority
 from .config import BrowserConfig
 from .exceptions import (
+    BrowserCrashedError,
     BrowserError,
     BrowserInitializationError,
     PageClosedError,
     PageCreationError,
+    PoolExhaustedError,
 )
 
 _global_browser_service: BrowserService | None = None
@@ -31,11 +33,26 @@ async def initialize_global_browser():
         await service.initialize()
 
 
+async def start_global_browser():
+    """按配置的启动模式启动全局浏览器服务。
+
+    - eager：等待浏览器启动完成后返回
+    - background：在后台启动浏览器，立即返回
+    - lazy：不启动，首次获取页面时再启动
+    """
+    service = await get_global_browser_service()
+    mode = service.config.startup_mode
+    if mode == "background":
+        service.start_in_background()
+    elif mode != "lazy" and not service.is_initialized:
+        await service.initialize()
+
+
 async def close_global_browser():
     """关闭全局浏览器服务。"""
     global _global_browser_service
     async with _browser_service_lock:
-        if _global_browser_service and _global_browser_service.is_initialized:
+        if _global_browser_service:
             await _global_browser_service.close()
         _global_browser_service = None
 
@@ -43,11 +60,15 @@ async def close_global_browser():
 __all__ = [
     "BrowserService",
     "BrowserConfig",
+    "PagePriority",
+    "BrowserCrashedError",
     "BrowserError",
     "BrowserInitializationError",
     "PageClosedError",
     "PageCreationError",
+    "PoolExhaustedError",
     "get_global_browser_service",
     "initialize_global_browser",
+    "start_global_browser",
     "close_global_browser",
 ]
@@ -1,14 +1,46 @@
 """浏览器服务 - 使用 Playwright 管理浏览器和页面池。"""
 
 import asyncio
+import heapq
+import itertools
+import logging
+import math
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from enum import IntEnum
 from pathlib import Path
+from typing import Any
 
 from playwright.async_api import Browser, Page, BrowserContext, ViewportSize
 
 from browser_service.config import BrowserConfig
-from browser_service.exceptions import BrowserError, BrowserInitializationError, PageCreationError
+from browser_service.exceptions import (
+    BrowserCrashedError,
+    BrowserError,
+    BrowserInitializationError,
+    PageCreationError,
+    PoolExhaustedError,
+)
+
+# 配置日志
+logger = logging.getLogger("browser_service")
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    try:
+        log_dir = Path("log")
+        log_dir.mkdir(exist_ok=True)
+        log_file = log_dir / f"browser_service_{datetime.now().strftime('%Y%m%d')}.log"
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(handler)
+    except (OSError, PermissionError):
+        logger.addHandler(logging.NullHandler())
+
+# 比较统计是否变化时忽略的字段：需求 EWMA 在空闲时持续衰减，单独变化不值得记录
+_VOLATILE_STATS = ("demand_ewma",)
 
 script_content: str | None = None
 
@@ -35,182 +67,1053 @@ async def _apply_stealth_script(page_or_context: Page | BrowserContext):
         pass
 
 
+# 页面回收原因：导航次数、JS 堆内存、DOM 节点数、重置失败、渲染进程崩溃
+RECYCLE_REASONS = ("navigations", "js_heap", "dom_nodes", "reset_failed", "crashed")
+
+# 重置页面时导航到空白页的超时（毫秒）
+RESET_TIMEOUT_MS = 5000
+
+# 浏览器启动后在该时间（秒）内再次崩溃视为崩溃循环，重启前需要退避
+CRASH_LOOP_WINDOW = 60.0
+
+
+def _track_listeners(page: Page) -> list[tuple[str, Any]]:
+    """把页面的 on / once 替换为记录监听器的包装，返回记录列表。
+
+    页面池在挂载自身的监听器之后调用，之后调用方通过 on / once 挂载的监听器都会被记录，
+    归还时由 _remove_caller_listeners 用公共 API remove_listener 移除。
+    """
+    registered: list[tuple[str, Any]] = []
+    on, once = page.on, page.once
+
+    def tracked_on(event, f):
+        registered.append((event, f))
+        return on(event, f)
+
+    def tracked_once(event, f):
+        registered.append((event, f))
+        return once(event, f)
+
+    page.on = tracked_on
+    page.once = tracked_once
+    return registered
+
+
+def _remove_caller_listeners(page: Page, registered: list[tuple[str, Any]]):
+    """移除调用方在使用期间挂载的事件监听器，页面池自身的监听器不在记录中。"""
+    while registered:
+        event, listener = registered.pop()
+        try:
+            page.remove_listener(event, listener)
+        except Exception:
+            pass  # 调用方已自行移除，或 once 监听器已触发
+
+
+class PagePriority(IntEnum):
+    """页面获取优先级，数值越小优先级越高。"""
+    INTERACTIVE = 0  # 交互式会话（web_dev），用户在等待结果
+    SEARCH = 1  # 搜索请求
+    FETCH = 2  # 批量网页抓取
+
+
 @dataclass
 class PooledPage:
     """池化的页面对象。"""
     page: Page
     in_use: bool = False
     last_used: float = 0.0
+    navigations: int = 0
+    cdp_session: Any = None
+    resetting: bool = False
+    crashed: bool = False
+    listeners: list[tuple[str, Any]] = field(default_factory=list)
+    init_scripts: set[str] = field(default_factory=set)
+    holder: PagePriority | None = None
+
+
+@dataclass
+class WaitStats:
+    """单个优先级的等待统计。"""
+    waits: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    timeouts: int = 0
+
+
+@dataclass
+class PagePoolStats:
+    """页面池等待队列和回收统计。"""
+    waits_total: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    timeouts_total: int = 0
+    reaped_total: int = 0
+    prewarm_hits: int = 0
+    cold_starts: int = 0
+    recycled: dict[str, int] = field(default_factory=lambda: dict.fromkeys(RECYCLE_REASONS, 0))
+    by_priority: dict[PagePriority, WaitStats] = field(
+        default_factory=lambda: {priority: WaitStats() for priority in PagePriority}
+    )
+
+
+@dataclass(order=True)
+class _Waiter:
+    """等待队列中的条目，按 (优先级, 入队序号) 排序，同优先级内先到先得。"""
+    priority: PagePriority
+    seq: int
+    future: asyncio.Future = field(compare=False)
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    """计算命中率，没有样本时返回 0。"""
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+# 等待者被唤醒时收到的"名额已预留，请自行创建页面"信号
+_CREATE_SLOT = object()
 
 
 class PagePool:
-    """页面池管理器，复用页面以提高性能。"""
+    """页面池管理器，复用页面以提高性能。
+
+    使用 ``Page -> PooledPage`` 字典索引所有页面，空闲页面按 LRU 顺序保存在双端队列中
+    （左端最久未使用，右端最近使用），获取、释放和淘汰均为 O(1)。
+
+    页面总数（含使用中和创建中的页面）不超过 ``max_pages``。池满时获取者按 ``PagePriority``
+    进入优先级等待队列（同优先级内 FIFO），释放的页面直接交给优先级最高的等待者；超过
+    ``acquire_timeout`` 仍未获得页面时抛出 ``PoolExhaustedError``。为交互式请求保留
+    ``reserved_interactive_pages`` 个页面：搜索和抓取请求占用的页面数（使用中、重置中和创建中）
+    达到 ``max_pages - reserved_interactive_pages`` 后只能排队，批量抓取无法挤占交互式会话。
+
+    页面释放时检查回收策略：导航次数超过 ``recycle_max_navigations``，或通过 CDP
+    ``Performance.getMetrics`` 采样到的 JS 堆内存/DOM 节点数超过阈值时，关闭该页面并在后台
+    创建新页面替换，避免长期复用的页面不断累积状态。
+
+    释放操作立即返回，回收检查和页面重置（移除调用方的监听器和路由、导航到 about:blank、
+    恢复请求头和视口）在后台任务中完成，之后页面才回到空闲队列，下一次获取拿到的总是干净的页面。
+
+    ``reap_idle()`` 由后台维护任务定期调用，关闭空闲超过 ``page_idle_ttl`` 的页面，
+    但至少保留 ``min_idle_pages`` 个预热页面。
+
+    开启自动伸缩时，``autoscale()`` 由后台任务按 ``autoscale_interval`` 调用：用两次调用之间的
+    并发需求峰值（使用中 + 创建中 + 排队中）更新 EWMA，并在后台预先创建空闲页面，使
+    空闲数达到 ``ceil(EWMA * autoscale_headroom) - 使用中``；需求回落后目标随 EWMA 下降，
+    多出的空闲页面由 ``reap_idle()`` 按 TTL 清理。
+    """
 
     def __init__(self, context, config: BrowserConfig):
         self._context = context
         self._config = config
-        self._pool: list[PooledPage] = []
+        self._pages: dict[Page, PooledPage] = {}
+        self._idle: deque[PooledPage] = deque()
+        self._waiters: list[_Waiter] = []  # 最小堆，已完成（超时/取消）的条目延迟删除
+        self._queued = dict.fromkeys(PagePriority, 0)
+        self._waiter_seq = itertools.count()
+        self._creating = 0
+        self._resetting = 0
+        self._bulk_busy = 0  # 非交互式请求占用的页面和创建名额
+        self._demand_peak = 0
+        self._demand_ewma = 0.0
+        self._stats = PagePoolStats()
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
         self._lock = asyncio.Lock()
-        self._stealth_scripts: list[str] = []
+
+    @property
+    def is_closed(self) -> bool:
+        """页面池是否已关闭（浏览器关闭或崩溃后）。"""
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        """池中的页面总数（包括使用中的页面）。"""
+        return len(self._pages)
+
+    @property
+    def idle_count(self) -> int:
+        """池中空闲页面数量。"""
+        return len(self._idle)
+
+    @property
+    def in_use_count(self) -> int:
+        """使用中的页面数量（不含后台重置中的页面）。"""
+        return len(self._pages) - len(self._idle) - self._resetting
+
+    @property
+    def queue_depth(self) -> int:
+        """等待队列中仍在等待的获取者数量。"""
+        return sum(self._queued.values())
+
+    def is_page_lost(self, page: Page) -> bool:
+        """页面是否因浏览器或渲染进程崩溃而不可用。"""
+        pooled = self._pages.get(page)
+        return self._closed or page.is_closed() or (pooled is not None and pooled.crashed)
+
+    async def add_init_script(self, page: Page, name: str, script: str):
+        """在池中的页面上注册初始化脚本（按 name 去重），脚本随页面一直保留到页面关闭。"""
+        pooled = self._pages.get(page)
+        if pooled is not None and name in pooled.init_scripts:
+            return
+        await page.add_init_script(script)
+        if pooled is not None:
+            pooled.init_scripts.add(name)
+
+    def stats(self) -> dict:
+        """返回页面池的当前状态和等待统计。"""
+        return {
+            "live_pages": len(self._pages) + self._creating,
+            "in_use": self.in_use_count,
+            "idle": len(self._idle),
+            "resetting": self._resetting,
+            "max_pages": self._config.max_pages,
+            "queue_depth": self.queue_depth,
+            "waits_total": self._stats.waits_total,
+            "wait_time_total_ms": round(self._stats.wait_time_total * 1000, 1),
+            "wait_time_max_ms": round(self._stats.wait_time_max * 1000, 1),
+            "timeouts_total": self._stats.timeouts_total,
+            "reaped_total": self._stats.reaped_total,
+            "prewarm_hits": self._stats.prewarm_hits,
+            "cold_starts": self._stats.cold_starts,
+            "prewarm_hit_rate": _hit_rate(self._stats.prewarm_hits, self._stats.cold_starts),
+            "demand_ewma": round(self._demand_ewma, 2),
+            "target_idle": self._target_idle(),
+            **{f"recycled_{reason}": count for reason, count in self._stats.recycled.items()},
+            **self._priority_stats(),
+        }
+
+    def _priority_stats(self) -> dict:
+        """按优先级拆分的排队和等待统计，键名形如 ``interactive_wait_time_max_ms``。"""
+        result = {}
+        for priority, wait in self._stats.by_priority.items():
+            prefix = priority.name.lower()
+            result.update({
+                f"{prefix}_queue_depth": self._queued[priority],
+                f"{prefix}_waits": wait.waits,
+                f"{prefix}_wait_time_total_ms": round(wait.wait_time_total * 1000, 1),
+                f"{prefix}_wait_time_max_ms": round(wait.wait_time_max * 1000, 1),
+                f"{prefix}_timeouts": wait.timeouts,
+            })
+        return result
 
     async def initialize(self):
         """初始化页面池，预先创建指定数量的页面。"""
 
-        for _ in range(self._config.initial_page_count):
-            page = await self._context.new_page()
+        for _ in range(min(self._config.initial_page_count, self._config.max_pages)):
+            pooled = await self._open_page()
+            self._pages[pooled.page] = pooled
+            self._idle.append(pooled)
+
+    async def _open_page(self) -> PooledPage:
+        """创建新页面并挂载主框架导航计数（调用方需已预留名额）。"""
+        page = await self._context.new_page()
+        pooled = PooledPage(page=page, last_used=time.monotonic())
+
+        def on_frame_navigated(frame):
+            if frame.parent_frame is None and frame.url != "about:blank":
+                pooled.navigations += 1
 
-            pooled = PooledPage(
-                page=page,
-                in_use=False,
-                last_used=0.0
-            )
-            self._pool.append(pooled)
+        def on_crash(_page):
+            pooled.crashed = True
+
+        page.on("framenavigated", on_frame_navigated)
+        page.on("crash", on_crash)
+        pooled.listeners = _track_listeners(page)
+        return pooled
+
+    async def acquire(self, timeout: float | None = None, priority: PagePriority = PagePriority.FETCH) -> Page:
+        """获取一个页面（优先复用池中最近使用的空闲页面）。
+
+        Args:
+            timeout: 池满时的最长等待时间（秒），默认使用配置中的 acquire_timeout
+            priority: 获取优先级，池满时高优先级的请求先获得页面
+
+        Raises:
+            PoolExhaustedError: 等待超时仍没有可用页面
+            PageCreationError: 创建新页面失败
+        """
+        if timeout is None:
+            timeout = self._config.acquire_timeout
 
-    async def acquire(self) -> Page:
-        """获取一个页面（优先复用池中的空闲页面）。"""
         async with self._lock:
-            for pooled in self._pool:
-                if not pooled.in_use:
-                    pooled.in_use = True
-                    pooled.last_used = time.time()
-                    return pooled.page
+            # 统一先入队再调度：高优先级的新请求可以越过低优先级的等待者，
+            # 但不会越过同优先级或更高优先级中已经在排队的请求
+            waiter = self._enqueue(priority)
+            self._dispatch()
+            self._note_demand()
 
-            try:
-                page = await self._context.new_page()
+        if waiter.future.done():
+            return await self._take(waiter.future.result(), priority)
+        return await self._wait_for_page(waiter, timeout)
 
-                pooled = PooledPage(
-                    page=page,
-                    in_use=True,
-                    last_used=time.time()
-                )
-                self._pool.append(pooled)
-                return page
-            except Exception as e:
+    def _enqueue(self, priority: PagePriority) -> _Waiter:
+        """把获取者加入优先级等待队列（需持有锁）。"""
+        waiter = _Waiter(priority, next(self._waiter_seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        self._queued[priority] += 1
+        return waiter
+
+    async def _take(self, result, priority: PagePriority) -> Page:
+        """处理调度结果：交接来的页面直接使用，预留的名额则创建新页面。"""
+        if result is _CREATE_SLOT:
+            self._stats.cold_starts += 1
+            return await self._create_page(priority)
+        self._stats.prewarm_hits += 1
+        return result.page
+
+    async def _wait_for_page(self, waiter: _Waiter, timeout: float) -> Page:
+        """在优先级队列中等待释放的页面或空出的名额。"""
+        future = waiter.future
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and future.exception() is None:
+                # 超时/取消与交接同时发生：把已交接的页面或名额还给池
+                to_close = self._give_back(future.result(), waiter.priority)
+                await self._close_pages(to_close)
+            elif not future.done():
+                # 堆中的条目留待调度时延迟删除
+                future.cancel()
+                self._queued[waiter.priority] -= 1
+            self._record_wait(waiter.priority, time.monotonic() - start)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._stats.timeouts_total += 1
+            self._stats.by_priority[waiter.priority].timeouts += 1
+            raise PoolExhaustedError(
+                f"页面池已满（上限 {self._config.max_pages} 个页面），等待 {timeout} 秒后仍无可用页面"
+            ) from None
+
+        self._record_wait(waiter.priority, time.monotonic() - start)
+        return await self._take(result, waiter.priority)
+
+    def _record_wait(self, priority: PagePriority, waited: float):
+        self._stats.waits_total += 1
+        self._stats.wait_time_total += waited
+        self._stats.wait_time_max = max(self._stats.wait_time_max, waited)
+
+        wait = self._stats.by_priority[priority]
+        wait.waits += 1
+        wait.wait_time_total += waited
+        wait.wait_time_max = max(wait.wait_time_max, waited)
+
+    async def _create_page(self, priority: PagePriority) -> Page:
+        """使用已预留的名额创建新页面（在锁外执行，避免慢速的 new_page() 阻塞其他操作）。"""
+        try:
+            pooled = await self._open_page()
+        except BaseException as e:
+            async with self._lock:
+                self._creating -= 1
+                self._unhold(priority)
+                self._dispatch()
+            if isinstance(e, Exception):
                 raise PageCreationError(f"创建新页面失败: {e}") from e
+            raise
+
+        async with self._lock:
+            self._creating -= 1
+            self._pages[pooled.page] = pooled
+            pooled.holder = priority
+            return self._checkout(pooled)
+
+    async def _create_idle_page(self):
+        """在后台创建页面（名额已预留），创建后交给等待者或放回空闲队列。"""
+        try:
+            pooled = await self._open_page()
+        except Exception:
+            async with self._lock:
+                self._creating -= 1
+                self._dispatch()
+            return
+
+        async with self._lock:
+            self._creating -= 1
+            self._pages[pooled.page] = pooled
+            pooled.in_use = True
+            to_close = self._give_back(pooled)
+        await self._close_pages(to_close)
+
+    def _spawn(self, coro):
+        """启动后台任务并保持引用，避免任务被垃圾回收。"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     async def release(self, page: Page):
-        """释放页面回池中。"""
+        """释放页面回池中。
+
+        立即返回，回收检查和页面重置在后台完成，不占用调用方的关键路径。
+        """
         async with self._lock:
-            for pooled in self._pool:
-                if pooled.page == page:
-                    pooled.in_use = False
-                    pooled.last_used = time.time()
-                    break
+            pooled = self._pages.get(page)
+            if pooled is None or not pooled.in_use or pooled.resetting:
+                return
 
-            await self._cleanup_if_needed()
+            pooled.resetting = True
+            self._resetting += 1
+            self._spawn(self._recycle_or_reset(pooled))
 
-    async def _cleanup_if_needed(self):
-        """如果缓存的页面数超过配置，关闭最旧的未使用页面。"""
-        if len(self._pool) <= self._config.max_cached_pages:
-            return
+    async def _recycle_or_reset(self, pooled: PooledPage):
+        """后台任务：超过回收阈值的页面被关闭并替换，其余页面重置后放回池中。"""
+        try:
+            reason = await self._recycle_reason(pooled)
+            if reason is None and self._config.reset_pages_on_release and not pooled.page.is_closed():
+                if not await self._reset_page(pooled):
+                    reason = "reset_failed"
+        finally:
+            pooled.resetting = False
+            self._resetting -= 1
+
+        async with self._lock:
+            if self._pages.get(pooled.page) is not pooled:
+                return  # 页面池已关闭
 
-        unused = [p for p in self._pool if not p.in_use]
-        excess_count = len(self._pool) - self._config.max_cached_pages
-        to_close = min(excess_count, len(unused))
+            if reason is not None:
+                to_close = self._recycle(pooled, reason)
+            else:
+                to_close = self._give_back(pooled)
 
-        if to_close == 0:
-            return
+        await self._close_pages(to_close)
+
+    async def _reset_page(self, pooled: PooledPage) -> bool:
+        """清除上一个使用者留下的状态，返回是否重置成功。"""
+        page = pooled.page
+        try:
+            _remove_caller_listeners(page, pooled.listeners)
+            await page.unroute_all(behavior="ignoreErrors")
+            # 导航到空白页，卸载上一个站点的 DOM、定时器和 WebSocket
+            await page.goto("about:blank", timeout=RESET_TIMEOUT_MS)
+            await page.set_extra_http_headers({})
+            viewport = {"width": self._config.viewport_width, "height": self._config.viewport_height}
+            if page.viewport_size != viewport:
+                await page.set_viewport_size(viewport)
+            return True
+        except Exception:
+            return False
+
+    async def _recycle_reason(self, pooled: PooledPage) -> str | None:
+        """检查页面是否需要回收，返回回收原因；不需要回收时返回 None。"""
+        config = self._config
+        if pooled.page.is_closed():
+            return None
+        if pooled.crashed:
+            return "crashed"
+        if config.recycle_max_navigations and pooled.navigations >= config.recycle_max_navigations:
+            return "navigations"
+        if not (config.recycle_max_js_heap_mb or config.recycle_max_dom_nodes):
+            return None
+
+        try:
+            if pooled.cdp_session is None:
+                pooled.cdp_session = await self._context.new_cdp_session(pooled.page)
+                await pooled.cdp_session.send("Performance.enable")
+            response = await pooled.cdp_session.send("Performance.getMetrics")
+        except Exception:
+            return None  # 指标采样失败不影响页面复用
+
+        metrics = {item["name"]: item["value"] for item in response.get("metrics", [])}
+        if config.recycle_max_js_heap_mb and \
+                metrics.get("JSHeapUsedSize", 0) > config.recycle_max_js_heap_mb * 1024 * 1024:
+            return "js_heap"
+        if config.recycle_max_dom_nodes and metrics.get("Nodes", 0) > config.recycle_max_dom_nodes:
+            return "dom_nodes"
+        return None
+
+    def _recycle(self, pooled: PooledPage, reason: str) -> list[PooledPage]:
+        """回收页面：从池中移除，并把空出的名额交给等待者或用于后台创建替换页面（需持有锁）。"""
+        del self._pages[pooled.page]
+        pooled.in_use = False
+        self._unhold(pooled.holder)
+        self._stats.recycled[reason] += 1
+
+        if self.queue_depth:
+            self._dispatch()
+        elif self._has_free_slot():
+            self._creating += 1
+            self._spawn(self._create_idle_page())
+        return [pooled]
+
+    def _has_free_slot(self) -> bool:
+        """页面总数（含创建中）是否低于 max_pages（需持有锁）。"""
+        return len(self._pages) + self._creating < self._config.max_pages
+
+    def _within_share(self, priority: PagePriority) -> bool:
+        """该优先级能否再占用一个页面（需持有锁）。
+
+        交互式请求不受限制；搜索和抓取请求合计最多占用 ``max_pages - reserved_interactive_pages`` 个页面。
+        """
+        if priority == PagePriority.INTERACTIVE:
+            return True
+        return self._bulk_busy < max(1, self._config.max_pages - self._config.reserved_interactive_pages)
+
+    def _hold(self, priority: PagePriority | None):
+        if priority is not None and priority != PagePriority.INTERACTIVE:
+            self._bulk_busy += 1
 
-        unused.sort(key=lambda p: p.last_used)
-        for pooled in unused[:to_close]:
+    def _unhold(self, priority: PagePriority | None):
+        if priority is not None and priority != PagePriority.INTERACTIVE:
+            self._bulk_busy -= 1
+
+    def _pop_idle(self) -> PooledPage | None:
+        """弹出最近使用的可用空闲页面（需持有锁）。"""
+        while self._idle:
+            pooled = self._idle.pop()
+            if not pooled.page.is_closed():
+                return pooled
+            # 页面已被外部关闭，直接从索引中移除
+            del self._pages[pooled.page]
+        return None
+
+    @staticmethod
+    def _checkout(pooled: PooledPage) -> Page:
+        pooled.in_use = True
+        pooled.last_used = time.monotonic()
+        return pooled.page
+
+    def _give_back(self, item, priority: PagePriority | None = None) -> list[PooledPage]:
+        """归还页面或未使用的创建名额：优先交给最高优先级的等待者，否则放回空闲队列（需持有锁）。
+
+        Args:
+            item: 归还的页面或 ``_CREATE_SLOT``
+            priority: 归还创建名额时，原先获得该名额的优先级
+
+        Returns:
+            需要在锁外关闭的页面列表
+        """
+        if item is _CREATE_SLOT:
+            self._creating -= 1
+            self._unhold(priority)
+            self._dispatch()
+            return []
+
+        pooled: PooledPage = item
+        self._unhold(pooled.holder)
+        pooled.holder = None
+        pooled.in_use = False
+        pooled.last_used = time.monotonic()
+        if pooled.page.is_closed():
+            del self._pages[pooled.page]
+            self._dispatch()
+            return []
+
+        self._idle.append(pooled)
+        self._dispatch()
+        return self._evict_if_needed()
+
+    def _dispatch(self):
+        """按优先级把空闲页面或空出的名额分配给等待者（需持有锁）。
+
+        队首等待者因保留名额无法获得页面时停止调度：队列中其余等待者的优先级不会更高。
+        """
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.future.done():
+                heapq.heappop(self._waiters)  # 已超时或取消的条目
+                continue
+            if not self._within_share(waiter.priority):
+                return
+
+            pooled = self._pop_idle()
+            if pooled is not None:
+                pooled.holder = waiter.priority
+                self._checkout(pooled)
+                result = pooled
+            elif self._has_free_slot():
+                self._creating += 1
+                result = _CREATE_SLOT
+            else:
+                return
+
+            self._hold(waiter.priority)
+            heapq.heappop(self._waiters)
+            self._queued[waiter.priority] -= 1
+            waiter.future.set_result(result)
+
+    def _evict_if_needed(self) -> list[PooledPage]:
+        """如果缓存的页面数超过配置，从空闲队列左端淘汰最久未使用的页面（需持有锁）。"""
+        evicted = []
+        while len(self._pages) > self._config.max_cached_pages and self._idle:
+            pooled = self._idle.popleft()
+            del self._pages[pooled.page]
+            evicted.append(pooled)
+        return evicted
+
+    def _note_demand(self):
+        """记录当前并发需求，供自动伸缩取两次采样之间的峰值（需持有锁）。"""
+        demand = self.in_use_count + self._creating + self.queue_depth
+        self._demand_peak = max(self._demand_peak, demand)
+
+    def _target_idle(self) -> int:
+        """根据需求 EWMA 计算应保持的空闲页面数。"""
+        target = self._config.min_idle_pages
+        if self._config.autoscale:
+            expected = math.ceil(self._demand_ewma * self._config.autoscale_headroom)
+            target = max(target, expected - self.in_use_count)
+        return max(0, min(target, self._config.max_cached_pages - self.in_use_count))
+
+    async def autoscale(self) -> int:
+        """更新需求 EWMA，并在后台预先创建页面补足目标空闲数。
+
+        Returns:
+            本次启动创建的页面数量
+        """
+        async with self._lock:
+            demand = max(self._demand_peak, self.in_use_count + self._creating + self.queue_depth)
+            alpha = self._config.autoscale_alpha
+            self._demand_ewma = alpha * demand + (1 - alpha) * self._demand_ewma
+            self._demand_peak = 0
+
+            deficit = self._target_idle() - len(self._idle) - self._creating
+            started = 0
+            while started < deficit and self._has_free_slot():
+                self._creating += 1
+                self._spawn(self._create_idle_page())
+                started += 1
+        return started
+
+    async def reap_idle(self) -> int:
+        """关闭空闲超过 TTL 的页面，至少保留目标空闲数（不少于 min_idle_pages）个预热页面。
+
+        空闲队列按 LRU 排序，只需从左端检查，遇到未超时的页面即可停止。
+
+        Returns:
+            关闭的页面数量
+        """
+        if not self._config.page_idle_ttl:
+            return 0
+
+        deadline = time.monotonic() - self._config.page_idle_ttl
+        reaped = []
+        async with self._lock:
+            keep = self._target_idle()
+            while len(self._idle) > keep and self._idle[0].last_used < deadline:
+                pooled = self._idle.popleft()
+                del self._pages[pooled.page]
+                reaped.append(pooled)
+            self._stats.reaped_total += len(reaped)
+
+        await self._close_pages(reaped)
+        return len(reaped)
+
+    @staticmethod
+    async def _close_pages(pooled_pages: list[PooledPage]):
+        """关闭一组页面，忽略关闭时的错误。"""
+        for pooled in pooled_pages:
             try:
                 await pooled.page.close()
             except Exception:
                 pass  # 关闭页面时的错误不影响清理流程
-            self._pool.remove(pooled)
 
-    async def close_all(self):
-        """关闭池中的所有页面。"""
+    async def close_all(self, error: BrowserError | None = None):
+        """关闭池中的所有页面，并让所有等待者失败。
+
+        Args:
+            error: 抛给等待者的异常，默认为"页面池已关闭"
+        """
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+
         async with self._lock:
-            for pooled in self._pool:
-                try:
-                    await pooled.page.close()
-                except Exception:
-                    pass  # 关闭页面时的错误不影响清理流程
-            self._pool.clear()
+            pooled_pages = list(self._pages.values())
+            self._pages.clear()
+            self._idle.clear()
+            for waiter in self._waiters:
+                if not waiter.future.done():
+                    waiter.future.set_exception(error or BrowserError("页面池已关闭"))
+            self._waiters.clear()
+            self._queued = dict.fromkeys(PagePriority, 0)
+            self._bulk_busy = 0
+
+        await self._close_pages(pooled_pages)
+
+
+class BrowserShard:
+    """单个浏览器分片：一个浏览器进程、一个 context 和对应的页面池。"""
+
+    def __init__(self, index: int, config: BrowserConfig, on_disconnected=None):
+        self.index = index
+        self.config = config
+        self.browser: Browser | None = None
+        self.context: BrowserContext | None = None
+        self.page_pool: PagePool | None = None
+        self.ready = asyncio.Event()
+        self.launched_at = 0.0
+        self._closing = False
+        self._on_disconnected = on_disconnected
+
+    @property
+    def load(self) -> float:
+        """分片负载：使用中、创建中和排队中的页面数占页面上限的比例。"""
+        if self.page_pool is None or not self.ready.is_set():
+            return float("inf")
+        stats = self.page_pool.stats()
+        busy = stats["live_pages"] - stats["idle"] + stats["queue_depth"]
+        return busy / self.config.max_pages
+
+    async def launch(self, playwright):
+        """启动浏览器进程，创建 context 并初始化页面池。"""
+        self.browser = await playwright.chromium.launch(
+            headless=self.config.headless,
+            args=[
+                "--no-sandbox",
+                "--disable-setuid-sandbox",
+                "--disable-blink-features=AutomationControlled",
+                "--disable-infobars",
+            ],
+            channel="chrome",
+        )
+        self.launched_at = time.monotonic()
+        if self._on_disconnected is not None:
+            browser = self.browser
+            browser.on("disconnected", lambda _browser: self._handle_disconnected(browser))
+
+        self.context = await self.browser.new_context(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36",
+            viewport=ViewportSize(width=self.config.viewport_width, height=self.config.viewport_height),
+            device_scale_factor=1,
+            is_mobile=False,
+            has_touch=False,
+            default_browser_type="chromium",
+        )
+        await _apply_stealth_script(self.context)
+
+        self.page_pool = PagePool(
+            context=self.context,
+            config=self.config
+        )
+
+        await self.page_pool.initialize()
+        self.ready.set()
+
+    def _handle_disconnected(self, browser: Browser):
+        """浏览器连接断开：非主动关闭时视为崩溃，通知浏览器服务重启该分片。"""
+        if self._closing or browser is not self.browser:
+            return
+        self.ready.clear()
+        self._on_disconnected(self)
+
+    async def discard(self, error: BrowserError):
+        """丢弃已崩溃的浏览器：让页面池等待者以 error 失败，并清理残留资源。"""
+        self.ready.clear()
+        page_pool, context, browser = self.page_pool, self.context, self.browser
+        self.page_pool = self.context = self.browser = None
+        if page_pool:
+            await page_pool.close_all(error)
+        for resource in (context, browser):
+            if resource is None:
+                continue
+            try:
+                await resource.close()
+            except Exception:
+                pass  # 浏览器已崩溃，关闭残留资源的错误可以忽略
+
+    async def close(self):
+        """关闭页面池、context 和浏览器进程。"""
+        self._closing = True
+        self.ready.clear()
+        if self.page_pool:
+            await self.page_pool.close_all()
+            self.page_pool = None
+        if self.context:
+            await self.context.close()
+            self.context = None
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+
+
+def _split(total: int, count: int, index: int) -> int:
+    """把 total 平均分成 count 份，返回第 index 份的数量。"""
+    return total // count + (1 if index < total % count else 0)
+
+
+def _shard_configs(config: BrowserConfig) -> list[BrowserConfig]:
+    """把页面数量上限和初始页面数平均分配到各个分片。
+
+    交互式保留页面数向上取整分配，保证每个分片都为交互式请求留有余量。
+    """
+    count = config.shard_count
+    configs = []
+    for index in range(count):
+        max_pages = max(1, config.max_pages // count)
+        configs.append(replace(
+            config,
+            max_pages=max_pages,
+            reserved_interactive_pages=min(-(-config.reserved_interactive_pages // count), max_pages - 1),
+            max_cached_pages=max(1, config.max_cached_pages // count),
+            initial_page_count=_split(config.initial_page_count, count, index),
+            min_idle_pages=_split(config.min_idle_pages, count, index),
+        ))
+    return configs
 
 
 class BrowserService:
-    """浏览器服务，使用 Playwright 管理浏览器生命周期和页面池。"""
+    """浏览器服务，使用 Playwright 管理浏览器生命周期和页面池。
+
+    ``shard_count`` 大于 1 时启动多个浏览器进程（分片），每个分片拥有独立的 context 和
+    页面池，``create_page()`` 选择负载最低的分片，``release_page()`` 把页面还给其所属分片。
+
+    初始化后启动后台维护任务，定期清理空闲超时的页面，``close()`` 时停止。
+
+    浏览器崩溃或被 OOM 杀死时（``disconnected`` 事件），该分片的页面池被丢弃、等待者收到
+    ``BrowserCrashedError``，随后在后台按指数退避重启分片；重启期间 ``create_page()`` 只路由到
+    可用分片，全部不可用时等待重启完成。
+
+    除了直接 ``await initialize()``，也可以用 ``start_in_background()`` 在后台启动浏览器；
+    ``startup_mode`` 为 ``background`` 或 ``lazy`` 时，``create_page()`` 会先等待（或触发）启动完成。
+    """
 
     def __init__(self, config: BrowserConfig | None = None):
         self.config = config or BrowserConfig.from_env()
-        self._browser: Browser | None = None
         self._playwright = None
-        self._context = None
-        self._page_pool: PagePool | None = None
+        self._shards: list[BrowserShard] = []
+        self._page_pools: dict[Page, PagePool] = {}
+        self._maintenance_task: asyncio.Task | None = None
+        self._recovery_tasks: set[asyncio.Task] = set()
+        self._restarts = 0
+        self._init_task: asyncio.Task | None = None
+        self._logged_stats: dict | None = None
 
     @property
     def is_initialized(self) -> bool:
         """检查浏览器是否已初始化。"""
-        return self._browser is not None
+        return bool(self._shards)
+
+    @property
+    def shard_count(self) -> int:
+        """已启动的浏览器分片数量。"""
+        return len(self._shards)
 
     async def initialize(self):
-        """初始化浏览器实例。"""
-        if self._browser is not None:
+        """初始化浏览器实例（分片模式下并发启动所有分片）。"""
+        if self._shards:
             return
 
         await _load_stealth_script()
+        shards = [
+            BrowserShard(index, config, on_disconnected=self._on_shard_disconnected)
+            for index, config in enumerate(_shard_configs(self.config))
+        ]
         try:
             from playwright.async_api import async_playwright
 
             self._playwright = await async_playwright().start()
 
-            self._browser = await self._playwright.chromium.launch(
-                headless=self.config.headless,
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-infobars",
-                ],
-                channel="chrome",
-            )
-
-            self._context = await self._browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36",
-                viewport=ViewportSize(width=self.config.viewport_width, height=self.config.viewport_height),
-                device_scale_factor=1,
-                is_mobile=False,
-                has_touch=False,
-                default_browser_type="chromium",
-            )
-            await _apply_stealth_script(self._context)
-
-            self._page_pool = PagePool(
-                context=self._context,
-                config=self.config
-            )
-
-            await self._page_pool.initialize()
+            await asyncio.gather(*(shard.launch(self._playwright) for shard in shards))
+            self._shards = shards
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
 
         except Exception as e:
+            for shard in shards:
+                try:
+                    await shard.close()
+                except Exception:
+                    pass
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
             raise BrowserInitializationError(f"浏览器初始化失败: {e}") from e
 
-    async def create_page(self) -> Page:
-        """从页面池获取一个页面。"""
-        if self._page_pool is None:
-            raise BrowserError(
-                "浏览器未初始化，请先调用 initialize() 方法"
-            )
-        return await self._page_pool.acquire()
+    def start_in_background(self):
+        """在后台任务中启动浏览器，立即返回。"""
+        if self._shards or self._init_task is not None:
+            return
+        self._init_task = asyncio.create_task(self.initialize())
+
+    async def ensure_ready(self):
+        """等待浏览器启动完成；尚未开始启动时立即启动。
+
+        Raises:
+            BrowserInitializationError: 启动失败（下一次调用会重新尝试启动）
+        """
+        if self._shards:
+            return
+        if self._init_task is None:
+            self._init_task = asyncio.create_task(self.initialize())
+        task = self._init_task
+        try:
+            await asyncio.shield(task)
+        except BrowserInitializationError:
+            if self._init_task is task:
+                self._init_task = None
+            raise
+
+    async def _maintenance_loop(self):
+        """后台维护任务：按 autoscale_interval 自动伸缩预热页面，按 maintenance_interval 清理空闲超时的页面。"""
+        tick = self.config.maintenance_interval
+        if self.config.autoscale:
+            tick = min(tick, self.config.autoscale_interval)
+        last_reap = time.monotonic()
+
+        while True:
+            await asyncio.sleep(tick)
+            reap = time.monotonic() - last_reap >= self.config.maintenance_interval
+            if reap:
+                last_reap = time.monotonic()
+
+            for shard in self._shards:
+                if shard.page_pool is None:
+                    continue
+                try:
+                    if self.config.autoscale:
+                        started = await shard.page_pool.autoscale()
+                        if started:
+                            logger.info(f"AUTOSCALE - shard={shard.index}, started={started}, "
+                                        f"demand_ewma={shard.page_pool.stats()['demand_ewma']}")
+                    if reap:
+                        await shard.page_pool.reap_idle()
+                except Exception:
+                    pass  # 维护任务的错误不影响后续执行
+            if reap:
+                self.log_stats_if_changed()
+
+    def log_stats_if_changed(self):
+        """统计信息（忽略 demand_ewma）与上次记录相比有变化时写入日志，空闲时不重复记录。"""
+        stats = self.get_stats()
+        if not stats:
+            return
+        comparable = {key: value for key, value in stats.items() if key not in _VOLATILE_STATS}
+        if comparable == self._logged_stats:
+            return
+        self._logged_stats = comparable
+        logger.info(f"POOL STATS - {stats}")
+
+    def _on_shard_disconnected(self, shard: BrowserShard):
+        """分片浏览器崩溃时启动后台恢复任务。"""
+        task = asyncio.create_task(self._recover_shard(shard))
+        self._recovery_tasks.add(task)
+        task.add_done_callback(self._recovery_tasks.discard)
+
+    async def _recover_shard(self, shard: BrowserShard):
+        """丢弃崩溃的分片并按指数退避重启，直到成功或服务关闭。"""
+        # 启动后很快再次崩溃时先退避，避免崩溃循环
+        crashed_quickly = time.monotonic() - shard.launched_at < CRASH_LOOP_WINDOW
+        delay = self.config.relaunch_initial_backoff if crashed_quickly else 0.0
+        await shard.discard(BrowserCrashedError("浏览器已崩溃，正在重启"))
+
+        while self._shards:
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                await shard.launch(self._playwright)
+                self._restarts += 1
+                return
+            except Exception:
+                await shard.discard(BrowserCrashedError("浏览器已崩溃，正在重启"))
+                delay = min(max(delay * 2, self.config.relaunch_initial_backoff), self.config.relaunch_max_backoff)
+
+    async def add_page_init_script(self, page: Page, name: str, script: str):
+        """在页面上注册初始化脚本，对该页面之后的每次导航生效，直到页面关闭（按 name 去重）。
+
+        只有部分使用者需要的大段脚本（如 url_fetcher 的 Readability.js）在第一次需要时注册到所用的页面，
+        同一页面之后被复用时不再重复发送；不需要的使用者只在复用到这些页面时才会执行该脚本。
+        """
+        page_pool = self._page_pools.get(page)
+        if page_pool is None:
+            await page.add_init_script(script)
+            return
+        await page_pool.add_init_script(page, name, script)
+
+    async def _pick_shard(self, timeout: float) -> BrowserShard:
+        """选择负载最低的可用分片；全部分片都在重启时等待其中一个就绪。"""
+        ready = [shard for shard in self._shards if shard.ready.is_set()]
+        if ready:
+            return min(ready, key=lambda s: s.load)
+
+        waits = [asyncio.create_task(shard.ready.wait()) for shard in self._shards]
+        try:
+            done, _ = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in waits:
+                task.cancel()
+        if not done:
+            raise BrowserCrashedError(f"浏览器正在重启，{timeout} 秒内未恢复")
+        return await self._pick_shard(timeout)
+
+    async def create_page(
+        self,
+        timeout: float | None = None,
+        priority: PagePriority = PagePriority.FETCH,
+    ) -> Page:
+        """从负载最低的分片的页面池获取一个页面。
+
+        Args:
+            timeout: 池满时的最长等待时间（秒），默认使用配置中的 acquire_timeout
+            priority: 获取优先级，池满时交互式 > 搜索 > 抓取
+
+        Raises:
+            PoolExhaustedError: 页面池已满且等待超时
+            BrowserCrashedError: 浏览器崩溃且在超时时间内未恢复
+        """
+        if not self._shards:
+            # background/lazy 模式总是经 ensure_ready() 启动，上一次启动失败后会重新尝试
+            if self._init_task is None and self.config.startup_mode == "eager":
+                raise BrowserError(
+                    "浏览器未初始化，请先调用 initialize() 方法"
+                )
+            await self.ensure_ready()
+        if timeout is None:
+            timeout = self.config.acquire_timeout
+        shard = await self._pick_shard(timeout)
+        page_pool = shard.page_pool
+        page = await page_pool.acquire(timeout, priority)
+        self._page_pools[page] = page_pool
+        return page
 
     async def release_page(self, page: Page):
-        """释放页面回池中。"""
-        if self._page_pool:
-            await self._page_pool.release(page)
+        """释放页面回其所属分片的页面池（崩溃前获取的页面会被忽略）。"""
+        page_pool = self._page_pools.pop(page, None)
+        if page_pool and not page_pool.is_closed:
+            await page_pool.release(page)
+
+    def is_page_lost(self, page: Page) -> bool:
+        """页面是否因浏览器或渲染进程崩溃而不可用，调用方据此决定是否重试。"""
+        page_pool = self._page_pools.get(page)
+        return page_pool is not None and page_pool.is_page_lost(page)
+
+    def get_stats(self) -> dict:
+        """获取页面池统计信息（队列深度、等待时间等），分片模式下汇总所有分片。"""
+        shard_stats = [shard.page_pool.stats() for shard in self._shards if shard.page_pool]
+        if not shard_stats:
+            return {}
+
+        stats = {}
+        for key in shard_stats[0]:
+            values = [item[key] for item in shard_stats]
+            stats[key] = max(values) if key.endswith("_max_ms") else sum(values)
+            if key.endswith("_ms"):
+                stats[key] = round(stats[key], 1)
+        stats["demand_ewma"] = round(stats["demand_ewma"], 2)
+        stats["prewarm_hit_rate"] = _hit_rate(stats["prewarm_hits"], stats["cold_starts"])
+        stats["browser_restarts"] = self._restarts
+        if len(shard_stats) > 1:
+            stats["shards"] = shard_stats
+        return stats
 
     async def close(self):
-        """关闭浏览器和 Playwright 实例。"""
-        if self._page_pool:
-            await self._page_pool.close_all()
-            self._page_pool = None
-        if self._context:
-            await self._context.close()
-            self._context = None
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
+        """关闭所有浏览器分片和 Playwright 实例。"""
+        if self._init_task is not None:
+            # 等待进行中的后台启动结束，再统一关闭其启动的资源
+            try:
+                await self._init_task
+            except Exception:
+                pass
+            self._init_task = None
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        shards, self._shards = self._shards, []
+        self._page_pools.clear()
+        for task in list(self._recovery_tasks):
+            task.cancel()
+        for shard in shards:
+            await shard.close()
         if self._playwright:
             await self._playwright.stop()
             self._playwright = None
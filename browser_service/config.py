@@ -11,6 +11,24 @@ class BrowserConfig:
     headless: bool = False
     max_cached_pages: int = 10
     initial_page_count: int = 1
+    max_pages: int = 50
+    acquire_timeout: float = 30.0
+    reserved_interactive_pages: int = 2
+    shard_count: int = 1
+    recycle_max_navigations: int = 50
+    recycle_max_js_heap_mb: int = 256
+    recycle_max_dom_nodes: int = 100000
+    page_idle_ttl: float = 300.0
+    min_idle_pages: int = 1
+    maintenance_interval: float = 30.0
+    reset_pages_on_release: bool = True
+    autoscale: bool = True
+    autoscale_interval: float = 1.0
+    autoscale_alpha: float = 0.3
+    autoscale_headroom: float = 1.5
+    relaunch_initial_backoff: float = 1.0
+    relaunch_max_backoff: float = 30.0
+    startup_mode: str = "eager"
     viewport_width: int = 1280
     viewport_height: int = 720
 
@@ -23,6 +41,30 @@ class BrowserConfig:
                 设置为 "1"、"true"、"yes"、"on" 时为 True，其他值为 False
             BROWSER_MAX_CACHED_PAGES: 最大缓存页面数，默认为 10，最大不超过 100
             BROWSER_INITIAL_PAGE_COUNT: 初始页面数量，默认为 1，最大不超过 10
+            BROWSER_MAX_PAGES: 同时存在的页面数量上限（含使用中的页面），默认为 50，最大不超过 200
+            BROWSER_ACQUIRE_TIMEOUT: 页面池满时获取页面的最长等待时间（秒），默认为 30
+            BROWSER_RESERVED_INTERACTIVE_PAGES: 为交互式会话保留的页面数，搜索和抓取请求不能占用，
+                默认为 2，最大为页面数量上限减 1
+            BROWSER_SHARDS: 浏览器分片（进程）数量，默认为 1。设置为 "auto" 时为 CPU 核心数 / 4，
+                最大不超过 32；页面数量上限和初始页面数在分片间平均分配
+            BROWSER_RECYCLE_MAX_NAVIGATIONS: 页面导航次数达到该值后回收，默认为 50，0 表示不限制
+            BROWSER_RECYCLE_MAX_JS_HEAP_MB: 释放时 JS 堆内存超过该值（MB）则回收，默认为 256，0 表示不检查
+            BROWSER_RECYCLE_MAX_DOM_NODES: 释放时 DOM 节点数超过该值则回收，默认为 100000，0 表示不检查
+            BROWSER_PAGE_IDLE_TTL: 空闲页面的最长保留时间（秒），默认为 300，0 表示不清理
+            BROWSER_MIN_IDLE_PAGES: 清理空闲页面时至少保留的预热页面数，默认为 1
+            BROWSER_MAINTENANCE_INTERVAL: 后台维护任务的执行间隔（秒），默认为 30
+            BROWSER_RESET_PAGES: 释放页面时是否在后台重置页面（导航到 about:blank 等），默认为 True。
+                设置为 "0"、"false"、"no"、"off" 时为 False
+            BROWSER_AUTOSCALE: 是否根据需求自动预热空闲页面，默认为 True。
+                设置为 "0"、"false"、"no"、"off" 时为 False
+            BROWSER_AUTOSCALE_INTERVAL: 自动伸缩的采样间隔（秒），默认为 1，最小为 0.1
+            BROWSER_AUTOSCALE_ALPHA: 需求 EWMA 的平滑系数（0-1），默认为 0.3，越大对突发越敏感
+            BROWSER_AUTOSCALE_HEADROOM: 目标页面数相对需求 EWMA 的倍数，默认为 1.5
+            BROWSER_RELAUNCH_INITIAL_BACKOFF: 浏览器崩溃后重启失败的初始退避时间（秒），默认为 1
+            BROWSER_RELAUNCH_MAX_BACKOFF: 浏览器重启退避时间上限（秒），默认为 30
+            BROWSER_STARTUP_MODE: 浏览器启动模式，默认为 "eager"。
+                "eager" 服务器启动时等待浏览器就绪；"background" 服务器立即就绪，浏览器在后台启动；
+                "lazy" 首次使用页面时才启动浏览器；其他值按 "eager" 处理
             BROWSER_VIEWPORT_WIDTH: 浏览器视口宽度，默认为 1280
             BROWSER_VIEWPORT_HEIGHT: 浏览器视口高度，默认为 720
         """
@@ -37,6 +79,56 @@ class BrowserConfig:
         initial_page_count = int(os.getenv("BROWSER_INITIAL_PAGE_COUNT", "1"))
         initial_page_count = min(initial_page_count, 10)
 
+        # 页面数量硬上限，默认 50，最大不超过 200；缓存页面数不能超过该上限
+        max_pages = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+        max_pages = max(1, min(max_pages, 200))
+        max_cached_pages = min(max_cached_pages, max_pages)
+
+        # 获取页面的等待超时（秒），默认 30
+        acquire_timeout = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "30"))
+
+        # 为交互式会话保留的页面数，默认 2；至少留 1 个页面给其他请求
+        reserved_interactive_pages = int(os.getenv("BROWSER_RESERVED_INTERACTIVE_PAGES", "2"))
+        reserved_interactive_pages = max(0, min(reserved_interactive_pages, max_pages - 1))
+
+        # 浏览器分片数量，默认 1；auto 时按每 4 个 CPU 核心一个浏览器进程
+        shards_str = os.getenv("BROWSER_SHARDS", "1").strip().lower()
+        if shards_str == "auto":
+            shard_count = (os.cpu_count() or 1) // 4
+        else:
+            shard_count = int(shards_str)
+        shard_count = max(1, min(shard_count, 32, max_pages))
+
+        # 页面回收阈值，0 表示关闭对应检查
+        recycle_max_navigations = max(0, int(os.getenv("BROWSER_RECYCLE_MAX_NAVIGATIONS", "50")))
+        recycle_max_js_heap_mb = max(0, int(os.getenv("BROWSER_RECYCLE_MAX_JS_HEAP_MB", "256")))
+        recycle_max_dom_nodes = max(0, int(os.getenv("BROWSER_RECYCLE_MAX_DOM_NODES", "100000")))
+
+        # 空闲页面 TTL 与最小预热页面数，后台维护任务定期清理超时的空闲页面
+        page_idle_ttl = max(0.0, float(os.getenv("BROWSER_PAGE_IDLE_TTL", "300")))
+        min_idle_pages = max(0, min(int(os.getenv("BROWSER_MIN_IDLE_PAGES", "1")), max_cached_pages))
+        maintenance_interval = max(1.0, float(os.getenv("BROWSER_MAINTENANCE_INTERVAL", "30")))
+
+        # 释放页面时是否在后台重置，默认开启
+        reset_pages_str = os.getenv("BROWSER_RESET_PAGES", "true").lower()
+        reset_pages_on_release = reset_pages_str not in ("0", "false", "no", "off")
+
+        # 自动伸缩：按并发需求的 EWMA 在后台预热空闲页面
+        autoscale_str = os.getenv("BROWSER_AUTOSCALE", "true").lower()
+        autoscale = autoscale_str not in ("0", "false", "no", "off")
+        autoscale_interval = max(0.1, float(os.getenv("BROWSER_AUTOSCALE_INTERVAL", "1")))
+        autoscale_alpha = min(1.0, max(0.01, float(os.getenv("BROWSER_AUTOSCALE_ALPHA", "0.3"))))
+        autoscale_headroom = max(1.0, float(os.getenv("BROWSER_AUTOSCALE_HEADROOM", "1.5")))
+
+        # 浏览器崩溃重启的指数退避
+        relaunch_initial_backoff = max(0.1, float(os.getenv("BROWSER_RELAUNCH_INITIAL_BACKOFF", "1")))
+        relaunch_max_backoff = max(relaunch_initial_backoff, float(os.getenv("BROWSER_RELAUNCH_MAX_BACKOFF", "30")))
+
+        # 浏览器启动模式，默认 eager
+        startup_mode = os.getenv("BROWSER_STARTUP_MODE", "eager").strip().lower()
+        if startup_mode not in ("eager", "background", "lazy"):
+            startup_mode = "eager"
+
         # 浏览器视口宽度，默认 1280
         viewport_width = int(os.getenv("BROWSER_VIEWPORT_WIDTH", "1280"))
 
@@ -47,6 +139,24 @@ class BrowserConfig:
             headless=headless,
             max_cached_pages=max_cached_pages,
             initial_page_count=initial_page_count,
+            max_pages=max_pages,
+            acquire_timeout=acquire_timeout,
+            reserved_interactive_pages=reserved_interactive_pages,
+            shard_count=shard_count,
+            recycle_max_navigations=recycle_max_navigations,
+            recycle_max_js_heap_mb=recycle_max_js_heap_mb,
+            recycle_max_dom_nodes=recycle_max_dom_nodes,
+            page_idle_ttl=page_idle_ttl,
+            min_idle_pages=min_idle_pages,
+            maintenance_interval=maintenance_interval,
+            reset_pages_on_release=reset_pages_on_release,
+            autoscale=autoscale,
+            autoscale_interval=autoscale_interval,
+            autoscale_alpha=autoscale_alpha,
+            autoscale_headroom=autoscale_headroom,
+            relaunch_initial_backoff=relaunch_initial_backoff,
+            relaunch_max_backoff=relaunch_max_backoff,
+            startup_mode=startup_mode,
             viewport_width=viewport_width,
             viewport_height=viewport_height,
         )
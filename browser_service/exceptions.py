@@ -11,11 +11,21 @@ class PageCreationError(BrowserError):
     pass
 
 
+class PoolExhaustedError(PageCreationError):
+    """页面池已满且在超时时间内没有可用页面。"""
+    pass
+
+
 class PageClosedError(BrowserError):
     """页面已关闭错误。"""
     pass
 
 
+class BrowserCrashedError(BrowserError):
+    """浏览器或页面渲染进程崩溃，操作可在浏览器重启后重试。"""
+    pass
+
+
 class BrowserInitializationError(BrowserError):
     """浏览器初始化错误。"""
     pass
@@ -6,8 +6,8 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
-from browser_service import initialize_global_browser, close_global_browser
-from url_fetcher import url_fetcher
+from browser_service import start_global_browser, close_global_browser
+from url_fetcher import close_disk_cache, close_http_client, close_parse_pool, url_fetcher, url_fetcher_batch
 from web_search import web_search
 from web_dev import web_dev
 
@@ -21,11 +21,14 @@ PORT = int(os.getenv("MCP_SERVER_PORT", "8000"))
 @asynccontextmanager
 async def lifespan(_mcp: FastMCP):
     """管理 MCP 服务器的生命周期。"""
-    # 启动时初始化浏览器
-    await initialize_global_browser()
+    # 启动时按 BROWSER_STARTUP_MODE 启动浏览器（eager 等待就绪，background/lazy 不阻塞服务器启动）
+    await start_global_browser()
     yield
-    # 退出时关闭浏览器
+    # 退出时关闭浏览器、HTTP 连接池、磁盘缓存和解析池
     await close_global_browser()
+    await close_http_client()
+    await close_disk_cache()
+    await close_parse_pool()
 
 
 mcp = FastMCP(
@@ -40,6 +43,9 @@ mcp.tool()(web_search)
 # 将 url_fetcher 函数注册为 MCP 工具
 mcp.tool()(url_fetcher)
 
+# 将 url_fetcher_batch 函数注册为 MCP 工具
+mcp.tool()(url_fetcher_batch)
+
 # 将 web_dev 函数注册为 MCP 工具
 mcp.tool()(web_dev)
 
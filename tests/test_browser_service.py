@@ -1,12 +1,24 @@
 """浏览器服务模块的集成测试（使用真实浏览器）。"""
 
+import asyncio
+from dataclasses import replace
+
 import pytest
 
 from browser_service import (
+    BrowserConfig,
+    BrowserError,
+    BrowserInitializationError,
+    BrowserService,
+    PagePriority,
+    PoolExhaustedError,
     initialize_global_browser,
     close_global_browser,
     get_global_browser_service,
 )
+from browser_service.browser_service import (
+    BrowserShard, PagePool, _remove_caller_listeners, _shard_configs, _track_listeners,
+)
 
 
 @pytest.mark.asyncio
@@ -43,3 +55,400 @@ async def test_browser_service_multiple_pages():
         await browser_service.release_page(page)
 
     await close_global_browser()
+
+
+@pytest.mark.asyncio
+async def test_browser_service_pool_exhausted():
+    """测试页面池达到上限后等待超时抛出 PoolExhaustedError，释放后等待者可获得页面。"""
+    config = replace(
+        BrowserConfig.from_env(),
+        max_pages=2,
+        max_cached_pages=2,
+        acquire_timeout=0.5,
+        reserved_interactive_pages=0,
+    )
+
+    async with BrowserService(config) as browser_service:
+        pages = [await browser_service.create_page() for _ in range(2)]
+
+        with pytest.raises(PoolExhaustedError):
+            await browser_service.create_page()
+
+        stats = browser_service.get_stats()
+        assert stats["timeouts_total"] == 1
+        assert stats["queue_depth"] == 0
+
+        # 释放一个页面后，等待者直接获得该页面
+        await browser_service.release_page(pages[0])
+        page = await browser_service.create_page()
+        assert page is pages[0]
+
+        for page in pages:
+            await browser_service.release_page(page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_priority_reserved_pages():
+    """测试保留页面只供交互式请求使用，池满时高优先级的等待者先获得释放的页面。"""
+    config = replace(
+        BrowserConfig.from_env(),
+        max_pages=3,
+        max_cached_pages=3,
+        acquire_timeout=0.5,
+        reserved_interactive_pages=1,
+    )
+
+    async with BrowserService(config) as browser_service:
+        bulk_pages = [await browser_service.create_page(priority=PagePriority.FETCH) for _ in range(2)]
+
+        # 批量请求无法占用保留页面
+        with pytest.raises(PoolExhaustedError):
+            await browser_service.create_page(priority=PagePriority.FETCH)
+        interactive_page = await browser_service.create_page(priority=PagePriority.INTERACTIVE)
+
+        # 先排队的抓取请求不会抢在后到的搜索请求之前
+        order = []
+
+        async def acquire(name, priority):
+            page = await browser_service.create_page(timeout=5, priority=priority)
+            order.append(name)
+            return page
+
+        fetch_task = asyncio.create_task(acquire("fetch", PagePriority.FETCH))
+        await asyncio.sleep(0.1)
+        search_task = asyncio.create_task(acquire("search", PagePriority.SEARCH))
+        await asyncio.sleep(0.1)
+
+        await browser_service.release_page(bulk_pages[0])
+        await search_task
+        assert order == ["search"]
+
+        await browser_service.release_page(bulk_pages[1])
+        await fetch_task
+        assert order == ["search", "fetch"]
+
+        stats = browser_service.get_stats()
+        assert stats["fetch_timeouts"] == 1
+        assert stats["search_waits"] == 1
+        assert stats["interactive_waits"] == 0
+
+        for page in (interactive_page, search_task.result(), fetch_task.result()):
+            await browser_service.release_page(page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_recycle_by_navigations():
+    """测试页面导航次数达到阈值后，释放时被关闭并替换。"""
+    config = replace(BrowserConfig.from_env(), initial_page_count=0, recycle_max_navigations=2)
+
+    async with BrowserService(config) as browser_service:
+        page = await browser_service.create_page()
+        await page.goto("data:text/html,<p>first</p>")
+        await page.goto("data:text/html,<p>second</p>")
+        await browser_service.release_page(page)
+        # 回收检查在后台任务中完成
+        await asyncio.sleep(1)
+
+        assert page.is_closed()
+        assert browser_service.get_stats()["recycled_navigations"] == 1
+
+        # 替换页面可以正常获取
+        new_page = await browser_service.create_page()
+        assert new_page is not page
+        await browser_service.release_page(new_page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_reap_idle_pages():
+    """测试后台维护任务清理空闲超时的页面，并保留最小预热页面数。"""
+    config = replace(
+        BrowserConfig.from_env(),
+        initial_page_count=0,
+        page_idle_ttl=0.5,
+        min_idle_pages=1,
+        maintenance_interval=1.0,
+    )
+
+    async with BrowserService(config) as browser_service:
+        pages = [await browser_service.create_page() for _ in range(3)]
+        for page in pages:
+            await browser_service.release_page(page)
+
+        await asyncio.sleep(2.5)
+
+        stats = browser_service.get_stats()
+        assert stats["idle"] == 1
+        assert stats["reaped_total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_browser_service_reset_on_release():
+    """测试释放的页面在后台被重置：回到 about:blank，调用方挂载的监听器和路由被移除。"""
+    config = replace(BrowserConfig.from_env(), initial_page_count=0, max_pages=1, reserved_interactive_pages=0)
+
+    async with BrowserService(config) as browser_service:
+        page = await browser_service.create_page()
+        console_messages = []
+        page.on("console", lambda message: console_messages.append(message.text))
+        await page.route("**/*", lambda route: route.abort())
+        await page.goto("data:text/html,<script>console.log('first')</script>")
+        await browser_service.release_page(page)
+
+        # 池上限为 1，等待后台重置完成后拿到的是同一个页面
+        reused = await browser_service.create_page()
+        assert reused is page
+        assert page.url == "about:blank"
+
+        await page.evaluate("console.log('second')")
+        assert "second" not in console_messages
+
+        await browser_service.release_page(page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_autoscale_prewarm():
+    """测试自动伸缩根据并发需求在后台预先创建空闲页面，后续获取命中预热页面。"""
+    config = replace(
+        BrowserConfig.from_env(),
+        initial_page_count=0,
+        min_idle_pages=0,
+        autoscale=True,
+        autoscale_interval=0.2,
+        autoscale_headroom=1.5,
+    )
+
+    async with BrowserService(config) as browser_service:
+        pages = [await browser_service.create_page() for _ in range(3)]
+        assert browser_service.get_stats()["cold_starts"] == 3
+
+        # 持续占用 3 个页面，EWMA 上升后预热 ceil(3 * 1.5) - 3 = 2 个空闲页面
+        await asyncio.sleep(3)
+        assert browser_service.get_stats()["idle"] == 2
+
+        extra = await browser_service.create_page()
+        stats = browser_service.get_stats()
+        assert stats["prewarm_hits"] == 1
+        assert stats["prewarm_hit_rate"] == 0.25
+
+        for page in [*pages, extra]:
+            await browser_service.release_page(page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_relaunch_after_crash():
+    """测试浏览器意外断开后，旧页面被标记为丢失，服务自动重启浏览器并可继续获取页面。"""
+    config = replace(BrowserConfig.from_env(), initial_page_count=1)
+
+    async with BrowserService(config) as browser_service:
+        page = await browser_service.create_page()
+
+        # 绕过 BrowserService 直接关闭浏览器进程，模拟崩溃
+        await browser_service._shards[0].browser.close()
+        await asyncio.sleep(0.5)
+        assert browser_service.is_page_lost(page)
+        await browser_service.release_page(page)
+
+        new_page = await browser_service.create_page()
+        await new_page.goto("data:text/html,<p>alive</p>")
+        assert browser_service.get_stats()["browser_restarts"] == 1
+        await browser_service.release_page(new_page)
+
+
+@pytest.mark.asyncio
+async def test_browser_service_page_init_script():
+    """测试页面初始化脚本按名称去重，随页面保留到再次复用，且不影响其他页面。"""
+    config = replace(BrowserConfig.from_env(), initial_page_count=1)
+
+    async with BrowserService(config) as browser_service:
+        page = await browser_service.create_page()
+        await browser_service.add_page_init_script(page, "marker", "window.__marker = (window.__marker || 0) + 1;")
+        await browser_service.add_page_init_script(page, "marker", "window.__marker = 100;")
+        await page.goto("data:text/html,<p>first</p>")
+        assert await page.evaluate("window.__marker") == 1
+        await browser_service.release_page(page)
+        await asyncio.sleep(0.5)  # 等待后台重置完成，页面回到空闲队列
+
+        reused = await browser_service.create_page()
+        other = await browser_service.create_page()
+        try:
+            assert reused is page
+            await reused.goto("data:text/html,<p>second</p>")
+            assert await reused.evaluate("window.__marker") == 1
+            await other.goto("data:text/html,<p>other</p>")
+            assert await other.evaluate("typeof window.__marker") == "undefined"
+        finally:
+            await browser_service.release_page(other)
+            await browser_service.release_page(reused)
+
+
+def test_shard_configs_split_page_limits():
+    """测试页面数量上限、缓存页面数和初始页面数在分片间平均分配。"""
+    config = replace(
+        BrowserConfig(),
+        shard_count=3,
+        max_pages=10,
+        max_cached_pages=6,
+        initial_page_count=4,
+        reserved_interactive_pages=2,
+        min_idle_pages=1,
+    )
+
+    configs = _shard_configs(config)
+
+    assert [c.max_pages for c in configs] == [3, 3, 3]
+    assert [c.max_cached_pages for c in configs] == [2, 2, 2]
+    assert [c.initial_page_count for c in configs] == [2, 1, 1]
+    assert [c.min_idle_pages for c in configs] == [1, 0, 0]
+    # 保留页面数向上取整，每个分片至少为交互式请求留 1 个页面
+    assert [c.reserved_interactive_pages for c in configs] == [1, 1, 1]
+
+
+class FakeEventPage:
+    """只实现 on / once / remove_listener 的页面，记录当前注册的监听器。"""
+
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, f):
+        self.handlers.append((event, f))
+
+    def once(self, event, f):
+        self.handlers.append((event, f))
+
+    def remove_listener(self, event, f):
+        self.handlers.remove((event, f))
+
+
+def test_page_pool_removes_only_caller_listeners():
+    """测试归还页面时只移除调用方挂载的监听器，保留页面池自身的监听器，已被移除的监听器不报错。"""
+    page = FakeEventPage()
+    page.on("crash", print)
+    registered = _track_listeners(page)
+
+    def on_console(_message):
+        pass
+
+    def on_load(_page):
+        pass
+
+    page.on("console", on_console)
+    page.once("load", on_load)
+    page.on("framenavigated", print)
+    page.remove_listener("framenavigated", print)
+
+    _remove_caller_listeners(page, registered)
+
+    assert page.handlers == [("crash", print)]
+    assert registered == []
+
+
+def test_browser_service_logs_stats_when_changed(caplog):
+    """测试页面池统计只在变化时写入日志，需求 EWMA 的衰减不单独触发记录。"""
+    config = BrowserConfig()
+    browser_service = BrowserService(config)
+    shard = BrowserShard(0, config)
+    shard.page_pool = PagePool(None, config)
+    browser_service._shards = [shard]
+
+    with caplog.at_level("INFO", logger="browser_service"):
+        browser_service.log_stats_if_changed()
+        browser_service.log_stats_if_changed()
+        shard.page_pool._demand_ewma = 0.5
+        browser_service.log_stats_if_changed()
+        shard.page_pool._stats.timeouts_total += 1
+        browser_service.log_stats_if_changed()
+
+    stats_logs = [record.message for record in caplog.records if record.message.startswith("POOL STATS")]
+    assert len(stats_logs) == 2
+    assert "'timeouts_total': 1" in stats_logs[1]
+
+
+@pytest.mark.asyncio
+async def test_browser_service_shard_routing():
+    """测试页面路由到负载最低的分片、每个分片独立遵守页面上限，释放的页面回到所属分片。"""
+    config = replace(
+        BrowserConfig.from_env(),
+        shard_count=2,
+        max_pages=4,
+        max_cached_pages=4,
+        initial_page_count=0,
+        acquire_timeout=0.5,
+        reserved_interactive_pages=0,
+        autoscale=False,
+    )
+
+    async with BrowserService(config) as browser_service:
+        assert browser_service.shard_count == 2
+
+        pages = [await browser_service.create_page() for _ in range(4)]
+        shard_stats = browser_service.get_stats()["shards"]
+        assert [stats["in_use"] for stats in shard_stats] == [2, 2]
+        assert [stats["max_pages"] for stats in shard_stats] == [2, 2]
+
+        # 两个分片都已达到各自的上限
+        with pytest.raises(PoolExhaustedError):
+            await browser_service.create_page()
+
+        # 释放的页面回到所属分片，下一次获取路由到该分片并复用该页面
+        shard = next(s for s in browser_service._shards if pages[3] in s.page_pool._pages)
+        await browser_service.release_page(pages[3])
+        await asyncio.sleep(0.5)
+        page = await browser_service.create_page()
+        assert page is pages[3]
+        assert page in shard.page_pool._pages
+
+        for page in pages:
+            await browser_service.release_page(page)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("startup_mode", ["eager", "background", "lazy"])
+async def test_browser_service_startup_modes(startup_mode):
+    """测试三种启动模式：eager 需要先 initialize()，background 和 lazy 由 create_page() 等待或触发启动。"""
+    config = replace(BrowserConfig.from_env(), initial_page_count=0, startup_mode=startup_mode)
+    browser_service = BrowserService(config)
+    try:
+        if startup_mode == "eager":
+            with pytest.raises(BrowserError):
+                await browser_service.create_page()
+            await browser_service.initialize()
+        elif startup_mode == "background":
+            browser_service.start_in_background()
+            assert not browser_service.is_initialized
+
+        page = await browser_service.create_page()
+        assert browser_service.is_initialized
+        await browser_service.release_page(page)
+    finally:
+        await browser_service.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("startup_mode", ["background", "lazy"])
+async def test_browser_service_startup_retry_after_failed_launch(startup_mode, monkeypatch):
+    """测试 background/lazy 模式下启动失败后，下一次 create_page() 会重新尝试启动。"""
+    launch = BrowserShard.launch
+    attempts = []
+
+    async def flaky_launch(shard, playwright):
+        attempts.append(shard.index)
+        if len(attempts) == 1:
+            raise RuntimeError("launch failed")
+        await launch(shard, playwright)
+
+    monkeypatch.setattr(BrowserShard, "launch", flaky_launch)
+    config = replace(BrowserConfig.from_env(), initial_page_count=0, shard_count=1, startup_mode=startup_mode)
+    browser_service = BrowserService(config)
+    try:
+        if startup_mode == "background":
+            browser_service.start_in_background()
+
+        with pytest.raises(BrowserInitializationError):
+            await browser_service.create_page()
+        assert not browser_service.is_initialized
+
+        page = await browser_service.create_page()
+        assert len(attempts) == 2
+        await browser_service.release_page(page)
+    finally:
+        await browser_service.close()
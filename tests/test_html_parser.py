@@ -0,0 +1,86 @@
+"""HTMLParser Markdown 转换引擎的一致性测试和解析池测试。"""
+
+import asyncio
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from url_fetcher.config import FetcherConfig
+from url_fetcher.html_parser import HTMLParser
+from url_fetcher.parse_pool import close_parse_pool, parse_article
+
+FIXTURES_DIR = Path(__file__).parent / "test_html_parser_files"
+FIXTURES = sorted(FIXTURES_DIR.glob("*.html"))
+
+
+@pytest.mark.parametrize("retain_images", [True, False])
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.stem)
+def test_markdown_engines_equivalent(fixture, retain_images):
+    """测试 fast 引擎与 markdownify 引擎在夹具 HTML 上的输出完全一致。"""
+    html = fixture.read_text(encoding="utf-8")
+
+    expected = HTMLParser("markdownify")._html_to_markdown(html, retain_images)
+    actual = HTMLParser("fast")._html_to_markdown(html, retain_images)
+
+    assert actual == expected
+
+
+def test_parse_with_fast_engine():
+    """测试 parse 使用 fast 引擎转换 Readability.js 的文章数据。"""
+    article = {
+        "title": " 示例文章 ",
+        "content": (FIXTURES_DIR / "article.html").read_text(encoding="utf-8"),
+        "excerpt": "摘要",
+        "length": 1234,
+    }
+
+    result = HTMLParser("fast").parse(article, "https://example.com/post")
+
+    assert result["title"] == "示例文章"
+    assert "# Profiling *asyncio* services" in result["content"]
+    assert "![Flame graph of the event loop](https://example.com/flame.png \"Flame graph\")" in result["content"]
+    assert "my\\_var\\_name" in result["content"]
+    assert result["content"] == HTMLParser("markdownify").parse(article, "https://example.com/post")["content"]
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """反复 sleep 直到 stop 被设置，返回实际唤醒时间相对预期的最大延迟（秒）。"""
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, loop.time() - start - interval)
+    return max_lag
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_keeps_event_loop_responsive():
+    """测试并发转换大文档时，解析进程池让事件循环的延迟保持平稳。"""
+    # 畸形 HTML 中未闭合的标签会在重复拼接时越嵌越深，只使用结构完整的夹具
+    content = "\n".join(path.read_text(encoding="utf-8") for path in FIXTURES if path.stem != "malformed") * 40
+    article = {"title": "大文档", "content": content}
+    url = "https://example.com/large"
+    config = replace(FetcherConfig(), parse_executor="process", parse_workers=2)
+
+    start = time.perf_counter()
+    expected = HTMLParser(config.markdown_engine).parse(article, url)
+    inline_s = time.perf_counter() - start
+
+    try:
+        # 预热：启动工作进程并完成模块导入
+        await parse_article(article, url, "markdown", config)
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_max_loop_lag(stop))
+        results = await asyncio.gather(*(parse_article(article, url, "markdown", config) for _ in range(4)))
+        stop.set()
+        max_lag = await lag_task
+    finally:
+        await close_parse_pool()
+
+    assert all(result == expected for result in results)
+    # 直接在事件循环中转换时，每个文档都会让事件循环阻塞 inline_s 秒
+    assert max_lag < min(0.1, inline_s / 4)
@@ -1,11 +1,28 @@
 """URL-Fetcher 工具集成测试。"""
 
+import asyncio
+import importlib
 import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
 from fastmcp import Client
 
+from browser_service import BrowserService, close_global_browser, get_global_browser_service, initialize_global_browser
+from url_fetcher.cache import get_result_cache
+from url_fetcher.config import FetcherConfig
+from url_fetcher.deadline import Deadline
+from url_fetcher.disk_cache import DiskCache, close_disk_cache
+from url_fetcher.exceptions import DeadlineExceededError, FetchError
+from url_fetcher.http_client import HttpFetcher
+from url_fetcher.singleflight import SingleFlight
+from url_fetcher.url_fetcher import url_fetcher
+from url_fetcher.web_client import EXTRACT_ARTICLE_JS, INNER_TEXT_JS, READABILITY_LOADER, WebClient
+
 # 测试用的 URL，可以修改为其他网站用于测试
 TEST_URL = "https://www.cnblogs.com/"
 
@@ -28,6 +45,166 @@ async def mcp_client():
         pass
 
 
+# ============================================================================
+# 本地 HTTP 服务器
+# ============================================================================
+
+
+class StalledArticleHandler(BaseHTTPRequestHandler):
+    """返回文章正文后不结束响应，模拟被慢速资源拖住、DOMContentLoaded 迟迟不触发的页面；/hang 不返回响应。"""
+
+    def do_GET(self):
+        if self.path == "/hang":
+            # 不发送响应头，导航始终不会提交
+            time.sleep(10)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        paragraphs = "".join(f"<p>第 {n} 段：页面正文已经加载完成，只是响应还没有结束。</p>" for n in range(30))
+        self.wfile.write(f"<html><head><title>慢速页面</title></head><body><article><h1>慢速页面</h1>"
+                         f"{paragraphs}</article>".encode("utf-8"))
+        self.wfile.flush()
+        time.sleep(10)
+
+    def log_message(self, fmt, *args):
+        """禁止输出日志。"""
+        pass
+
+
+DOCUMENTS_DIR = Path(__file__).parent / "test_url_fetcher_files"
+
+DOCUMENT_CONTENT_TYPES = {
+    ".md": "text/plain; charset=utf-8",
+    ".json": "application/json",
+    ".xml": "application/rss+xml",
+    ".pdf": "application/pdf",
+}
+
+
+class DocumentHandler(BaseHTTPRequestHandler):
+    """按扩展名返回 test_url_fetcher_files 中的非 HTML 文档；/large.txt 持续输出文本，/large.pdf 声明超大的长度。"""
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def do_GET(self):
+        if not self._send_headers():
+            return
+        if self.path == "/large.txt":
+            line = "这一行会不断重复，直到客户端停止读取。\n".encode("utf-8") * 1000
+            try:
+                for _ in range(2000):
+                    self.wfile.write(line)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        elif self.path != "/large.pdf":
+            self.wfile.write((DOCUMENTS_DIR / self.path.lstrip("/")).read_bytes())
+
+    def _send_headers(self) -> bool:
+        suffix = Path(self.path).suffix
+        if self.path == "/large.txt":
+            content_type = "text/plain; charset=utf-8"
+        elif suffix in DOCUMENT_CONTENT_TYPES and \
+                (self.path == "/large.pdf" or (DOCUMENTS_DIR / self.path.lstrip("/")).is_file()):
+            content_type = DOCUMENT_CONTENT_TYPES[suffix]
+        else:
+            self.send_error(404)
+            return False
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if self.path == "/large.pdf":
+            self.send_header("Content-Length", str(200 * 1024 * 1024))
+        self.end_headers()
+        return True
+
+    def log_message(self, fmt, *args):
+        """禁止输出日志。"""
+        pass
+
+
+def _start_server(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("localhost", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture(scope="module")
+def document_server():
+    """启动返回非 HTML 文档的本地 HTTP 服务器。"""
+    server = _start_server(DocumentHandler)
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class RevalidationHandler(BaseHTTPRequestHandler):
+    """返回带 ETag 的文章，If-None-Match 与当前 ETag 相同时返回 304；收到的 If-None-Match 记录在 requests 中。"""
+
+    etag = '"v1"'
+    requests: list[str | None] = []
+
+    def do_GET(self):
+        if_none_match = self.headers.get("If-None-Match")
+        type(self).requests.append(if_none_match)
+        if if_none_match == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+        paragraphs = "".join(f"<p>第 {n} 段：版本 {self.etag} 的文章正文，用于测试磁盘缓存的重新验证。</p>"
+                             for n in range(20))
+        body = (f"<html><head><title>缓存文章</title></head><body><article><h1>缓存文章</h1>{paragraphs}"
+                f"</article></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        """禁止输出日志。"""
+        pass
+
+
+class BrokenRedirectHandler(BaseHTTPRequestHandler):
+    """返回缺少 Location 头的 302 重定向。"""
+
+    def do_GET(self):
+        self.send_response(302)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def log_message(self, fmt, *args):
+        """禁止输出日志。"""
+        pass
+
+
+@pytest.fixture
+def revalidation_server():
+    """启动返回带 ETag 的文章的本地 HTTP 服务器。"""
+    RevalidationHandler.etag = '"v1"'
+    RevalidationHandler.requests = []
+    server = _start_server(RevalidationHandler)
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def stalled_server():
+    """启动返回未结束响应的本地 HTTP 服务器。"""
+    server = _start_server(StalledArticleHandler)
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
 # ============================================================================
 # MCP 工具测试
 # ============================================================================
@@ -81,3 +258,678 @@ async def test_url_fetcher_text_format(mcp_client):
     assert result_data["success"] is True
     assert result_data["url"] == TEST_URL
     assert "content" in result_data
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_without_resource_blocking(mcp_client):
+    """测试单次调用关闭资源拦截（加载图片、字体和样式表）。"""
+    result = await mcp_client.call_tool(
+        "url_fetcher",
+        {
+            "url": TEST_URL,
+            "return_format": "markdown",
+            "timeout": 30,
+            "block_resources": False,
+            "fetch_mode": "browser",
+        },
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is True
+    assert result_data["url"] == TEST_URL
+    assert result_data["content"]
+    assert result_data["metadata"]["fetch_path"] == "browser"
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_readiness_metadata(mcp_client):
+    """测试指定就绪策略，metadata 中返回实际满足的就绪条件和各阶段耗时。"""
+    result = await mcp_client.call_tool(
+        "url_fetcher",
+        {
+            "url": TEST_URL,
+            "timeout": 20,
+            "readiness": "stable",
+            "fetch_mode": "browser",
+        },
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is True
+
+    metadata = result_data["metadata"]
+    assert metadata["readiness"] == "stable"
+    assert metadata["ready_by"] in ("stable", "timeout")
+    assert metadata["extraction_path"] in ("readability", "innertext")
+    assert set(metadata["timings_ms"]) == {"acquire", "navigate", "ready", "extract"}
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_http_fast_path(mcp_client):
+    """测试只使用 HTTP 快速路径获取静态页面，metadata 中记录实际使用的路径。"""
+    result = await mcp_client.call_tool(
+        "url_fetcher",
+        {
+            "url": TEST_URL,
+            "timeout": 20,
+            "fetch_mode": "http",
+        },
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is True
+    assert result_data["content"]
+    assert result_data["metadata"]["fetch_path"] == "http"
+    assert result_data["metadata"]["http_status"] == 200
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_result_cache(mcp_client):
+    """测试相同 URL 的第二次请求命中结果缓存，bypass_cache 跳过缓存重新获取。"""
+    arguments = {"url": TEST_URL, "return_format": "text", "timeout": 20}
+
+    first = json.loads((await mcp_client.call_tool("url_fetcher", arguments)).content[0].text)
+    second = json.loads((await mcp_client.call_tool("url_fetcher", arguments)).content[0].text)
+    bypassed = json.loads(
+        (await mcp_client.call_tool("url_fetcher", {**arguments, "bypass_cache": True})).content[0].text
+    )
+
+    assert first["success"] is True
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert second["metadata"]["cache_source"] == "memory"
+    assert second["content"] == first["content"]
+    assert bypassed["metadata"]["cache_hit"] is False
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_batch(mcp_client):
+    """测试批量获取按输入顺序返回每个 URL 的结果，单个 URL 失败不影响其他 URL。"""
+    result = await mcp_client.call_tool(
+        "url_fetcher_batch",
+        {
+            "urls": [TEST_URL, "ftp://example.com/"],
+            "return_format": "text",
+            "timeout": 20,
+            "concurrency": 2,
+        }
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is True
+    assert result_data["metadata"]["total"] == 2
+    assert result_data["metadata"]["succeeded"] == 1
+    first, second = result_data["results"]
+    assert first["success"] is True
+    assert first["content"]
+    assert second["success"] is False
+    assert second["error"]
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_pagination(mcp_client):
+    """测试按 max_length 分页返回正文，逐页拼接后与完整正文一致。"""
+    arguments = {"url": TEST_URL, "return_format": "text", "timeout": 20}
+    full = json.loads((await mcp_client.call_tool("url_fetcher", {**arguments, "max_length": 0})).content[0].text)
+    assert full["success"] is True
+    assert full["metadata"]["pagination"]["has_more"] is False
+
+    pages = []
+    start_index = 0
+    while True:
+        result = await mcp_client.call_tool(
+            "url_fetcher", {**arguments, "start_index": start_index, "max_length": 1000}
+        )
+        result_data = json.loads(result.content[0].text)
+        pagination = result_data["metadata"]["pagination"]
+        assert pagination["total_length"] == len(full["content"])
+        assert len(result_data["content"]) <= 1000
+        pages.append(result_data["content"])
+        if not pagination["has_more"]:
+            break
+        start_index = pagination["next_start_index"]
+
+    assert "".join(pages) == full["content"]
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_partial_on_navigation_timeout(mcp_client, stalled_server):
+    """测试导航超时后停止加载，仍返回已加载的正文并标记为 partial。"""
+    result = await mcp_client.call_tool(
+        "url_fetcher",
+        {
+            "url": f"{stalled_server}/article",
+            "return_format": "text",
+            "timeout": 5,
+            "fetch_mode": "browser",
+        }
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is True
+    assert "页面正文已经加载完成" in result_data["content"]
+    assert result_data["metadata"]["partial"] is True
+    assert result_data["metadata"]["partial_reason"] == "navigation_timeout"
+    assert result_data["metadata"]["ready_by"] == "navigation_timeout"
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_no_partial_before_navigation_commit(mcp_client, stalled_server):
+    """测试导航未提交时超时不做部分提取，不会返回页面中残留的上一个文档。"""
+    await mcp_client.call_tool(
+        "url_fetcher",
+        {"url": f"{stalled_server}/article", "return_format": "text", "timeout": 5, "fetch_mode": "browser"}
+    )
+    result = await mcp_client.call_tool(
+        "url_fetcher",
+        {"url": f"{stalled_server}/hang", "return_format": "text", "timeout": 5, "fetch_mode": "browser"}
+    )
+
+    result_data = json.loads(result.content[0].text)
+    assert result_data["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_http_fetcher_redirect_without_location():
+    """测试重定向响应缺少 Location 头时，HTTP 获取返回错误，HEAD 探测按 HTML 处理。"""
+    server = _start_server(BrokenRedirectHandler)
+    url = f"http://localhost:{server.server_address[1]}/moved"
+    try:
+        result = json.loads(await url_fetcher(url, "text", fetch_mode="http", bypass_cache=True))
+        assert result["success"] is False
+        assert "缺少 Location 头" in result["error"]
+
+        assert await HttpFetcher(FetcherConfig()).probe(url, 2) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ============================================================================
+# 磁盘缓存测试
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_persists_across_instances(tmp_path):
+    """测试写入的条目在新的 DiskCache 实例（服务器重启）中仍然可读，统计从数据库恢复。"""
+    path = str(tmp_path / "cache.db")
+    cache = DiskCache(path, 1024 * 1024)
+    await cache.put("markdown:https://example.com/", {"title": "持久化"}, "https://example.com/", '"v1"', None)
+    await cache.close()
+
+    reopened = DiskCache(path, 1024 * 1024)
+    entry = await reopened.get("markdown:https://example.com/")
+    assert entry.value == {"title": "持久化"}
+    assert entry.etag == '"v1"'
+    assert entry.has_validators
+    assert reopened.stats()["disk_entries"] == 1
+    assert await reopened.get("markdown:https://example.com/missing") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_evicts_least_recently_accessed(tmp_path):
+    """测试总大小超过上限时按最近访问时间淘汰最旧的条目，超过上限的单个条目不写入。"""
+    cache = DiskCache(str(tmp_path / "cache.db"), 1024 * 1024)
+    await cache.put("a", {"content": "a" * 100}, "https://example.com/a", None, None)
+    entry_size = cache.stats()["disk_bytes"]
+    cache.max_bytes = int(entry_size * 2.5)
+
+    await asyncio.sleep(0.01)
+    await cache.put("b", {"content": "b" * 100}, "https://example.com/b", None, None)
+    await asyncio.sleep(0.01)
+    assert await cache.get("a") is not None  # a 变为最近访问
+    await asyncio.sleep(0.01)
+    await cache.put("c", {"content": "c" * 100}, "https://example.com/c", None, None)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert await cache.get("c") is not None
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.stats()["disk_entries"] == 2
+
+    await cache.put("huge", {"content": "".join(str(n) for n in range(10000))}, "https://example.com/huge", None, None)
+    assert await cache.get("huge") is None
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_corrupted_entry_is_miss(tmp_path):
+    """测试无法解压或解析的条目按未命中处理。"""
+    path = str(tmp_path / "cache.db")
+    cache = DiskCache(path, 1024 * 1024)
+    await cache.put("key", {"title": "正常"}, "https://example.com/", None, None)
+    await cache.close()
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE entries SET payload = ? WHERE key = ?", (b"not zlib", "key"))
+
+    reopened = DiskCache(path, 1024 * 1024)
+    assert await reopened.get("key") is None
+    assert reopened.misses == 1
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_disk_cache_revalidation(tmp_path, monkeypatch, revalidation_server):
+    """测试磁盘缓存：未过期直接命中；过期条目用 ETag 重新验证，304 时返回缓存结果，
+    内容变化时复用条件请求的响应而不再次请求；损坏或过期且没有验证信息的条目重新获取。"""
+    path = str(tmp_path / "cache.db")
+    monkeypatch.setenv("FETCHER_DISK_CACHE", path)
+    monkeypatch.setenv("FETCHER_CACHE", "false")
+    url = f"{revalidation_server}/article"
+    requests = RevalidationHandler.requests
+    await close_disk_cache()
+
+    async def fetch(ttl: int) -> dict:
+        monkeypatch.setenv("FETCHER_CACHE_TTL", str(ttl))
+        return json.loads(await url_fetcher(url, "text", fetch_mode="http"))
+
+    try:
+        first = await fetch(600)
+        assert first["metadata"]["cache_hit"] is False
+        assert requests == [None]
+
+        # 未过期：直接命中磁盘缓存，不发送请求
+        fresh = await fetch(600)
+        assert fresh["metadata"]["cache_source"] == "disk"
+        assert "revalidated" not in fresh["metadata"]
+        assert requests == [None]
+
+        # 过期：条件请求返回 304，返回缓存结果
+        revalidated = await fetch(0)
+        assert revalidated["metadata"]["revalidated"] is True
+        assert revalidated["content"] == first["content"]
+        assert requests == [None, '"v1"']
+
+        # 内容已变化：条件请求返回 200，直接使用该响应
+        RevalidationHandler.etag = '"v2"'
+        changed = await fetch(0)
+        assert changed["metadata"]["cache_hit"] is False
+        assert '"v2"' in changed["content"]
+        assert requests == [None, '"v1"', '"v1"']
+
+        # 损坏的条目按未命中处理，重新获取后覆盖
+        await close_disk_cache()
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE entries SET payload = ?", (b"not zlib",))
+        recovered = await fetch(600)
+        assert recovered["metadata"]["cache_hit"] is False
+        assert requests[-1] is None
+
+        # 过期且没有验证信息的条目不发送条件请求，直接重新获取
+        await close_disk_cache()
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE entries SET etag = NULL, last_modified = NULL")
+        expired = await fetch(0)
+        assert expired["metadata"]["cache_hit"] is False
+        assert requests[-1] is None
+        assert len(requests) == 5
+    finally:
+        await close_disk_cache()
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_pagination_without_result_cache(monkeypatch, revalidation_server):
+    """测试关闭结果缓存时后续页从分页缓存切片，不重新获取；bypass_cache 重新获取的后续页标记 refetched。"""
+    monkeypatch.setenv("FETCHER_CACHE", "false")
+    url = f"{revalidation_server}/pagination"
+    requests = RevalidationHandler.requests
+
+    async def fetch(start_index: int, **kwargs) -> dict:
+        return json.loads(await url_fetcher(url, "text", fetch_mode="http", start_index=start_index, max_length=300,
+                                            **kwargs))
+
+    first = await fetch(0)
+    pagination = first["metadata"]["pagination"]
+    assert pagination["has_more"] is True
+    assert "refetched" not in pagination
+
+    second = await fetch(pagination["next_start_index"])
+    assert second["metadata"]["cache_source"] == "pagination"
+    assert "refetched" not in second["metadata"]["pagination"]
+    assert len(requests) == 1
+
+    refetched = await fetch(pagination["next_start_index"], bypass_cache=True)
+    assert refetched["metadata"]["pagination"]["refetched"] is True
+    assert len(requests) == 2
+
+
+# ============================================================================
+# 请求合并测试
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result_and_error():
+    """测试相同键的并发调用只执行一次并共享结果，执行失败时所有调用方收到同一个异常。"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"content": "shared"}
+
+    outcomes = await asyncio.gather(*(flight.do("markdown:https://example.com/", load) for _ in range(5)))
+    assert calls == 1
+    assert all(result is outcomes[0][0] for result, _ in outcomes)
+    assert [shared for _, shared in outcomes] == [False, True, True, True, True]
+    assert flight.stats() == {"inflight": 0, "executions": 1, "coalesced": 4}
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise FetchError("获取失败")
+
+    errors = await asyncio.gather(*(flight.do("markdown:https://example.com/", fail) for _ in range(3)),
+                                  return_exceptions=True)
+    assert all(isinstance(error, FetchError) for error in errors)
+    assert errors[0] is errors[1] is errors[2]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_when_all_waiters_leave():
+    """测试部分调用方取消时执行继续，所有调用方都取消后执行被取消，之后的调用重新执行。"""
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    first = asyncio.create_task(flight.do("key", slow_load))
+    second = asyncio.create_task(flight.do("key", slow_load))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+    assert flight.stats()["inflight"] == 1
+
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert flight.stats()["inflight"] == 0
+
+    async def quick_load():
+        return "fresh"
+
+    assert await flight.do("key", quick_load) == ("fresh", False)
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_coalesced_requests_use_own_options_and_deadline(monkeypatch):
+    """测试获取选项不同的请求不合并，合并的请求按自己的总时限等待共享的加载。"""
+    url_fetcher_module = importlib.import_module("url_fetcher.url_fetcher")
+
+    calls = []
+
+    async def slow_fetch(url, deadline, fetcher_config, fetch_mode, block_resources, readiness, prefetched=None):
+        calls.append((deadline.timeout, block_resources))
+        await asyncio.sleep(6)
+        raise FetchError("加载结束")
+
+    monkeypatch.setattr(url_fetcher_module, "_fetch_article", slow_fetch)
+    url = "https://example.com/coalesced"
+
+    async def timed(**kwargs):
+        start = time.monotonic()
+        result = json.loads(await url_fetcher(url, "text", bypass_cache=True, fetch_mode="auto", **kwargs))
+        return result, time.monotonic() - start
+
+    owner = asyncio.create_task(timed(timeout=8))
+    await asyncio.sleep(0.1)
+    (joiner, joiner_elapsed), (other, _), (first, first_elapsed) = await asyncio.gather(
+        timed(timeout=5), timed(timeout=8, block_resources=False), owner
+    )
+
+    # 拦截选项不同的请求单独加载
+    assert calls == [(8, None), (8, False)]
+    assert joiner["success"] is False
+    assert "load 阶段" in joiner["error"]
+    assert joiner_elapsed < 5.5
+    assert first["error"] == other["error"] == "加载结束"
+    assert first_elapsed >= 5.9
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_uses_configured_fetch_mode(monkeypatch):
+    """测试未传 fetch_mode 时使用 FETCHER_MODE 配置：browser 模式不调用 HTTP 快速路径，且与显式传入的请求合并。"""
+    url_fetcher_module = importlib.import_module("url_fetcher.url_fetcher")
+    monkeypatch.setenv("FETCHER_MODE", "browser")
+    monkeypatch.setenv("FETCHER_CONTENT_PROBE", "false")
+    http_calls = []
+    browser_calls = []
+
+    async def http_fetch(self, url, timeout, *, deadline=None):
+        http_calls.append(url)
+        raise FetchError("不应调用 HTTP 快速路径")
+
+    async def browser_fetch(self, url, timeout, block_resources=None, readiness=None, *, deadline=None):
+        browser_calls.append(url)
+        await asyncio.sleep(0.2)
+        raise FetchError("浏览器路径")
+
+    async def no_browser_service():
+        return None
+
+    monkeypatch.setattr(HttpFetcher, "fetch", http_fetch)
+    monkeypatch.setattr(WebClient, "fetch", browser_fetch)
+    monkeypatch.setattr(url_fetcher_module, "get_global_browser_service", no_browser_service)
+    url = "https://example.com/configured-mode"
+
+    default, explicit = await asyncio.gather(
+        url_fetcher(url, "text", bypass_cache=True),
+        url_fetcher(url, "text", bypass_cache=True, fetch_mode="browser"),
+    )
+
+    assert json.loads(default)["error"] == json.loads(explicit)["error"] == "浏览器路径"
+    assert http_calls == []
+    assert browser_calls == [url]
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_cache_key_includes_fetch_options(monkeypatch, revalidation_server):
+    """测试以 http 模式缓存的结果不会返回给指定 browser 模式的请求。"""
+    url_fetcher_module = importlib.import_module("url_fetcher.url_fetcher")
+    monkeypatch.setenv("FETCHER_CONTENT_PROBE", "false")
+
+    async def browser_fetch(self, url, timeout, block_resources=None, readiness=None, *, deadline=None):
+        raise FetchError("浏览器路径")
+
+    async def no_browser_service():
+        return None
+
+    monkeypatch.setattr(WebClient, "fetch", browser_fetch)
+    monkeypatch.setattr(url_fetcher_module, "get_global_browser_service", no_browser_service)
+    url = f"{revalidation_server}/cache-options"
+
+    first = json.loads(await url_fetcher(url, "text", fetch_mode="http"))
+    assert first["metadata"]["cache_hit"] is False
+    cached = json.loads(await url_fetcher(url, "text", fetch_mode="http", readiness="load"))
+    assert cached["metadata"]["cache_source"] == "memory"
+
+    browser = json.loads(await url_fetcher(url, "text", fetch_mode="browser"))
+    assert browser["error"] == "浏览器路径"
+    assert len(RevalidationHandler.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_logs_cache_stats(monkeypatch, caplog):
+    """测试缓存统计按 CACHE_STATS_LOG_INTERVAL 限频写入日志。"""
+    url_fetcher_module = importlib.import_module("url_fetcher.url_fetcher")
+    monkeypatch.setattr(url_fetcher_module, "_last_cache_stats_log", 0.0)
+    get_result_cache(FetcherConfig.from_env())
+
+    with caplog.at_level("INFO", logger="url_fetcher"):
+        await url_fetcher("")
+        await url_fetcher("")
+
+    stats_logs = [record.message for record in caplog.records if record.message.startswith("CACHE STATS")]
+    assert len(stats_logs) == 1
+    assert "'hit_rate'" in stats_logs[0]
+
+
+# ============================================================================
+# Readability 提取测试
+# ============================================================================
+
+
+class FakeExtractPage:
+    """按脚本返回固定结果的页面：Readability 始终无法加载，innerText 返回一段正文。"""
+
+    def __init__(self):
+        self.scripts = []
+
+    async def evaluate(self, script, *args):
+        self.scripts.append(script)
+        if script == EXTRACT_ARTICLE_JS:
+            return {"loaded": False}
+        if script == INNER_TEXT_JS:
+            return {"title": "标题", "text": "第一段\n第二段", "excerpt": None, "byline": None, "siteName": None}
+        return None
+
+
+@pytest.mark.asyncio
+async def test_extract_falls_back_when_readability_unavailable():
+    """测试注入源码后仍无法加载 Readability 时改用 innerText，不因结果缺少 reason 而出错。"""
+    page = FakeExtractPage()
+    client = WebClient(FetcherConfig.from_env(), browser_service=None)
+    client._readability_js = "/* Readability */"
+
+    article, extraction_path, reason = await client._extract(page, Deadline(5))
+
+    assert (extraction_path, reason) == ("innertext", "unavailable")
+    assert article["textContent"] == "第一段\n第二段"
+    assert page.scripts == [EXTRACT_ARTICLE_JS, "/* Readability */", EXTRACT_ARTICLE_JS, INNER_TEXT_JS]
+
+
+@pytest.mark.asyncio
+async def test_readability_script_registered_once_per_page(revalidation_server, monkeypatch):
+    """测试 Readability 初始化脚本每个页面只注册一次，未用于获取的页面看不到加载函数。"""
+    sent = []
+    original = BrowserService.add_page_init_script
+
+    async def spy(self, page, name, script):
+        if "add_init_script" not in vars(page):
+            add_init_script = page.add_init_script
+
+            async def counting(source):
+                sent.append(page)
+                return await add_init_script(source)
+
+            page.add_init_script = counting
+        await original(self, page, name, script)
+
+    monkeypatch.setattr(BrowserService, "add_page_init_script", spy)
+
+    await initialize_global_browser()
+    try:
+        browser_service = await get_global_browser_service()
+        client = WebClient(FetcherConfig.from_env(), browser_service=browser_service)
+        for _ in range(3):
+            result = await client.fetch(f"{revalidation_server}/article", 10)
+            assert result.fetch_info["extraction_path"] == "readability"
+        assert sent
+        assert len({id(page) for page in sent}) == len(sent)
+
+        pages = [await browser_service.create_page() for _ in range(len(sent) + 1)]
+        try:
+            fresh = [page for page in pages if all(page is not used for used in sent)]
+            assert fresh
+            await fresh[0].goto(f"{revalidation_server}/article", wait_until="domcontentloaded")
+            assert await fresh[0].evaluate(f"typeof window.{READABILITY_LOADER}") == "undefined"
+        finally:
+            for page in pages:
+                await browser_service.release_page(page)
+    finally:
+        await close_global_browser()
+
+
+# ============================================================================
+# 总时限测试
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_deadline_shared_across_phases():
+    """测试各阶段只能使用总时限的剩余时间，用尽时抛出的错误指明阶段。"""
+    deadline = Deadline(0.3)
+    assert deadline.budget("acquire", 0.1) == 0.1
+
+    assert await deadline.run("navigate", asyncio.sleep(0.1, "done")) == "done"
+    assert deadline.budget("ready") <= 0.2
+
+    with pytest.raises(DeadlineExceededError, match="extract"):
+        await deadline.run("extract", asyncio.sleep(10))
+    assert deadline.remaining() == 0
+
+    with pytest.raises(DeadlineExceededError, match="parse"):
+        await deadline.run("parse", asyncio.sleep(0))
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_stops_at_deadline(stalled_server):
+    """测试响应迟迟不结束时，url_fetcher 在总时限内返回错误并指明用尽的阶段。"""
+    start = time.monotonic()
+    result = await url_fetcher(f"{stalled_server}/deadline", "text", timeout=5, fetch_mode="http", bypass_cache=True)
+    elapsed = time.monotonic() - start
+
+    result_data = json.loads(result)
+    assert result_data["success"] is False
+    assert "http 阶段" in result_data["error"]
+    assert elapsed < 6
+
+
+# ============================================================================
+# 非 HTML 文档测试
+# ============================================================================
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, document_type, expected", [
+    ("/README.md", "text", "这是通过 raw 文件地址返回的 Markdown 文档"),
+    ("/data.json", "json", '```json\n{\n  "name": "web-mcp"'),
+    ("/feed.xml", "feed", "## [事件循环的延迟分析](https://example.com/posts/loop-lag)"),
+    ("/report.pdf", "pdf", "Revenue grew by twelve percent."),
+])
+async def test_url_fetcher_documents(document_server, path, document_type, expected):
+    """测试纯文本、JSON、订阅源和 PDF 由轻量处理器转换，browser 模式通过 HEAD 探测绕过浏览器。"""
+    if document_type == "pdf":
+        pytest.importorskip("pypdf")
+
+    for fetch_mode in ("http", "browser"):
+        result = await url_fetcher(f"{document_server}{path}", fetch_mode=fetch_mode, bypass_cache=True)
+
+        result_data = json.loads(result)
+        assert result_data["success"] is True, result_data["error"]
+        assert expected in result_data["content"]
+        metadata = result_data["metadata"]
+        assert metadata["document_type"] == document_type
+        assert metadata["fetch_path"] == "http"
+        if fetch_mode == "browser":
+            assert metadata["routed_by"] == "head"
+
+
+@pytest.mark.asyncio
+async def test_url_fetcher_document_size_caps(document_server, monkeypatch):
+    """测试纯文本超过大小上限时截断，PDF 声明的长度超过上限时不下载响应体。"""
+    monkeypatch.setenv("FETCHER_HTTP_MAX_BYTES", str(64 * 1024))
+
+    result_data = json.loads(await url_fetcher(f"{document_server}/large.txt", "text", max_length=0))
+    assert result_data["success"] is True
+    assert result_data["metadata"]["truncated"] is True
+    assert len(result_data["content"].encode("utf-8")) <= 64 * 1024
+
+    result_data = json.loads(await url_fetcher(f"{document_server}/large.pdf"))
+    assert result_data["success"] is False
+    assert "Content-Length" in result_data["error"]
@@ -1,5 +1,10 @@
 """URL-Fetcher 模块 - 网页读取和转换功能。"""
 
-from url_fetcher.url_fetcher import url_fetcher
+from url_fetcher.cache import get_cache_stats
+from url_fetcher.disk_cache import close_disk_cache
+from url_fetcher.http_client import close_http_client
+from url_fetcher.parse_pool import close_parse_pool
+from url_fetcher.url_fetcher import url_fetcher, url_fetcher_batch
 
-__all__ = ["url_fetcher"]
+__all__ = ["url_fetcher", "url_fetcher_batch", "close_http_client", "close_disk_cache", "close_parse_pool",
+           "get_cache_stats"]
@@ -0,0 +1,150 @@
+"""url_fetcher 结果缓存 - 按规范化 URL + 返回格式缓存解析后的结果。"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from url_fetcher.config import FetcherConfig
+from url_fetcher.disk_cache import get_disk_cache_stats
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# 分页缓存：未写入结果缓存（关闭缓存或部分结果）但还有后续页的结果在这里短暂保留
+PAGINATION_CACHE_TTL = 300.0
+PAGINATION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def normalize_url(url: str) -> str:
+    """规范化 URL：协议和域名小写，去掉默认端口和片段，查询参数按键排序。"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = f"{parts.username}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def make_cache_key(url: str, return_format: str, options: str = "") -> str:
+    """缓存键：返回格式、影响结果的获取选项和规范化 URL。"""
+    if options:
+        return f"{return_format}:{options}:{normalize_url(url)}"
+    return f"{return_format}:{normalize_url(url)}"
+
+
+@dataclass
+class CacheEntry:
+    value: dict
+    size: int
+    stored_at: float
+
+
+class ResultCache:
+    """按字节数限制容量的 LRU + TTL 缓存。
+
+    条目按访问顺序保存在 ``OrderedDict`` 中（末尾最近使用），写入后总字节数超过 ``max_bytes``
+    时从头部淘汰最久未使用的条目；条目大小按结果 JSON 序列化后的 UTF-8 字节数计算，单个条目
+    超过 ``max_bytes`` 时不缓存。超过 ``ttl`` 秒的条目在读取时删除。
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        """读取缓存，返回 (结果, 缓存时长秒数)；不存在或已过期时返回 None。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        age = time.monotonic() - entry.stored_at
+        if age > self.ttl:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value, age
+
+    def put(self, key: str, value: dict):
+        """写入缓存，必要时淘汰最久未使用的条目。"""
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = CacheEntry(value, size, time.monotonic())
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> dict:
+        """返回缓存的容量和命中统计。"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_result_cache: ResultCache | None = None
+
+
+def get_result_cache(config: FetcherConfig) -> ResultCache | None:
+    """获取进程内共享的结果缓存（首次调用时按配置创建），关闭缓存时返回 None。"""
+    global _result_cache
+    if not config.cache_enabled:
+        return None
+    if _result_cache is None:
+        _result_cache = ResultCache(config.cache_max_bytes, config.cache_ttl)
+    return _result_cache
+
+
+_pagination_cache: ResultCache | None = None
+
+
+def get_pagination_cache() -> ResultCache:
+    """获取分页缓存（不受 FETCHER_CACHE 开关影响）：后续页从第一页使用的同一份结果切片，偏移量不会错位。"""
+    global _pagination_cache
+    if _pagination_cache is None:
+        _pagination_cache = ResultCache(PAGINATION_CACHE_MAX_BYTES, PAGINATION_CACHE_TTL)
+    return _pagination_cache
+
+
+def get_cache_stats() -> dict:
+    """返回结果缓存的命中、未命中、淘汰和过期计数（启用磁盘缓存时附带 disk_ 前缀的统计）；
+    缓存尚未创建时返回空字典。"""
+    stats = _result_cache.stats() if _result_cache is not None else {}
+    stats.update(get_disk_cache_stats())
+    return stats
@@ -1,6 +1,74 @@
 """url-fetcher 的配置管理。"""
 
+import os
 from dataclasses import dataclass
+from typing import Literal, get_args
+
+# 页面就绪策略：
+#   adaptive          DOMContentLoaded 后，DOM 稳定或网络空闲任一先满足即提取（最多等待 readiness_max_wait）
+#   domcontentloaded  DOMContentLoaded 后立即提取
+#   stable            DOMContentLoaded 后等待 DOM 在 dom_quiet_ms 内没有变化
+#   load              等待 load 事件
+#   networkidle       等待网络空闲（至少 500ms 没有网络请求）
+ReadinessStrategy = Literal["adaptive", "domcontentloaded", "stable", "load", "networkidle"]
+READINESS_STRATEGIES: tuple[str, ...] = get_args(ReadinessStrategy)
+
+# 获取方式：
+#   auto     先用 HTTP 快速路径获取并在服务端提取，正文质量不合格或请求失败时回退到浏览器
+#   http     只使用 HTTP 快速路径
+#   browser  只使用浏览器（Playwright + Readability.js）
+FetchMode = Literal["auto", "http", "browser"]
+FETCH_MODES: tuple[str, ...] = get_args(FetchMode)
+
+# HTML 转 Markdown 引擎：
+#   fast         基于标准库 html.parser 的轻量转换器（url_fetcher/markdown_converter.py），输出与 markdownify 一致
+#   markdownify  BeautifulSoup + markdownify
+MarkdownEngine = Literal["fast", "markdownify"]
+MARKDOWN_ENGINES: tuple[str, ...] = get_args(MarkdownEngine)
+
+# 正文提取和 Markdown 转换的执行方式：
+#   process  大文档在进程池中执行，CPU 计算不占用事件循环所在进程的 GIL
+#   thread   大文档在线程池中执行（纯 Python 计算仍受 GIL 限制，但事件循环可在 GIL 切换间隔内继续调度）
+#   inline   始终在事件循环中直接执行
+ParseExecutor = Literal["process", "thread", "inline"]
+PARSE_EXECUTORS: tuple[str, ...] = get_args(ParseExecutor)
+
+# 解析池默认的工作进程/线程数
+DEFAULT_PARSE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# 默认拦截的资源类型：正文提取只需要 DOM，图片 URL 保留在 <img src> 中，无需下载图片本身
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+
+# 默认拦截的广告/统计域名（同时匹配子域名）
+DEFAULT_BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "chartbeat.com",
+    "hotjar.com",
+    "connect.facebook.net",
+    "hm.baidu.com",
+    "cnzz.com",
+)
+
+# url_fetcher_batch 允许的最大并发数
+BATCH_MAX_CONCURRENCY = 10
+
+
+def _split_env_list(value: str) -> tuple[str, ...]:
+    """把逗号分隔的环境变量值拆分为去除空白的小写元组。"""
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
 
 
 @dataclass
@@ -8,3 +76,171 @@ class FetcherConfig:
     """url-fetcher 的配置设置。"""
 
     default_timeout: int = 20
+    block_resources: bool = True
+    blocked_resource_types: tuple[str, ...] = DEFAULT_BLOCKED_RESOURCE_TYPES
+    blocked_hosts: tuple[str, ...] = DEFAULT_BLOCKED_HOSTS
+    readiness: str = "adaptive"
+    readiness_max_wait: float = 10.0
+    dom_quiet_ms: int = 500
+    readability_max_elems: int = 50000
+    readability_top_candidates: int = 5
+    readability_char_threshold: int = 500
+    extract_budget: float = 5.0
+    partial_on_timeout: bool = True
+    fetch_mode: str = "auto"
+    http_timeout: float = 5.0
+    http_max_bytes: int = 5 * 1024 * 1024
+    min_text_length: int = 500
+    pdf_max_bytes: int = 20 * 1024 * 1024
+    content_probe: bool = True
+    max_length: int = 100000
+    markdown_engine: str = "fast"
+    parse_executor: str = "process"
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+    parse_inline_max_bytes: int = 32 * 1024
+    cache_enabled: bool = True
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl: float = 600.0
+    disk_cache_path: str = ""
+    disk_cache_max_bytes: int = 256 * 1024 * 1024
+    batch_concurrency: int = 5
+    batch_max_urls: int = 30
+
+    @classmethod
+    def from_env(cls) -> "FetcherConfig":
+        """从环境变量创建配置。
+
+        支持的环境变量：
+            FETCHER_BLOCK_RESOURCES: 获取网页时是否拦截非必要的资源请求，默认为 True。
+                设置为 "0"、"false"、"no"、"off" 时为 False
+            FETCHER_BLOCKED_RESOURCE_TYPES: 拦截的 Playwright 资源类型，逗号分隔，
+                默认为 "image,media,font,stylesheet"
+            FETCHER_BLOCKED_HOSTS: 额外拦截的域名（同时匹配子域名），逗号分隔，追加到内置的广告/统计域名列表
+            FETCHER_READINESS: 默认的页面就绪策略，默认为 "adaptive"，
+                可选 "domcontentloaded"、"stable"、"load"、"networkidle"，其他值按 "adaptive" 处理
+            FETCHER_READINESS_MAX_WAIT: adaptive 策略在 DOMContentLoaded 之后最多等待的时间（秒），默认为 10
+            FETCHER_DOM_QUIET_MS: DOM 无变化多久（毫秒）视为稳定，默认为 500
+            FETCHER_READABILITY_MAX_ELEMS: 页面元素数超过该值时跳过 Readability，改用 innerText 提取，默认为 50000，
+                0 表示不限制
+            FETCHER_READABILITY_TOP_CANDIDATES: Readability 比较的候选正文节点数（nbTopCandidates），默认为 5
+            FETCHER_READABILITY_CHAR_THRESHOLD: Readability 认为提取成功的最少字符数（charThreshold），默认为 500
+            FETCHER_EXTRACT_BUDGET: 浏览器内正文提取的时间预算（秒），超时后终止脚本并改用 innerText 提取，默认为 5
+            FETCHER_PARTIAL_ON_TIMEOUT: 浏览器导航超时后是否停止加载并提取已加载的内容（结果标记为 partial），默认为 True。
+                设置为 "0"、"false"、"no"、"off" 时为 False，导航超时直接返回错误
+            FETCHER_MODE: 获取方式，默认为 "auto"，可选 "http"、"browser"，其他值按 "auto" 处理
+            FETCHER_HTTP_TIMEOUT: HTTP 快速路径的超时时间（秒），默认为 5
+            FETCHER_HTTP_MAX_BYTES: HTTP 快速路径允许的最大响应字节数，默认为 5242880（5MB）
+            FETCHER_MIN_TEXT_LENGTH: HTTP 快速路径提取的正文少于该字符数时回退到浏览器，默认为 500
+            FETCHER_PDF_MAX_MB: 允许下载的 PDF 大小上限（MB），默认为 20；纯文本、JSON 和订阅源使用 FETCHER_HTTP_MAX_BYTES，
+                纯文本和 JSON 超出时截断，其他类型超出时返回错误
+            FETCHER_CONTENT_PROBE: browser 模式导航前是否先发送 HEAD 请求探测内容类型，非 HTML 文档（PDF、JSON 等）
+                直接由轻量处理器处理，默认为 True。设置为 "0"、"false"、"no"、"off" 时为 False
+            FETCHER_MAX_LENGTH: url_fetcher 单次返回的最大正文字符数，超出部分分页返回，默认为 100000，0 表示不限制
+            FETCHER_MARKDOWN_ENGINE: HTML 转 Markdown 的引擎，默认为 "fast"，可选 "markdownify"，其他值按 "fast" 处理
+            FETCHER_PARSE_EXECUTOR: 正文提取和 Markdown 转换的执行方式，默认为 "process"，可选 "thread"、"inline"，
+                其他值按 "process" 处理
+            FETCHER_PARSE_WORKERS: 解析池的工作进程/线程数，默认为 CPU 核数（最多 4）
+            FETCHER_PARSE_INLINE_KB: 小于该大小（KB，按字符数计算）的文档直接在事件循环中处理，避免进程间传输开销，
+                默认为 32
+            FETCHER_CACHE: 是否启用进程内结果缓存，默认为 True。设置为 "0"、"false"、"no"、"off" 时为 False
+            FETCHER_CACHE_MAX_MB: 结果缓存的容量上限（MB，按结果 JSON 字节数计算），默认为 64
+            FETCHER_CACHE_TTL: 结果缓存的有效期（秒），默认为 600；磁盘缓存中超过该时长的条目需重新验证
+            FETCHER_DISK_CACHE: 持久化结果缓存的 SQLite 文件路径，默认为空（不启用）
+            FETCHER_DISK_CACHE_MAX_MB: 持久化结果缓存的容量上限（MB，按压缩后字节数计算），默认为 256
+            FETCHER_BATCH_CONCURRENCY: url_fetcher_batch 默认的并发数，默认为 5，范围 1-10
+            FETCHER_BATCH_MAX_URLS: url_fetcher_batch 单次最多接受的 URL 数量，默认为 30
+        """
+        block_resources_str = os.getenv("FETCHER_BLOCK_RESOURCES", "true").lower()
+        block_resources = block_resources_str not in ("0", "false", "no", "off")
+
+        types_str = os.getenv("FETCHER_BLOCKED_RESOURCE_TYPES")
+        if types_str is None:
+            blocked_resource_types = DEFAULT_BLOCKED_RESOURCE_TYPES
+        else:
+            blocked_resource_types = _split_env_list(types_str)
+
+        blocked_hosts = DEFAULT_BLOCKED_HOSTS + _split_env_list(os.getenv("FETCHER_BLOCKED_HOSTS", ""))
+
+        readiness = os.getenv("FETCHER_READINESS", "adaptive").strip().lower()
+        if readiness not in READINESS_STRATEGIES:
+            readiness = "adaptive"
+        readiness_max_wait = max(0.0, float(os.getenv("FETCHER_READINESS_MAX_WAIT", "10")))
+        dom_quiet_ms = max(50, int(os.getenv("FETCHER_DOM_QUIET_MS", "500")))
+
+        # 浏览器内正文提取
+        readability_max_elems = max(0, int(os.getenv("FETCHER_READABILITY_MAX_ELEMS", "50000")))
+        readability_top_candidates = max(1, int(os.getenv("FETCHER_READABILITY_TOP_CANDIDATES", "5")))
+        readability_char_threshold = max(0, int(os.getenv("FETCHER_READABILITY_CHAR_THRESHOLD", "500")))
+        extract_budget = max(0.5, float(os.getenv("FETCHER_EXTRACT_BUDGET", "5")))
+        partial_str = os.getenv("FETCHER_PARTIAL_ON_TIMEOUT", "true").lower()
+        partial_on_timeout = partial_str not in ("0", "false", "no", "off")
+
+        fetch_mode = os.getenv("FETCHER_MODE", "auto").strip().lower()
+        if fetch_mode not in FETCH_MODES:
+            fetch_mode = "auto"
+        http_timeout = max(0.5, float(os.getenv("FETCHER_HTTP_TIMEOUT", "5")))
+        http_max_bytes = max(1024, int(os.getenv("FETCHER_HTTP_MAX_BYTES", str(5 * 1024 * 1024))))
+        min_text_length = max(0, int(os.getenv("FETCHER_MIN_TEXT_LENGTH", "500")))
+
+        # 非 HTML 文档
+        pdf_max_bytes = int(max(1.0, float(os.getenv("FETCHER_PDF_MAX_MB", "20"))) * 1024 * 1024)
+        content_probe_str = os.getenv("FETCHER_CONTENT_PROBE", "true").lower()
+        content_probe = content_probe_str not in ("0", "false", "no", "off")
+
+        max_length = max(0, int(os.getenv("FETCHER_MAX_LENGTH", "100000")))
+        markdown_engine = os.getenv("FETCHER_MARKDOWN_ENGINE", "fast").strip().lower()
+        if markdown_engine not in MARKDOWN_ENGINES:
+            markdown_engine = "fast"
+
+        # 解析池
+        parse_executor = os.getenv("FETCHER_PARSE_EXECUTOR", "process").strip().lower()
+        if parse_executor not in PARSE_EXECUTORS:
+            parse_executor = "process"
+        parse_workers = max(1, int(os.getenv("FETCHER_PARSE_WORKERS", str(DEFAULT_PARSE_WORKERS))))
+        parse_inline_max_bytes = int(max(0.0, float(os.getenv("FETCHER_PARSE_INLINE_KB", "32"))) * 1024)
+
+        # 进程内结果缓存
+        cache_str = os.getenv("FETCHER_CACHE", "true").lower()
+        cache_enabled = cache_str not in ("0", "false", "no", "off")
+        cache_max_bytes = int(max(1.0, float(os.getenv("FETCHER_CACHE_MAX_MB", "64"))) * 1024 * 1024)
+        cache_ttl = max(0.0, float(os.getenv("FETCHER_CACHE_TTL", "600")))
+
+        # 持久化结果缓存
+        disk_cache_path = os.getenv("FETCHER_DISK_CACHE", "").strip()
+        disk_cache_max_bytes = int(max(1.0, float(os.getenv("FETCHER_DISK_CACHE_MAX_MB", "256"))) * 1024 * 1024)
+
+        # 批量获取
+        batch_concurrency = min(BATCH_MAX_CONCURRENCY, max(1, int(os.getenv("FETCHER_BATCH_CONCURRENCY", "5"))))
+        batch_max_urls = max(1, int(os.getenv("FETCHER_BATCH_MAX_URLS", "30")))
+
+        return cls(
+            block_resources=block_resources,
+            blocked_resource_types=blocked_resource_types,
+            blocked_hosts=blocked_hosts,
+            readiness=readiness,
+            readiness_max_wait=readiness_max_wait,
+            dom_quiet_ms=dom_quiet_ms,
+            readability_max_elems=readability_max_elems,
+            readability_top_candidates=readability_top_candidates,
+            readability_char_threshold=readability_char_threshold,
+            extract_budget=extract_budget,
+            partial_on_timeout=partial_on_timeout,
+            fetch_mode=fetch_mode,
+            http_timeout=http_timeout,
+            http_max_bytes=http_max_bytes,
+            min_text_length=min_text_length,
+            pdf_max_bytes=pdf_max_bytes,
+            content_probe=content_probe,
+            max_length=max_length,
+            markdown_engine=markdown_engine,
+            parse_executor=parse_executor,
+            parse_workers=parse_workers,
+            parse_inline_max_bytes=parse_inline_max_bytes,
+            cache_enabled=cache_enabled,
+            cache_max_bytes=cache_max_bytes,
+            cache_ttl=cache_ttl,
+            disk_cache_path=disk_cache_path,
+            disk_cache_max_bytes=disk_cache_max_bytes,
+            batch_concurrency=batch_concurrency,
+            batch_max_urls=batch_max_urls,
+        )
@@ -0,0 +1,53 @@
+"""url_fetcher 总时限 - 一次获取的 timeout 在缓存查询、页面获取、导航、提取和解析各阶段之间共享。"""
+
+import asyncio
+import inspect
+import time
+from typing import Awaitable, TypeVar
+
+from url_fetcher.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """从创建时开始计时的总时限，各阶段只能使用剩余的时间。"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._start = time.monotonic()
+        self.expires_at = self._start + timeout
+
+    def remaining(self) -> float:
+        """剩余时间（秒），已到期时为 0。"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed_ms(self) -> float:
+        return round((time.monotonic() - self._start) * 1000, 1)
+
+    def budget(self, phase: str, cap: float | None = None) -> float:
+        """返回 phase 阶段可用的时间（剩余时间，不超过 cap）。
+
+        Raises:
+            DeadlineExceededError: 总时限已用尽
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(phase)
+        return remaining if cap is None else min(remaining, cap)
+
+    async def run(self, phase: str, awaitable: Awaitable[T]) -> T:
+        """在剩余时间内等待 awaitable，超时时取消并抛出 DeadlineExceededError。"""
+        try:
+            budget = self.budget(phase)
+        except DeadlineExceededError:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        try:
+            return await asyncio.wait_for(awaitable, budget)
+        except asyncio.TimeoutError:
+            raise self.exceeded(phase) from None
+
+    def exceeded(self, phase: str) -> DeadlineExceededError:
+        return DeadlineExceededError(f"超过总时限（{self.timeout} 秒），在 {phase} 阶段用尽")
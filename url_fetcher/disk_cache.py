@@ -0,0 +1,204 @@
+"""url_fetcher 持久化结果缓存 - 基于 SQLite 的本地文件缓存，支持条件请求重新验证。"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from url_fetcher.config import FetcherConfig
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass
+class DiskEntry:
+    """磁盘缓存条目。
+
+    Attributes:
+        value: 缓存的 url_fetcher 结果
+        url: 获取结果时的最终 URL，重新验证时向该地址发送条件请求
+        etag: 响应的 ETag
+        last_modified: 响应的 Last-Modified
+        age: 距上次写入或重新验证的秒数
+    """
+    value: dict
+    url: str
+    etag: str | None
+    last_modified: str | None
+    age: float
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class DiskCache:
+    """SQLite 持久化缓存，结果 JSON 经 zlib 压缩后存储。
+
+    所有 SQLite 操作通过 ``asyncio.to_thread`` 在线程中执行，不阻塞事件循环；同一连接上的操作由
+    线程锁串行化。写入后压缩数据总字节数超过 ``max_bytes`` 时，按最近访问时间淘汰最旧的条目。
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._entries, self._bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._conn = conn
+        return self._conn
+
+    async def get(self, key: str) -> DiskEntry | None:
+        entry = await asyncio.to_thread(self._get, key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _get(self, key: str) -> DiskEntry | None:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, url, etag, last_modified, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+        payload, url, etag, last_modified, stored_at = row
+        try:
+            value = json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError):
+            # 损坏的条目按未命中处理，重新获取后会被覆盖
+            return None
+        return DiskEntry(value, url, etag, last_modified, now - stored_at)
+
+    async def put(self, key: str, value: dict, url: str, etag: str | None, last_modified: str | None):
+        await asyncio.to_thread(self._put, key, value, url, etag, last_modified)
+
+    def _put(self, key: str, value: dict, url: str, etag: str | None, last_modified: str | None):
+        payload = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        size = len(payload) + len(key)
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, payload, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, payload, size, etag, last_modified, now, now),
+            )
+            if old is None:
+                self._entries += 1
+            else:
+                self._bytes -= old[0]
+            self._bytes += size
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """按最近访问时间从旧到新删除条目，直到总大小不超过上限（需持有锁）。"""
+        if self._bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if self._bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._bytes -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._entries -= len(victims)
+        self.evictions += len(victims)
+
+    async def touch(self, key: str):
+        """条件请求确认内容未变化后，刷新条目的写入时间。"""
+        self.revalidated += 1
+        await asyncio.to_thread(self._touch, key)
+
+    def _touch(self, key: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            conn.commit()
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {
+            "disk_entries": self._entries,
+            "disk_bytes": self._bytes,
+            "disk_max_bytes": self.max_bytes,
+            "disk_hits": self.hits,
+            "disk_misses": self.misses,
+            "disk_revalidated": self.revalidated,
+            "disk_evictions": self.evictions,
+        }
+
+
+_disk_cache: DiskCache | None = None
+
+
+def get_disk_cache(config: FetcherConfig) -> DiskCache | None:
+    """获取共享的磁盘缓存（首次调用时按配置创建），未配置 disk_cache_path 时返回 None。"""
+    global _disk_cache
+    if not config.disk_cache_path:
+        return None
+    if _disk_cache is None:
+        _disk_cache = DiskCache(config.disk_cache_path, config.disk_cache_max_bytes)
+    return _disk_cache
+
+
+def get_disk_cache_stats() -> dict:
+    """返回磁盘缓存的统计（键带 disk_ 前缀）；未启用时返回空字典。"""
+    return _disk_cache.stats() if _disk_cache is not None else {}
+
+
+async def close_disk_cache():
+    """关闭磁盘缓存的数据库连接。"""
+    global _disk_cache
+    if _disk_cache is not None:
+        await _disk_cache.close()
+        _disk_cache = None
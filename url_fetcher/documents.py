@@ -0,0 +1,271 @@
+"""非 HTML 文档的轻量处理 - 纯文本、JSON、RSS/Atom 订阅源和 PDF 不经过浏览器和 Readability。
+
+HttpFetcher 按响应的 Content-Type 判断文档类型并按类型限制下载的字节数，本模块把下载的内容转换为与
+HTMLParser.parse 相同结构的结果（url、title、summary、content、metadata）。转换函数是模块级函数，
+可以在解析池的工作进程中执行。
+"""
+
+import html
+import io
+import json
+import re
+import xml.etree.ElementTree as ElementTree
+from pathlib import PurePosixPath
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from url_fetcher.exceptions import ParseError
+
+# 文档类型：
+#   text  纯文本、Markdown、源代码等，原样返回
+#   json  格式化后返回（markdown 格式放在代码块中）
+#   feed  RSS / Atom 订阅源，提取条目列表；不是订阅源的 XML 按 text 处理
+#   pdf   用可选依赖 pypdf 提取文本
+JSON_CONTENT_TYPES = ("application/json", "text/json")
+FEED_CONTENT_TYPES = (
+    "application/rss+xml", "application/atom+xml", "application/rdf+xml", "application/xml", "text/xml",
+)
+TEXT_CONTENT_TYPES = ("application/javascript", "application/x-sh", "application/x-yaml", "application/yaml",
+                      "application/toml")
+PDF_CONTENT_TYPES = ("application/pdf", "application/x-pdf")
+
+# 超过大小上限时截断（而不是拒绝）的文档类型：截断的文本仍然可读，截断的 JSON 按文本返回
+TRUNCATABLE_KINDS = ("text", "json")
+
+SUMMARY_MAX_LENGTH = 200
+FEED_SUMMARY_MAX_LENGTH = 300
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+MARKDOWN_TITLE_PATTERN = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.M)
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+
+def document_kind(content_type: str, url: str = "") -> str | None:
+    """按 Content-Type（不含参数，小写）判断文档类型，HTML 和无法处理的类型返回 None。
+
+    application/octet-stream 等通用类型按 URL 的 .pdf 扩展名判断。
+    """
+    if content_type in PDF_CONTENT_TYPES:
+        return "pdf"
+    if content_type in JSON_CONTENT_TYPES or content_type.endswith("+json"):
+        return "json"
+    if content_type in FEED_CONTENT_TYPES or \
+            (content_type.endswith("+xml") and content_type != "application/xhtml+xml"):
+        return "feed"
+    if content_type in TEXT_CONTENT_TYPES or (content_type.startswith("text/") and content_type != "text/html"):
+        return "text"
+    if content_type in ("", "application/octet-stream", "binary/octet-stream") and \
+            urlparse(url).path.lower().endswith(".pdf"):
+        return "pdf"
+    return None
+
+
+def convert_document(
+        kind: str,
+        body: bytes,
+        charset: str | None,
+        url: str,
+        return_format: str = "markdown",
+        truncated: bool = False,
+) -> dict[str, Any]:
+    """把下载的文档转换为与 HTMLParser.parse 结构相同的结果。
+
+    Args:
+        kind: document_kind 返回的文档类型
+        body: 响应体（可能已按大小上限截断）
+        charset: 响应头声明的编码
+        url: 最终 URL
+        return_format: 返回格式（"markdown" 或 "text"）
+        truncated: body 是否被截断
+
+    Raises:
+        ParseError: 文档无法解析（PDF 损坏或加密、未安装 pypdf 等）
+    """
+    if kind == "pdf":
+        return _convert_pdf(body, url)
+    text = _decode(body, charset)
+    if kind == "json" and not truncated:
+        try:
+            return _convert_json(json.loads(text), url, return_format)
+        except ValueError:
+            pass
+    elif kind == "feed" and "<!ENTITY" not in text:
+        # 不解析带实体声明的 XML，避免实体扩展攻击
+        try:
+            return _convert_feed(ElementTree.fromstring(body), url, return_format)
+        except (ElementTree.ParseError, ValueError):
+            pass
+    return _convert_text(text, url)
+
+
+def _decode(body: bytes, charset: str | None) -> str:
+    """按响应头声明的编码解码，未声明时使用 UTF-8（去掉 BOM）。"""
+    try:
+        return body.decode(charset or "utf-8-sig", errors="replace")
+    except LookupError:
+        return body.decode("utf-8-sig", errors="replace")
+
+
+def _url_title(url: str) -> str:
+    """用 URL 路径的文件名（没有时用域名）作为标题。"""
+    parsed = urlparse(url)
+    return unquote(PurePosixPath(parsed.path).name) or parsed.hostname or url
+
+
+def _summary(text: str) -> str:
+    """取第一个非空段落作为摘要，超过 SUMMARY_MAX_LENGTH 时截断。"""
+    for paragraph in text.split("\n\n"):
+        paragraph = WHITESPACE_PATTERN.sub(" ", paragraph).strip()
+        if paragraph:
+            if len(paragraph) <= SUMMARY_MAX_LENGTH:
+                return paragraph
+            return paragraph[:SUMMARY_MAX_LENGTH - 3] + "..."
+    return "无可用摘要"
+
+
+def _result(url: str, title: str, summary: str, content: str, metadata: dict) -> dict[str, Any]:
+    return {
+        "url": url,
+        "title": title.strip() or "无标题",
+        "summary": summary,
+        "content": content,
+        "metadata": {**metadata, "word_count": len(content.split())},
+    }
+
+
+def _convert_text(text: str, url: str) -> dict[str, Any]:
+    """纯文本原样返回，Markdown 文档以第一个一级标题作为标题。"""
+    text = text.strip()
+    match = MARKDOWN_TITLE_PATTERN.search(text[:4096])
+    if match:
+        return _result(url, match.group(1), _summary(text[match.end():]), text, {"document_type": "text"})
+    return _result(url, _url_title(url), _summary(text), text, {"document_type": "text"})
+
+
+def _convert_json(data: Any, url: str, return_format: str) -> dict[str, Any]:
+    """格式化 JSON，markdown 格式放在 json 代码块中。"""
+    pretty = json.dumps(data, ensure_ascii=False, indent=2)
+    content = pretty
+    if return_format == "markdown":
+        fence = "````" if "```" in pretty else "```"
+        content = f"{fence}json\n{pretty}\n{fence}"
+    return _result(url, _url_title(url), _summary(json.dumps(data, ensure_ascii=False)), content,
+                   {"document_type": "json"})
+
+
+def _strip_html(value: str | None, max_length: int = FEED_SUMMARY_MAX_LENGTH) -> str:
+    """去掉订阅源摘要中的 HTML 标签并合并空白，超过 max_length 时截断。"""
+    if not value:
+        return ""
+    text = WHITESPACE_PATTERN.sub(" ", html.unescape(TAG_PATTERN.sub(" ", value))).strip()
+    return text if len(text) <= max_length else text[:max_length - 3] + "..."
+
+
+def _child_text(element: ElementTree.Element, *tags: str) -> str:
+    """返回第一个存在且非空的子元素文本。"""
+    for tag in tags:
+        child = element.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ""
+
+
+def _atom_link(entry: ElementTree.Element) -> str:
+    for link in entry.findall(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return ""
+
+
+def _convert_feed(root: ElementTree.Element, url: str, return_format: str) -> dict[str, Any]:
+    """提取 RSS 2.0、RSS 1.0（RDF）和 Atom 订阅源的标题和条目列表。
+
+    Raises:
+        ValueError: XML 不是订阅源，由调用方按纯文本处理
+    """
+    if root.tag == "rss":
+        channel = root.find("channel")
+        if channel is None:
+            raise ValueError("RSS 缺少 channel")
+        title = _child_text(channel, "title")
+        description = _child_text(channel, "description")
+        items = [
+            (_child_text(item, "title"), _child_text(item, "link", "guid"),
+             _child_text(item, "pubDate", f"{DC_NS}date"),
+             _child_text(item, "description", f"{CONTENT_NS}encoded"))
+            for item in channel.findall("item")
+        ]
+    elif root.tag == f"{ATOM_NS}feed":
+        title = _child_text(root, f"{ATOM_NS}title")
+        description = _child_text(root, f"{ATOM_NS}subtitle")
+        items = [
+            (_child_text(entry, f"{ATOM_NS}title"), _atom_link(entry),
+             _child_text(entry, f"{ATOM_NS}updated", f"{ATOM_NS}published"),
+             _child_text(entry, f"{ATOM_NS}summary", f"{ATOM_NS}content"))
+            for entry in root.findall(f"{ATOM_NS}entry")
+        ]
+    elif root.tag.endswith("RDF"):
+        channel = root.find(f"{RSS1_NS}channel")
+        title = _child_text(channel, f"{RSS1_NS}title") if channel is not None else ""
+        description = _child_text(channel, f"{RSS1_NS}description") if channel is not None else ""
+        items = [
+            (_child_text(item, f"{RSS1_NS}title"), _child_text(item, f"{RSS1_NS}link"),
+             _child_text(item, f"{DC_NS}date"), _child_text(item, f"{RSS1_NS}description"))
+            for item in root.findall(f"{RSS1_NS}item")
+        ]
+    else:
+        raise ValueError(f"不是订阅源：{root.tag}")
+
+    title = title or _url_title(url)
+    description = _strip_html(description)
+    blocks = [f"# {title}" if return_format == "markdown" else title]
+    if description:
+        blocks.append(description)
+    for item_title, link, date, summary in items:
+        item_title = _strip_html(item_title) or link or "无标题"
+        summary = _strip_html(summary)
+        if return_format == "markdown":
+            lines = [f"## [{item_title}]({link})" if link else f"## {item_title}"]
+            if date:
+                lines.append(f"*{date}*")
+            if summary:
+                lines += ["", summary]
+        else:
+            lines = [item_title] + [value for value in (link, date, summary) if value]
+        blocks.append("\n".join(lines))
+
+    content = "\n\n".join(blocks)
+    return _result(url, title, description or _summary("\n\n".join(blocks[1:])), content,
+                   {"document_type": "feed", "item_count": len(items)})
+
+
+def _convert_pdf(body: bytes, url: str) -> dict[str, Any]:
+    """用 pypdf 逐页提取文本，页之间以空行分隔。"""
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError:
+        raise ParseError("提取 PDF 文本需要安装可选依赖 pypdf（uv sync --extra pdf）") from None
+
+    try:
+        reader = PdfReader(io.BytesIO(body))
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise ParseError("PDF 已加密，无法提取文本")
+        pages = [(page.extract_text() or "").strip() for page in reader.pages]
+        info = reader.metadata
+    except PdfReadError as e:
+        raise ParseError(f"解析 PDF 失败：{e!s}") from e
+
+    text = "\n\n".join(page for page in pages if page)
+    if not text:
+        raise ParseError("PDF 中没有可提取的文本（可能是扫描件）")
+    metadata = {"document_type": "pdf", "page_count": len(pages)}
+    if info is not None and info.author:
+        metadata["author"] = info.author
+    title = (info.title if info is not None else None) or _url_title(url)
+    return _result(url, title, _summary(text), text, metadata)
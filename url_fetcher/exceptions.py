@@ -29,3 +29,23 @@ class UnsafeURLError(URLValidationError):
     """URL 不安全（如内网地址）时抛出。"""
 
     pass
+
+
+class DeadlineExceededError(FetchError):
+    """一次获取的总时限在某个阶段用尽时抛出。"""
+
+    pass
+
+
+class NonHTMLContentError(FetchError):
+    """浏览器导航得到的是非 HTML 文档（PDF、JSON 等）时抛出，调用方改用 HTTP 下载并转换。"""
+
+    def __init__(self, message: str, content_type: str):
+        super().__init__(message)
+        self.content_type = content_type
+
+
+class DocumentTooLargeError(FetchError):
+    """非 HTML 文档（PDF、订阅源）超过大小上限时抛出，不回退到浏览器。"""
+
+    pass
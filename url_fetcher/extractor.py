@@ -0,0 +1,180 @@
+"""服务端正文提取 - HTTP 快速路径使用的简化 Readability 算法。
+
+输出与 Readability.js 的 ``parse()`` 结果字段一致（title、content、textContent、excerpt、byline、
+length、siteName），HTMLParser 无需区分内容来自哪条路径。
+"""
+
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, Tag
+
+# 提取前直接移除的非正文标签
+REMOVE_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas",
+    "form", "button", "input", "select", "textarea", "nav", "header", "footer", "aside",
+)
+
+# class/id 命中时视为非正文区域（同时命中 LIKELY_PATTERN 时保留）
+UNLIKELY_PATTERN = re.compile(
+    r"comment|sidebar|footer|header|menu|banner|sponsor|advert|\bads?\b|promo|related|share|social|"
+    r"popup|modal|cookie|subscribe|breadcrumb|pagination",
+    re.I,
+)
+LIKELY_PATTERN = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+
+# 参与打分的正文块
+SCORE_TAGS = ("p", "pre", "blockquote", "li", "td")
+
+# 单页应用常用的挂载点 id，内容为空说明正文由客户端 JS 渲染
+SPA_MOUNT_IDS = ("root", "app", "__next", "__nuxt", "___gatsby")
+
+NOSCRIPT_JS_PATTERN = re.compile(r"javascript", re.I)
+
+
+def extract_article(html: str, url: str, min_text_length: int = 500) -> tuple[dict | None, str | None]:
+    """从 HTML 中提取正文，并检查是否需要回退到浏览器渲染。
+
+    Args:
+        html: 页面 HTML
+        url: 页面 URL，用于把相对链接和图片地址转换为绝对地址
+        min_text_length: 正文至少应有的字符数
+
+    Returns:
+        (文章字典, 回退原因)；质量合格时回退原因为 None，未找到正文时文章字典为 None
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    metadata = _extract_metadata(soup)
+    spa_marker = _detect_spa_marker(soup)
+
+    for tag in soup.find_all(REMOVE_TAGS):
+        tag.decompose()
+    _remove_unlikely(soup)
+
+    candidate = _find_candidate(soup)
+    text = re.sub(r"\s+", " ", candidate.get_text(" ")).strip()
+    if not text:
+        return None, "no_content"
+
+    _absolutize(candidate, url)
+    article = {
+        **metadata,
+        "content": str(candidate),
+        "textContent": text,
+        "length": len(text),
+    }
+    if not article["excerpt"]:
+        first_p = candidate.find("p")
+        article["excerpt"] = first_p.get_text().strip() if first_p else ""
+
+    if spa_marker == "spa_shell":
+        return article, spa_marker
+    if len(text) < min_text_length:
+        return article, "short_text"
+    if spa_marker == "noscript" and len(text) < min_text_length * 3:
+        return article, spa_marker
+    return article, None
+
+
+def _meta(soup: BeautifulSoup, *keys: str) -> str:
+    for key in keys:
+        tag = soup.find("meta", attrs={"property": key}) or soup.find("meta", attrs={"name": key})
+        if tag and tag.get("content"):
+            return tag["content"].strip()
+    return ""
+
+
+def _extract_metadata(soup: BeautifulSoup) -> dict:
+    """提取标题、作者、摘要和站点名。"""
+    title = _meta(soup, "og:title", "twitter:title")
+    if not title and soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    byline = _meta(soup, "author", "article:author")
+    if not byline:
+        author = soup.find(attrs={"rel": "author"}) or soup.find(class_=re.compile(r"byline|author", re.I))
+        if author:
+            byline = author.get_text(" ", strip=True)[:100]
+
+    return {
+        "title": title,
+        "byline": byline or None,
+        "excerpt": _meta(soup, "og:description", "description", "twitter:description"),
+        "siteName": _meta(soup, "og:site_name") or None,
+    }
+
+
+def _detect_spa_marker(soup: BeautifulSoup) -> str | None:
+    """检测客户端渲染的迹象：空的 SPA 挂载点，或提示启用 JavaScript 的 noscript。"""
+    for mount_id in SPA_MOUNT_IDS:
+        mount = soup.find(id=mount_id)
+        if mount is not None and len(mount.get_text(strip=True)) < 50:
+            return "spa_shell"
+    for noscript in soup.find_all("noscript"):
+        if NOSCRIPT_JS_PATTERN.search(noscript.get_text()):
+            return "noscript"
+    return None
+
+
+def _remove_unlikely(soup: BeautifulSoup):
+    """移除 class/id 明显属于导航、评论、广告等区域的元素。"""
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "article", "main"):
+            continue
+        signature = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+        if not signature.strip() or not UNLIKELY_PATTERN.search(signature):
+            continue
+        if LIKELY_PATTERN.search(signature) or tag.find(("article", "main")):
+            continue
+        tag.decompose()
+
+
+def _link_density(tag: Tag) -> float:
+    text_length = len(tag.get_text(strip=True))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(a.get_text(strip=True)) for a in tag.find_all("a"))
+    return link_length / text_length
+
+
+def _find_candidate(soup: BeautifulSoup) -> Tag:
+    """按段落文本为祖先节点打分，返回得分最高的正文容器。"""
+    scores: dict[int, float] = {}
+    nodes: dict[int, Tag] = {}
+    for block in soup.find_all(SCORE_TAGS):
+        text = block.get_text(" ", strip=True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + text.count("，") + min(len(text) // 100, 3)
+        parent = block.parent
+        for weight in (1.0, 0.5):
+            if not isinstance(parent, Tag) or parent.name == "html" or parent is soup:
+                break
+            key = id(parent)
+            nodes[key] = parent
+            scores[key] = scores.get(key, _initial_score(parent)) + score * weight
+            parent = parent.parent
+
+    if not scores:
+        return soup.find("article") or soup.find("main") or soup.body or soup
+
+    best = max(scores, key=lambda key: scores[key] * (1 - _link_density(nodes[key])))
+    return nodes[best]
+
+
+def _initial_score(tag: Tag) -> float:
+    if tag.name in ("article", "main"):
+        return 10.0
+    if tag.name in ("div", "section"):
+        return 5.0
+    signature = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+    return 3.0 if LIKELY_PATTERN.search(signature) else 0.0
+
+
+def _absolutize(container: Tag, url: str):
+    """把正文中的相对链接和图片地址转换为绝对地址。"""
+    for tag, attr in (("a", "href"), ("img", "src")):
+        for element in container.find_all(tag):
+            value = element.get(attr)
+            if value and not value.startswith(("#", "data:", "javascript:", "mailto:")):
+                element[attr] = urljoin(url, value)
@@ -7,11 +7,19 @@ from bs4 import BeautifulSoup
 from markdownify import MarkdownConverter
 
 from url_fetcher.exceptions import ParseError
+from url_fetcher.markdown_converter import html_to_markdown
 
 
 class HTMLParser:
     """解析 Readability.js 的输出。"""
 
+    def __init__(self, markdown_engine: str = "fast"):
+        """
+        Args:
+            markdown_engine: HTML 转 Markdown 的引擎（"fast" 或 "markdownify"），两者输出一致
+        """
+        self.markdown_engine = markdown_engine
+
     def parse(
         self,
         article: dict,
@@ -77,6 +85,8 @@ class HTMLParser:
         return text[:max_length - 3] + "..."
 
     def _html_to_markdown(self, html: str, retain_images: bool) -> str:
+        if self.markdown_engine == "fast":
+            return html_to_markdown(html, strip_images=not retain_images)
         strip_tags = [] if retain_images else ["img"]
         converter = MarkdownConverter(
             bullets="*",
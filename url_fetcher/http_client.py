@@ -0,0 +1,295 @@
+"""HTTP 快速路径 - 使用共享连接池的 httpx 客户端获取静态页面，并在服务端提取正文。"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urljoin
+
+import httpx
+
+from url_fetcher.config import FetcherConfig
+from url_fetcher.deadline import Deadline
+from url_fetcher.documents import TRUNCATABLE_KINDS, document_kind
+from url_fetcher.exceptions import (
+    DeadlineExceededError, DocumentTooLargeError, FetchError, URLValidationError, UnsafeURLError,
+)
+from url_fetcher.extractor import extract_article
+from url_fetcher.parse_pool import run_in_parse_pool
+from url_fetcher.http_utils import cache_validators, is_safe_url
+from url_fetcher.web_client import FetchResult
+
+# 与浏览器 context 保持一致的请求头，避免 HTTP 路径和浏览器路径拿到不同版本的页面
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+MAX_REDIRECTS = 5
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+_client: httpx.AsyncClient | None = None
+
+
+@dataclass
+class _Response:
+    """_get 读取的最终响应。kind 为 "html" 或 documents.document_kind 返回的文档类型（304 响应为空字符串）。"""
+    url: str
+    status: int
+    headers: httpx.Headers
+    content_type: str
+    charset: str | None
+    kind: str
+    body: bytes
+    truncated: bool = False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """获取共享的 httpx 客户端（复用连接池和 keep-alive 连接）。"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=False,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_http_client():
+    """关闭共享的 httpx 客户端。"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _content_type(headers: httpx.Headers) -> str:
+    """取出 Content-Type 的媒体类型（不含参数，小写）。"""
+    return headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def _redirect_location(url: str, response: httpx.Response) -> str | None:
+    """返回重定向目标的绝对 URL，响应不是重定向时返回 None。
+
+    Raises:
+        FetchError: 重定向响应缺少 Location 头
+    """
+    if response.status_code not in REDIRECT_STATUS_CODES:
+        return None
+    location = response.headers.get("location")
+    if not location:
+        raise FetchError(f"{url} 返回重定向状态码 {response.status_code}，但缺少 Location 头")
+    return urljoin(url, location)
+
+
+def _decode_html(content: bytes, header_charset: str | None) -> str:
+    """按响应头或 <meta charset> 声明的编码解码 HTML，未声明时使用 UTF-8。"""
+    charset = header_charset
+    if not charset:
+        match = META_CHARSET_PATTERN.search(content[:4096])
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(charset, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+class HttpFetcher:
+    """通过普通 HTTP GET 获取页面并在 Python 中提取正文。"""
+
+    def __init__(self, config: Optional[FetcherConfig] = None):
+        self.config = config or FetcherConfig.from_env()
+
+    async def fetch(self, url: str, timeout: float, *, deadline: Deadline | None = None) -> FetchResult:
+        """获取页面并提取正文。
+
+        timeout 限制 HTTP 请求；传入调用方的总时限 deadline 时，服务端正文提取只使用其剩余的时间。
+        纯文本、JSON、订阅源和 PDF 等非 HTML 文档不提取正文，下载内容放在 FetchResult.document 中。
+
+        Raises:
+            DeadlineExceededError: 正文提取时总时限用尽
+            URLValidationError: URL 协议无效
+            UnsafeURLError: URL 或重定向目标指向不安全的地址
+            FetchError: 请求失败、状态码错误、不支持的内容类型、响应过大或未能提取正文
+
+        Returns:
+            FetchResult，fetch_info 包含 fetch_path、http_status、content_type、quality_issue（正文质量问题，
+            合格时为 None，调用方据此决定是否回退到浏览器）和 timings_ms（http、extract）；
+            非 HTML 文档被截断时 truncated 为 True
+        """
+        if not is_safe_url(url):
+            if not url.startswith(("http://", "https://")):
+                raise URLValidationError(f"无效的 URL 协议：{url}")
+            raise UnsafeURLError(f"URL 指向不安全的地址（内网地址等）：{url}")
+
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._get(url), timeout)
+        except asyncio.TimeoutError:
+            raise FetchError(f"HTTP 获取 {url} 时超时") from None
+        except httpx.HTTPError as e:
+            raise FetchError(f"HTTP 获取 {url} 时发生错误：{e!s}") from e
+        http_ms = round((time.perf_counter() - start) * 1000, 1)
+        return await self._to_result(response, http_ms, deadline)
+
+    async def _to_result(self, response: _Response, http_ms: float, deadline: Deadline | None) -> FetchResult:
+        """把 _get 读取的响应转换为 FetchResult：HTML 在服务端提取正文，非 HTML 文档原样放在 document 中。"""
+        final_url = response.url
+        fetch_info = {
+            "fetch_path": "http",
+            "http_status": response.status,
+            "content_type": response.content_type,
+            "quality_issue": None,
+        }
+        if response.kind != "html":
+            if response.truncated:
+                fetch_info["truncated"] = True
+            fetch_info["timings_ms"] = {"http": http_ms}
+            document = {
+                "kind": response.kind,
+                "body": response.body,
+                "charset": response.charset,
+                "truncated": response.truncated,
+            }
+            return FetchResult({}, fetch_info, cache_validators(final_url, response.headers), document)
+
+        html = _decode_html(response.body, response.charset)
+        start = time.perf_counter()
+        extracting = run_in_parse_pool(
+            self.config, len(html), extract_article, html, final_url, self.config.min_text_length
+        )
+        article, quality_issue = await (extracting if deadline is None else deadline.run("extract", extracting))
+        extract_ms = round((time.perf_counter() - start) * 1000, 1)
+        if article is None:
+            raise FetchError("未能从 HTTP 响应中提取文章内容")
+
+        fetch_info["quality_issue"] = quality_issue
+        fetch_info["timings_ms"] = {"http": http_ms, "extract": extract_ms}
+        return FetchResult(article, fetch_info, cache_validators(final_url, response.headers))
+
+    async def probe(self, url: str, timeout: float) -> str | None:
+        """发送 HEAD 请求（手动跟随重定向，每一跳都做 SSRF 检查），返回内容类型（不含参数，小写）。
+
+        请求失败、超时、服务器不支持 HEAD、重定向缺少 Location 头或没有 Content-Type 时返回 None，由调用方按 HTML 处理。
+        """
+        async def send() -> str | None:
+            target = url
+            for _ in range(MAX_REDIRECTS + 1):
+                if not is_safe_url(target):
+                    return None
+                response = await get_http_client().head(target)
+                location = _redirect_location(target, response)
+                if location is None:
+                    if response.status_code >= 400:
+                        return None
+                    return _content_type(response.headers) or None
+                target = location
+            return None
+
+        try:
+            return await asyncio.wait_for(send(), timeout)
+        except (asyncio.TimeoutError, httpx.HTTPError, FetchError):
+            return None
+
+    async def revalidate(
+            self,
+            url: str,
+            etag: str | None,
+            last_modified: str | None,
+            timeout: float,
+            *,
+            deadline: Deadline | None = None,
+    ) -> tuple[bool, FetchResult | None]:
+        """发送条件请求（If-None-Match / If-Modified-Since），返回 (内容是否未变化, 内容已变化时的新结果)。
+
+        服务器返回 304 时为 (True, None)；返回新内容时按 fetch 的方式处理响应并返回 (False, FetchResult)，
+        调用方直接复用，不必再次请求；请求失败、超时或响应无法使用时返回 (False, None)，由调用方重新获取。
+
+        Raises:
+            DeadlineExceededError: 提取新内容的正文时总时限用尽
+        """
+        if not is_safe_url(url):
+            return False, None
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return False, None
+
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._get(url, headers), timeout)
+        except (asyncio.TimeoutError, httpx.HTTPError, FetchError):
+            return False, None
+        if response.status == 304:
+            return True, None
+        http_ms = round((time.perf_counter() - start) * 1000, 1)
+        try:
+            return False, await self._to_result(response, http_ms, deadline)
+        except DeadlineExceededError:
+            raise
+        except FetchError:
+            return False, None
+
+    async def _get(self, url: str, conditional_headers: dict | None = None) -> _Response:
+        """手动跟随重定向（每一跳都做 SSRF 检查），返回最终响应。
+
+        HTML、订阅源和 PDF 超过大小上限时抛出 FetchError（Content-Length 超出时不读取响应体），
+        纯文本和 JSON 只读取到上限为止并标记为截断。conditional_headers 只随第一个请求发送，
+        服务器返回 304 时返回 status 为 304、body 为空的响应。
+        """
+        client = get_http_client()
+        headers = conditional_headers
+        for _ in range(MAX_REDIRECTS + 1):
+            async with client.stream("GET", url, headers=headers) as response:
+                headers = None
+                if response.status_code == 304 and conditional_headers:
+                    return _Response(url, 304, response.headers, "", None, "", b"")
+                location = _redirect_location(url, response)
+                if location is not None:
+                    if not is_safe_url(location):
+                        raise UnsafeURLError(f"重定向到不安全的地址：{location}")
+                    url = location
+                    continue
+
+                if response.status_code >= 400:
+                    raise FetchError(f"HTTP 获取 {url} 返回状态码 {response.status_code}")
+                content_type = _content_type(response.headers)
+                kind = "html" if content_type in HTML_CONTENT_TYPES else document_kind(content_type, url)
+                if kind is None:
+                    raise FetchError(f"HTTP 响应的内容类型不受支持：{content_type or '未知类型'}")
+
+                max_bytes = self.config.pdf_max_bytes if kind == "pdf" else self.config.http_max_bytes
+                truncatable = kind in TRUNCATABLE_KINDS
+                content_length = response.headers.get("content-length", "")
+                too_large = FetchError if kind == "html" else DocumentTooLargeError
+                if not truncatable and content_length.isdigit() and int(content_length) > max_bytes:
+                    raise too_large(f"HTTP 响应超过 {max_bytes} 字节（Content-Length: {content_length}）")
+
+                chunks = []
+                size = 0
+                truncated = False
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        if not truncatable:
+                            raise too_large(f"HTTP 响应超过 {max_bytes} 字节")
+                        # 流式读取到上限即停止，不缓冲剩余的响应体
+                        chunks.append(chunk[:len(chunk) - (size - max_bytes)])
+                        truncated = True
+                        break
+                    chunks.append(chunk)
+                return _Response(url, response.status_code, response.headers, content_type,
+                                 response.charset_encoding, kind, b"".join(chunks), truncated)
+
+        raise FetchError(f"重定向次数超过 {MAX_REDIRECTS} 次")
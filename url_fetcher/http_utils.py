@@ -0,0 +1,45 @@
+"""HTTP 公共工具 - 浏览器路径（web_client）和 HTTP 快速路径（http_client）共用的 URL 安全检查和缓存验证信息。"""
+
+import ipaddress
+from urllib.parse import urlparse
+
+
+def is_safe_url(url: str) -> bool:
+    """验证 URL 是否安全（防止 SSRF 攻击）。
+
+    Args:
+        url: 要验证的 URL
+
+    Returns:
+        URL 是否安全
+    """
+    try:
+        parsed = urlparse(url)
+
+        # 只允许 http 和 https 协议
+        if parsed.scheme not in ("http", "https"):
+            return False
+
+        hostname = parsed.hostname
+        if not hostname:
+            return False
+
+        # 检查是否是内网 IP 地址
+        try:
+            ip = ipaddress.ip_address(hostname)
+            # 拒绝私有地址、回环地址和链路本地地址
+            if ip.is_private or ip.is_loopback or ip.is_link_local:
+                return False
+        except ValueError:
+            # 不是 IP 地址，是域名，允许通过
+            pass
+
+        return True
+
+    except Exception:
+        return False
+
+
+def cache_validators(url: str, headers: dict) -> dict:
+    """生成 FetchResult.validators：最终 URL 以及响应头（键为小写）中的 ETag 和 Last-Modified，供磁盘缓存重新验证使用。"""
+    return {"url": url, "etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
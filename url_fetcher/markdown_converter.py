@@ -0,0 +1,542 @@
+"""快速 HTML 转 Markdown 引擎 - 基于标准库 html.parser 的轻量转换器。
+
+输出与 HTMLParser 使用的 markdownify 配置（``bullets="*"``、``heading_style="ATX"``）保持一致，
+区别只在实现：用 ``__slots__`` 的轻量节点代替 BeautifulSoup 树，祖先标签用位标志传递而不是逐层复制集合，
+兄弟节点按下标访问而不是遍历链表，避免了 markdownify 在每个节点上 ``find_parent("pre")`` 回溯到根节点的开销。
+"""
+
+import re
+from html.entities import html5 as _html5_entities
+from html.parser import HTMLParser as _StdHTMLParser
+
+# 与 BeautifulSoup HTMLTreeBuilder 一致的空元素
+VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+))
+
+# 内部的纯空白文本不折叠的标签（BeautifulSoup 的 preserve_whitespace_tags）
+PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+
+# 去除内部首尾空白的块级标签（另外还有所有 h<N> 标题）
+BLOCK_TAGS = frozenset((
+    "p", "blockquote", "article", "div", "section", "ol", "ul", "li", "dl", "dt", "dd",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th",
+))
+
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# 以分号结尾的 HTML5 命名字符引用（与 BeautifulSoup 的 HTML_ENTITY_TO_CHARACTER 相同）
+HTML_ENTITIES = {name[:-1]: character for name, character in _html5_entities.items() if name.endswith(";")}
+
+re_html_heading = re.compile(r"h(\d+)")
+re_line_with_content = re.compile(r"^(.*)", flags=re.MULTILINE)
+re_whitespace = re.compile(r"[\t ]+")
+re_all_whitespace = re.compile(r"[\t \r\n]+")
+re_newline_whitespace = re.compile(r"[\t \r\n]*[\r\n][\t \r\n]*")
+re_pre_lstrip = re.compile(r"^[ \n]*\n")
+re_pre_rstrip = re.compile(r"[ \n]*$")
+re_extract_newlines = re.compile(r"^(\n*)((?:.*[^\n])?)(\n*)$", flags=re.DOTALL)
+re_backtick_runs = re.compile(r"`+")
+re_collapse_blank_lines = re.compile(r"\n\n\n+")
+
+# 祖先标签位标志：在 pre 中、在 pre/code/kbd/samp 中（不转义不格式化）、在标题或单元格中（行内）、在 li 中
+IN_PRE = 1
+NO_FORMAT = 2
+INLINE = 4
+IN_LI = 8
+
+NO_FORMAT_TAGS = frozenset(("pre", "code", "kbd", "samp"))
+
+
+class _Element:
+    __slots__ = ("name", "attrs", "children", "parent", "index", "block_inside", "block_outside")
+
+    def __init__(self, name: str, attrs: dict, parent: "_Element | None", index: int):
+        self.name = name
+        self.attrs = attrs
+        self.children: list = []
+        self.parent = parent
+        self.index = index
+        self.block_inside = name in BLOCK_TAGS or re_html_heading.match(name) is not None
+        self.block_outside = self.block_inside or name == "pre"
+
+
+class _Comment(str):
+    """注释、文档类型声明和处理指令，转换时忽略，但作为兄弟节点参与空白判断。"""
+    __slots__ = ()
+
+
+class _TreeBuilder(_StdHTMLParser):
+    """按 BeautifulSoup（html.parser）的规则建树：不做隐式闭合，未匹配的结束标签忽略，
+    标签事件会结束当前文本节点，纯空白文本（pre/textarea 之外）折叠为单个换行或空格。
+
+    空元素的开始标签之后出现的同名结束标签（如 ``<img></img>``）与 BeautifulSoup 一样直接丢弃，不结束文本节点；
+    字符引用也按 BeautifulSoup 的方式解析（未知的 ``&foo;`` 保留为 ``&foo``）。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.root = _Element("[document]", {}, None, 0)
+        self._stack = [self.root]
+        self._data: list[str] = []
+        self._preserve = 0
+        self._closed_void_tags: list[str] = []
+
+    def _flush(self):
+        if not self._data:
+            return
+        text = "".join(self._data)
+        self._data = []
+        if not self._preserve and not text.translate(_ASCII_SPACE_TABLE):
+            text = "\n" if "\n" in text else " "
+        self._append(text)
+
+    def _append(self, node):
+        parent = self._stack[-1]
+        parent.children.append(node)
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs)
+        if tag in VOID_TAGS:
+            self._closed_void_tags.append(tag)
+
+    def _open(self, tag, attrs):
+        self._flush()
+        parent = self._stack[-1]
+        element = _Element(tag, {key: "" if value is None else value for key, value in attrs}, parent,
+                           len(parent.children))
+        parent.children.append(element)
+        if tag not in VOID_TAGS:
+            self._stack.append(element)
+            if tag in PRESERVE_WHITESPACE_TAGS:
+                self._preserve += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._close(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_void_tags:
+            self._closed_void_tags.remove(tag)
+        else:
+            self._close(tag)
+
+    def _close(self, tag):
+        self._flush()
+        for position in range(len(self._stack) - 1, 0, -1):
+            if self._stack[position].name == tag:
+                for element in self._stack[position:]:
+                    if element.name in PRESERVE_WHITESPACE_TAGS:
+                        self._preserve -= 1
+                del self._stack[position:]
+                return
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_entityref(self, name):
+        character = HTML_ENTITIES.get(name)
+        self._data.append(character if character is not None else "&" + name)
+
+    def handle_charref(self, name):
+        base, digits = (16, name[1:]) if name[:1] in ("x", "X") else (10, name)
+        try:
+            self._data.append(_numeric_reference(int(digits, base)))
+        except ValueError:
+            self._data.append(digits)
+
+    def handle_comment(self, data):
+        self._flush()
+        self._append(_Comment(data))
+
+    def handle_decl(self, decl):
+        self.handle_comment(decl)
+
+    def handle_pi(self, data):
+        # 处理指令和 CDATA 在 BeautifulSoup 中是独立的文本节点，markdownify 按普通文本转换
+        self._flush()
+        self._data.append(data)
+        self._flush()
+
+    def unknown_decl(self, data):
+        self.handle_pi(data[len("CDATA["):] if data.upper().startswith("CDATA[") else data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+_ASCII_SPACE_TABLE = str.maketrans("", "", ASCII_SPACES)
+
+
+def _numeric_reference(code: int) -> str:
+    """按 HTML 规范解析数字字符引用：无效码点替换为 U+FFFD，0x80-0x9F 按 Windows-1252 解释。"""
+    if code == 0 or code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+        return "\ufffd"
+    if 0x80 <= code <= 0x9F:
+        try:
+            return bytes([code]).decode("cp1252")
+        except UnicodeDecodeError:
+            return chr(code)
+    return chr(code)
+
+
+def _is_block_content(node) -> bool:
+    if node.__class__ is _Element:
+        return True
+    if node.__class__ is _Comment:
+        return False
+    return node.strip() != ""
+
+
+def _chomp(text: str) -> tuple[str, str, str]:
+    prefix = " " if text and text[0] == " " else ""
+    suffix = " " if text and text[-1] == " " else ""
+    return prefix, suffix, text.strip()
+
+
+def _escape(text: str) -> str:
+    return text.replace("*", r"\*").replace("_", r"\_")
+
+
+def _block_outside(node) -> bool:
+    return node is not None and node.__class__ is _Element and node.block_outside
+
+
+def _find_all(element: _Element, names: tuple[str, ...]) -> list[_Element]:
+    found = []
+    stack = list(reversed(element.children))
+    while stack:
+        node = stack.pop()
+        if node.__class__ is _Element:
+            if node.name in names:
+                found.append(node)
+            stack.extend(reversed(node.children))
+    return found
+
+
+def _previous_tag_sibling(element: _Element) -> _Element | None:
+    siblings = element.parent.children
+    for position in range(element.index - 1, -1, -1):
+        if siblings[position].__class__ is _Element:
+            return siblings[position]
+    return None
+
+
+def _colspan(cell: _Element) -> int:
+    colspan = cell.attrs.get("colspan", "")
+    return max(1, min(1000, int(colspan))) if colspan.isdigit() else 1
+
+
+def _inline(markup: str):
+    """行内标签（粗体、斜体、删除线等）：去掉首尾空格后用 markup 包裹。"""
+    def convert(self, element, text, flags):
+        if flags & NO_FORMAT:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ""
+        return f"{prefix}{markup}{text}{markup}{suffix}"
+    return convert
+
+
+class FastMarkdownConverter:
+    """把 HTML 转换为 Markdown，输出与 markdownify（bullets="*"、ATX 标题）一致。"""
+
+    def __init__(self, strip_images: bool = False):
+        self._converters = {
+            name[len("convert_"):]: getattr(self, name)
+            for name in dir(self) if name.startswith("convert_")
+        }
+        self._converters.update({
+            "b": self.convert_strong, "i": self.convert_em, "s": self.convert_del,
+            "kbd": self.convert_code, "samp": self.convert_code,
+            "article": self.convert_div, "section": self.convert_div, "dl": self.convert_div,
+            "ol": self.convert_ul,
+        })
+        if strip_images:
+            del self._converters["img"]
+
+    def convert(self, html: str) -> str:
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        return self._process_element(builder.root, 0).strip("\n")
+
+    def _process_element(self, element: _Element, flags: int) -> str:
+        children = element.children
+        count = len(children)
+        remove_inside = element.block_inside
+
+        child_flags = flags
+        name = element.name
+        if name == "pre":
+            child_flags |= IN_PRE
+        if name in NO_FORMAT_TAGS:
+            child_flags |= NO_FORMAT
+        if name in ("td", "th") or re_html_heading.match(name):
+            child_flags |= INLINE
+        if name == "li":
+            child_flags |= IN_LI
+
+        strings = []
+        for position, child in enumerate(children):
+            cls = child.__class__
+            if cls is _Element:
+                text = self._process_element(child, child_flags)
+            elif cls is _Comment:
+                continue
+            else:
+                previous = children[position - 1] if position else None
+                following = children[position + 1] if position + 1 < count else None
+                if not child.strip():
+                    if remove_inside and (previous is None or following is None):
+                        continue
+                    if _block_outside(previous) or _block_outside(following):
+                        continue
+                text = self._process_text(child, child_flags, remove_inside, previous, following)
+            if text:
+                strings.append(text)
+
+        if name == "pre" or flags & IN_PRE:
+            text = "".join(strings)
+        else:
+            # 合并子节点边界处的换行：前一个子节点末尾和当前子节点开头的换行取较多者，最多 2 个
+            merged = [""]
+            for string in strings:
+                leading, content, trailing = re_extract_newlines.match(string).groups()
+                if merged[-1] and leading:
+                    previous_trailing = merged.pop()
+                    leading = "\n" * min(2, max(len(previous_trailing), len(leading)))
+                merged.extend((leading, content, trailing))
+            text = "".join(merged)
+
+        convert = self._converters.get(name)
+        if convert is None and re_html_heading.match(name):
+            convert = self._convert_heading
+        if convert is not None:
+            text = convert(element, text, flags)
+        return text
+
+    @staticmethod
+    def _process_text(text: str, flags: int, parent_block: bool, previous, following) -> str:
+        if not flags & IN_PRE:
+            # 两个替换在没有换行、制表符或连续空格时都不会改变文本，先做廉价的包含检查
+            if "\n" in text or "\r" in text:
+                text = re_newline_whitespace.sub("\n", text)
+            if "\t" in text or "  " in text:
+                text = re_whitespace.sub(" ", text)
+        if not flags & NO_FORMAT:
+            text = _escape(text)
+        if _block_outside(previous) or (parent_block and previous is None):
+            text = text.lstrip(" \t\r\n")
+        if _block_outside(following) or (parent_block and following is None):
+            text = text.rstrip()
+        return text
+
+    convert_strong = _inline("**")
+    convert_em = _inline("*")
+    convert_del = _inline("~~")
+    convert_sub = _inline("")
+    convert_sup = _inline("")
+
+    def convert_a(self, element, text, flags):
+        if flags & NO_FORMAT:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ""
+        href = element.attrs.get("href")
+        title = element.attrs.get("title")
+        if text.replace(r"\_", "_") == href and not title:
+            return f"<{href}>"
+        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+        return f"{prefix}[{text}]({href}{title_part}){suffix}" if href else text
+
+    def convert_blockquote(self, element, text, flags):
+        text = (text or "").strip(" \t\r\n")
+        if flags & INLINE:
+            return " " + text + " "
+        if not text:
+            return "\n"
+        text = re_line_with_content.sub(lambda m: "> " + m.group(1) if m.group(1) else ">", text)
+        return "\n" + text + "\n\n"
+
+    def convert_br(self, element, text, flags):
+        if flags & INLINE:
+            return text + " " if text else " "
+        return "  \n" + text
+
+    def convert_code(self, element, text, flags):
+        if flags & NO_FORMAT:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ""
+        max_backticks = max((len(run) for run in re_backtick_runs.findall(text)), default=0)
+        delimiter = "`" * (max_backticks + 1)
+        if max_backticks > 0:
+            text = " " + text + " "
+        return f"{prefix}{delimiter}{text}{delimiter}{suffix}"
+
+    def convert_div(self, element, text, flags):
+        if flags & INLINE:
+            return " " + text.strip() + " "
+        text = text.strip()
+        return f"\n\n{text}\n\n" if text else ""
+
+    def convert_dd(self, element, text, flags):
+        text = (text or "").strip()
+        if flags & INLINE:
+            return " " + text + " "
+        if not text:
+            return "\n"
+        text = re_line_with_content.sub(lambda m: "    " + m.group(1) if m.group(1) else "", text)
+        return ":" + text[1:] + "\n"
+
+    def convert_dt(self, element, text, flags):
+        text = re_all_whitespace.sub(" ", (text or "").strip())
+        if flags & INLINE:
+            return " " + text + " "
+        if not text:
+            return "\n"
+        return f"\n\n{text}\n"
+
+    def _convert_heading(self, element, text, flags):
+        if flags & INLINE:
+            return text
+        level = max(1, min(6, int(re_html_heading.match(element.name).group(1))))
+        text = re_all_whitespace.sub(" ", text.strip())
+        return "\n\n%s %s\n\n" % ("#" * level, text)
+
+    def convert_hr(self, element, text, flags):
+        return "\n\n---\n\n"
+
+    def convert_img(self, element, text, flags):
+        alt = element.attrs.get("alt") or ""
+        src = element.attrs.get("src") or ""
+        title = element.attrs.get("title") or ""
+        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+        if flags & INLINE:
+            return alt
+        return f"![{alt}]({src}{title_part})"
+
+    def convert_video(self, element, text, flags):
+        if flags & INLINE:
+            return text
+        src = element.attrs.get("src") or ""
+        if not src:
+            sources = [source for source in _find_all(element, ("source",)) if "src" in source.attrs]
+            if sources:
+                src = sources[0].attrs.get("src") or ""
+        poster = element.attrs.get("poster") or ""
+        if src and poster:
+            return f"[![{text}]({poster})]({src})"
+        if src:
+            return f"[{text}]({src})"
+        if poster:
+            return f"![{text}]({poster})"
+        return text
+
+    def convert_ul(self, element, text, flags):
+        before_paragraph = False
+        siblings = element.parent.children
+        for position in range(element.index + 1, len(siblings)):
+            sibling = siblings[position]
+            if _is_block_content(sibling):
+                before_paragraph = sibling.__class__ is not _Element or sibling.name not in ("ul", "ol")
+                break
+        if flags & IN_LI:
+            return "\n" + text.rstrip()
+        return "\n\n" + text + ("\n" if before_paragraph else "")
+
+    def convert_li(self, element, text, flags):
+        text = (text or "").strip()
+        if not text:
+            return "\n"
+        parent = element.parent
+        if parent.name == "ol":
+            start = parent.attrs.get("start", "")
+            start = int(start) if start.isnumeric() else 1
+            previous_items = sum(
+                1 for sibling in parent.children[:element.index]
+                if sibling.__class__ is _Element and sibling.name == "li"
+            )
+            bullet = "%s. " % (start + previous_items)
+        else:
+            bullet = "* "
+        indent = " " * len(bullet)
+        text = re_line_with_content.sub(lambda m: indent + m.group(1) if m.group(1) else "", text)
+        return bullet + text[len(bullet):] + "\n"
+
+    def convert_p(self, element, text, flags):
+        if flags & INLINE:
+            return " " + text.strip(" \t\r\n") + " "
+        text = text.strip(" \t\r\n")
+        return f"\n\n{text}\n\n" if text else ""
+
+    def convert_pre(self, element, text, flags):
+        if not text:
+            return ""
+        text = re_pre_rstrip.sub("", re_pre_lstrip.sub("", text))
+        return f"\n\n```\n{text}\n```\n\n"
+
+    def convert_q(self, element, text, flags):
+        return '"' + text + '"'
+
+    def convert_script(self, element, text, flags):
+        return ""
+
+    def convert_style(self, element, text, flags):
+        return ""
+
+    def convert_table(self, element, text, flags):
+        return "\n\n" + text.strip() + "\n\n"
+
+    def convert_caption(self, element, text, flags):
+        return text.strip() + "\n\n"
+
+    def convert_figcaption(self, element, text, flags):
+        return "\n\n" + text.strip() + "\n\n"
+
+    def convert_td(self, element, text, flags):
+        return " " + text.strip().replace("\n", " ") + " |" * _colspan(element)
+
+    convert_th = convert_td
+
+    def convert_tr(self, element, text, flags):
+        cells = _find_all(element, ("td", "th"))
+        parent = element.parent
+        is_first_row = _previous_tag_sibling(element) is None
+        is_headrow = (
+            all(cell.name == "th" for cell in cells)
+            or (parent.name == "thead" and len(_find_all(parent, ("tr",))) == 1)
+        )
+        is_head_row_missing = (
+            (is_first_row and not parent.name == "tbody")
+            or (is_first_row and parent.name == "tbody" and not _find_all(parent.parent, ("thead",)))
+        )
+        full_colspan = sum(_colspan(cell) for cell in cells)
+        overline = ""
+        underline = ""
+        if is_headrow and is_first_row:
+            underline = "| " + " | ".join(["---"] * full_colspan) + " |\n"
+        elif is_head_row_missing or (
+                is_first_row and (parent.name == "table"
+                                  or (parent.name == "tbody" and not _previous_tag_sibling(parent)))):
+            overline = "| " + " | ".join([""] * full_colspan) + " |\n"
+            overline += "| " + " | ".join(["---"] * full_colspan) + " |\n"
+        return overline + "|" + text + "\n" + underline
+
+
+# 转换器不保存转换状态，按是否去除图片各复用一个实例
+_converters = {strip_images: FastMarkdownConverter(strip_images) for strip_images in (False, True)}
+
+
+def html_to_markdown(html: str, strip_images: bool = False) -> str:
+    """把 HTML 转换为 Markdown，并与 HTMLParser 的 markdownify 引擎一样合并多余空行、去除首尾空白。"""
+    markdown = _converters[strip_images].convert(html)
+    return re_collapse_blank_lines.sub("\n\n", markdown).strip()
@@ -0,0 +1,99 @@
+"""url_fetcher 解析池 - 把正文提取和 Markdown 转换等 CPU 密集的工作移出事件循环。
+
+大文档的 BeautifulSoup 解析和 Markdown 转换可能需要数百毫秒，直接在协程中执行会阻塞同一事件循环上的
+所有 MCP 请求（包括 web_dev 交互）。超过 ``parse_inline_max_bytes`` 的文档交给共享的进程池（或线程池）处理，
+小文档仍在事件循环中直接执行，避免进程间传输的开销。
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from url_fetcher.config import FetcherConfig
+from url_fetcher.documents import convert_document
+from url_fetcher.html_parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Executor | None = None
+_executor_key: tuple[str, int] | None = None
+
+
+def _parse(article: dict, url: str, return_format: str, markdown_engine: str) -> dict[str, Any]:
+    """在工作进程/线程中执行的解析函数（模块级函数，可被 pickle）。"""
+    return HTMLParser(markdown_engine).parse(article, url, return_format)
+
+
+def get_parse_executor(config: FetcherConfig) -> Executor | None:
+    """获取共享的解析池（首次调用或执行方式、工作数变化时按配置创建），parse_executor 为 inline 时返回 None。"""
+    global _executor, _executor_key
+    if config.parse_executor == "inline":
+        return None
+    key = (config.parse_executor, config.parse_workers)
+    if _executor is None or _executor_key != key:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        if config.parse_executor == "process":
+            # 使用 spawn 启动工作进程，不继承父进程的事件循环、线程和浏览器驱动连接；进程在首次提交任务时启动
+            _executor = ProcessPoolExecutor(config.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(config.parse_workers, thread_name_prefix="url_fetcher_parse")
+        _executor_key = key
+    return _executor
+
+
+def _discard_executor(executor: Executor):
+    """丢弃已损坏的进程池，下次调用时重新创建。"""
+    global _executor, _executor_key
+    if _executor is executor:
+        _executor = None
+        _executor_key = None
+    executor.shutdown(wait=False)
+
+
+async def run_in_parse_pool(config: FetcherConfig, size: int, func: Callable[..., T], *args) -> T:
+    """执行 CPU 密集的函数：size 不小于 parse_inline_max_bytes 时在解析池中执行，否则直接执行。
+
+    func 和参数在进程池模式下需要可被 pickle。工作进程意外退出（BrokenProcessPool）时丢弃进程池，
+    本次改为在线程中执行。
+    """
+    executor = get_parse_executor(config) if size >= config.parse_inline_max_bytes else None
+    if executor is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.warning("解析进程池已损坏，重新创建进程池，本次改为在线程中执行")
+        _discard_executor(executor)
+        return await asyncio.to_thread(func, *args)
+
+
+async def parse_article(article: dict, url: str, return_format: str, config: FetcherConfig) -> dict[str, Any]:
+    """用 HTMLParser 解析文章数据，正文 HTML 较大时在解析池中执行。"""
+    size = len(article.get("content") or "") if article else 0
+    return await run_in_parse_pool(config, size, _parse, article, url, return_format, config.markdown_engine)
+
+
+async def parse_document(document: dict, url: str, return_format: str, config: FetcherConfig) -> dict[str, Any]:
+    """转换非 HTML 文档（FetchResult.document），文档较大时在解析池中执行。"""
+    return await run_in_parse_pool(
+        config, len(document["body"]), convert_document, document["kind"], document["body"], document["charset"],
+        url, return_format, document["truncated"],
+    )
+
+
+async def close_parse_pool():
+    """关闭解析池，等待正在执行的任务结束。"""
+    global _executor, _executor_key
+    if _executor is not None:
+        executor = _executor
+        _executor = None
+        _executor_key = None
+        await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
@@ -0,0 +1,85 @@
+"""请求合并 - 相同键的并发调用共享同一次执行。"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """合并相同键的并发调用：同一时刻每个键只执行一次，执行期间到达的调用方等待并共享同一个结果。
+
+    - 执行抛出的异常原样传给所有等待的调用方
+    - 调用方被取消时只退出自己的等待；所有调用方都离开后取消执行本身
+    - 执行结束（或被取消）后立即移除该键，之后的调用重新执行
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call[T]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(
+            self,
+            key: str,
+            func: Callable[[], Awaitable[T]],
+            timeout: float | None = None,
+    ) -> tuple[T, bool]:
+        """执行 func 或加入相同 key 正在进行的执行。
+
+        Args:
+            key: 合并的键
+            func: 没有进行中的执行时调用
+            timeout: 加入其他调用方发起的执行时最多等待的时间（秒）；发起者不受限制，由 func 自行控制时限
+
+        Returns:
+            (结果, 是否共享了其他调用方发起的执行)
+
+        Raises:
+            asyncio.TimeoutError: 加入的执行在 timeout 内没有完成（执行本身继续，供其他调用方共享）
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield：单个调用方被取消或等待超时时不影响其他调用方共享的执行
+            if shared and timeout is not None:
+                return await asyncio.wait_for(asyncio.shield(call.task), timeout), shared
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[T]):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _finish(self, key: str, call: _Call[T]):
+        self._forget(key, call)
+        # 所有调用方都已离开时没有人读取异常，在这里读取以免 asyncio 报告 "exception was never retrieved"
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
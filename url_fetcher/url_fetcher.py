@@ -1,17 +1,28 @@
 """URL-Fetcher 工具函数 - 提供 MCP 工具接口。"""
 
+import asyncio
 import json
 import logging
 import re
+import sqlite3
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Literal
 
-from browser_service import get_global_browser_service
-from url_fetcher.config import FetcherConfig
-from url_fetcher.exceptions import FetchError, URLValidationError
-from url_fetcher.html_parser import HTMLParser
-from url_fetcher.web_client import WebClient
+from browser_service import BrowserCrashedError, get_global_browser_service
+from url_fetcher.cache import get_cache_stats, get_pagination_cache, get_result_cache, make_cache_key
+from url_fetcher.config import BATCH_MAX_CONCURRENCY, FetchMode, FetcherConfig, ReadinessStrategy
+from url_fetcher.deadline import Deadline
+from url_fetcher.disk_cache import DiskCache, get_disk_cache
+from url_fetcher.documents import document_kind
+from url_fetcher.exceptions import (
+    DeadlineExceededError, DocumentTooLargeError, FetchError, NonHTMLContentError, URLValidationError,
+)
+from url_fetcher.http_client import HttpFetcher
+from url_fetcher.parse_pool import parse_article, parse_document
+from url_fetcher.singleflight import SingleFlight
+from url_fetcher.web_client import FetchResult, WebClient
 
 config = FetcherConfig()
 
@@ -29,8 +40,19 @@ if not logger.handlers:
     except (OSError, PermissionError):
         logger.addHandler(logging.NullHandler())
 
+# browser 模式导航前 HEAD 探测的超时上限（秒）
+CONTENT_PROBE_TIMEOUT = 2.0
 
-def create_url_fetcher_result(
+# 两次缓存统计日志之间的最短间隔（秒）
+CACHE_STATS_LOG_INTERVAL = 60.0
+
+_last_cache_stats_log = 0.0
+
+# 进行中的加载（磁盘缓存查询、获取网页和解析），键为结果缓存的键
+_inflight: SingleFlight[tuple[dict, dict]] = SingleFlight()
+
+
+def _url_fetcher_result(
         success: bool,
         url: str,
         title: str | None = None,
@@ -38,8 +60,8 @@ def create_url_fetcher_result(
         content: str | None = None,
         metadata: dict | None = None,
         error: str | None = None,
-) -> str:
-    result = {
+) -> dict:
+    return {
         "success": success,
         "url": url,
         "title": title,
@@ -48,24 +70,275 @@ def create_url_fetcher_result(
         "metadata": metadata,
         "error": error,
     }
-    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+def _log_cache_stats():
+    """距上次记录超过 CACHE_STATS_LOG_INTERVAL 秒时把结果缓存和磁盘缓存的统计写入日志。"""
+    global _last_cache_stats_log
+    now = time.monotonic()
+    if now - _last_cache_stats_log < CACHE_STATS_LOG_INTERVAL:
+        return
+    stats = get_cache_stats()
+    if stats:
+        _last_cache_stats_log = now
+        logger.info(f"CACHE STATS - {stats}")
+
+
+async def _fetch_article(
+        url: str,
+        deadline: Deadline,
+        fetcher_config: FetcherConfig,
+        fetch_mode: str,
+        block_resources: bool | None,
+        readiness: str | None,
+        prefetched: FetchResult | None = None,
+) -> FetchResult:
+    """按获取方式获取文章：auto 模式先走 HTTP 快速路径，不合格时回退到浏览器。
+
+    HTTP 快速路径（请求和服务端提取）最多使用 http_timeout 秒，回退到浏览器时只剩余总时限扣除已用的时间。
+    纯文本、JSON、订阅源和 PDF 等非 HTML 文档由 HTTP 下载后交给轻量处理器，不经过浏览器：
+    HTTP 快速路径直接按响应的内容类型判断；browser 模式在导航前发送 HEAD 请求探测（content_probe），
+    导航得到的响应不是 HTML 时也改用 HTTP 下载。
+
+    prefetched 是磁盘缓存重新验证时条件请求得到的新响应：HTTP 快速路径直接使用它而不再发送请求，
+    browser 模式下非 HTML 文档也直接使用。
+    """
+    fallback_reason = None
+    timings = {}
+    if fetch_mode != "browser":
+        start = time.perf_counter()
+        try:
+            if prefetched is not None:
+                fetched = prefetched
+            else:
+                http_timeout = deadline.budget("http", fetcher_config.http_timeout)
+                fetched = await HttpFetcher(fetcher_config).fetch(url, http_timeout, deadline=deadline)
+            if fetch_mode == "http" or fetched.fetch_info["quality_issue"] is None:
+                return fetched
+            fallback_reason = fetched.fetch_info["quality_issue"]
+        except FetchError as e:
+            if deadline.remaining() <= 0 and not isinstance(e, DeadlineExceededError):
+                raise deadline.exceeded("http") from e
+            if fetch_mode == "http" or deadline.remaining() <= 0 or isinstance(e, DocumentTooLargeError):
+                raise
+            fallback_reason = f"{e!s}"
+        # 回退前 HTTP 快速路径花费的时间
+        timings["http"] = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"HTTP 快速路径不可用，回退到浏览器：url={url}, reason={fallback_reason}")
+    elif prefetched is not None and prefetched.document is not None:
+        prefetched.fetch_info["routed_by"] = "revalidate"
+        return prefetched
+    elif fetcher_config.content_probe:
+        start = time.perf_counter()
+        content_type = await HttpFetcher(fetcher_config).probe(
+            url, deadline.budget("probe", min(fetcher_config.http_timeout, CONTENT_PROBE_TIMEOUT))
+        )
+        timings["probe"] = round((time.perf_counter() - start) * 1000, 1)
+        if content_type is not None and document_kind(content_type, url) is not None:
+            logger.info(f"HEAD 探测到非 HTML 文档，改用 HTTP 下载：url={url}, content_type={content_type}")
+            return await _fetch_document(url, deadline, fetcher_config, "head")
+
+    browser_service = await get_global_browser_service()
+    web_client = WebClient(fetcher_config, browser_service=browser_service)
+    try:
+        try:
+            fetched = await web_client.fetch(url, deadline.timeout, block_resources, readiness, deadline=deadline)
+        except BrowserCrashedError as e:
+            # 读取网页是幂等操作，浏览器崩溃时等待重启后透明重试一次
+            logger.warning(f"浏览器崩溃，重试一次：url={url}, error={e!s}")
+            fetched = await web_client.fetch(url, deadline.timeout, block_resources, readiness, deadline=deadline)
+    except NonHTMLContentError as e:
+        logger.info(f"导航得到非 HTML 文档，改用 HTTP 下载：url={url}, content_type={e.content_type}")
+        return await _fetch_document(url, deadline, fetcher_config, "navigation")
+
+    if fallback_reason is not None:
+        fetched.fetch_info["http_fallback_reason"] = fallback_reason
+    if timings:
+        fetched.fetch_info["timings_ms"] = {**timings, **fetched.fetch_info["timings_ms"]}
+    return fetched
+
+
+async def _fetch_document(url: str, deadline: Deadline, fetcher_config: FetcherConfig, routed_by: str) -> FetchResult:
+    """browser 模式下探测到非 HTML 文档时改用 HTTP 下载，fetch_info.routed_by 记录判断依据（head / navigation）。"""
+    fetched = await HttpFetcher(fetcher_config).fetch(
+        url, deadline.budget("http", fetcher_config.http_timeout), deadline=deadline
+    )
+    fetched.fetch_info["routed_by"] = routed_by
+    return fetched
+
+
+def _fetch_options(
+        fetcher_config: FetcherConfig,
+        fetch_mode: str,
+        block_resources: bool | None,
+        readiness: str | None,
+) -> str:
+    """影响结果的获取选项，作为缓存键和合并键的一部分（未指定的选项按配置的默认值计）。
+
+    http 模式不经过浏览器，资源拦截和就绪策略不影响结果。
+    """
+    if fetch_mode == "http":
+        return fetch_mode
+    if block_resources is None:
+        block_resources = fetcher_config.block_resources
+    if readiness is None:
+        readiness = fetcher_config.readiness
+    return f"{fetch_mode}|{'block' if block_resources else 'noblock'}|{readiness}"
+
+
+async def _join_load(flight_key: str, load, deadline: Deadline) -> tuple[tuple[dict, dict], bool]:
+    """发起或加入相同 flight_key 的加载。
+
+    发起的加载在本请求的总时限内执行；加入其他请求发起的加载时只按本请求的总时限等待，
+    超时后退出等待（加载继续供其他请求共享）并抛出 load 阶段的 DeadlineExceededError。
+    """
+    try:
+        return await _inflight.do(flight_key, load, timeout=deadline.budget("load"))
+    except asyncio.TimeoutError:
+        raise deadline.exceeded("load") from None
+
+
+def _paginate(content: str, start_index: int, max_length: int) -> tuple[str, dict]:
+    """截取 content 中从 start_index 开始最多 max_length 个字符（0 表示不限制）。
+
+    还有剩余内容时尽量在后半个窗口内的最后一个换行处截断，避免把段落或单词切成两半。
+
+    Returns:
+        (本页内容, 分页信息)
+    """
+    total_length = len(content)
+    start_index = min(start_index, total_length)
+    end = total_length if not max_length else min(start_index + max_length, total_length)
+    if end < total_length:
+        cut = content.rfind("\n", start_index + max_length // 2, end)
+        if cut != -1:
+            end = cut + 1
+
+    has_more = end < total_length
+    return content[start_index:end], {
+        "start_index": start_index,
+        "returned_length": end - start_index,
+        "total_length": total_length,
+        "has_more": has_more,
+        "next_start_index": end if has_more else None,
+    }
+
+
+def _success_response(result: dict, extra_metadata: dict, start_index: int, max_length: int) -> dict:
+    content, pagination = _paginate(result["content"], start_index, max_length)
+    return _url_fetcher_result(
+        True,
+        result["url"],
+        result["title"],
+        result["summary"],
+        content,
+        {**result["metadata"], **extra_metadata, "pagination": pagination},
+    )
+
+
+async def _lookup_disk_cache(
+        disk_cache: DiskCache,
+        cache_key: str,
+        fetcher_config: FetcherConfig,
+        deadline: Deadline,
+) -> tuple[tuple[dict, dict] | None, FetchResult | None]:
+    """查询磁盘缓存，返回 ((结果, 需要合并到 metadata 的缓存信息), None)；未命中时返回 (None, None)。
+
+    未超过 FETCHER_CACHE_TTL 的条目直接返回；过期但带有 ETag/Last-Modified 的条目发送条件请求，
+    服务器返回 304 时刷新写入时间并返回缓存结果，跳过正文提取和格式转换；内容已变化时返回
+    (None, 条件请求得到的 FetchResult)，调用方复用该响应而不再次请求。
+    """
+    entry = await disk_cache.get(cache_key)
+    if entry is None:
+        return None, None
+    if entry.age <= fetcher_config.cache_ttl:
+        return (entry.value, {"cache_hit": True, "cache_source": "disk", "cache_age_s": round(entry.age, 1)}), None
+    if not entry.has_validators:
+        return None, None
+
+    unchanged, fetched = await HttpFetcher(fetcher_config).revalidate(
+        entry.url, entry.etag, entry.last_modified, deadline.budget("revalidate", fetcher_config.http_timeout),
+        deadline=deadline,
+    )
+    if not unchanged:
+        return None, fetched
+    await disk_cache.touch(cache_key)
+    return (entry.value, {"cache_hit": True, "cache_source": "disk", "revalidated": True, "cache_age_s": 0.0}), None
 
 
 async def url_fetcher(
         url: str,
         return_format: Literal["markdown", "text"] = "markdown",
         timeout: int = config.default_timeout,
+        block_resources: bool | None = None,
+        readiness: ReadinessStrategy | None = None,
+        fetch_mode: FetchMode | None = None,
+        bypass_cache: bool = False,
+        start_index: int = 0,
+        max_length: int | None = None,
 ) -> str:
-    """读取网页并转换为 Markdown 或纯文本格式。"""
+    """读取网页并转换为 Markdown 或纯文本格式。
+
+    block_resources 控制是否拦截图片、媒体、字体、样式表和广告/统计域名的请求以加快加载，
+    不传时使用 FETCHER_BLOCK_RESOURCES 配置（默认拦截）；页面依赖样式表才能渲染正文时可设为 false。
+
+    readiness 指定提取前如何判断页面就绪，不传时使用 FETCHER_READINESS 配置（默认 adaptive）：
+    adaptive 在 DOM 稳定或网络空闲任一满足时提取；domcontentloaded 立即提取；stable 等待 DOM 无变化；
+    load 等待 load 事件；networkidle 等待网络空闲。就绪等待超时时仍提取当前内容，
+    metadata 中的 ready_by 和 timings_ms 记录实际满足的条件和各阶段耗时。
+
+    timeout 是整个请求的总时限：磁盘缓存查询、HTTP 快速路径、获取浏览器页面、导航、就绪等待、正文提取和
+    格式转换依次使用剩余的时间，某个阶段用尽时返回错误并指明该阶段。
+
+    fetch_mode 指定获取方式，不传时使用 FETCHER_MODE 配置（默认 auto）：auto 先用 HTTP 请求获取并在
+    服务端提取正文，正文过短或页面需要 JavaScript 渲染时回退到浏览器；http 只用 HTTP 请求；browser 只用浏览器。
+    metadata 中的 fetch_path 记录实际使用的路径（http 或 browser）。
+
+    相同 URL（规范化后）、return_format 和获取选项的结果在进程内缓存 FETCHER_CACHE_TTL 秒，命中时 metadata 中
+    cache_hit 为 true；bypass_cache 为 true 时跳过缓存重新获取，并用新结果刷新缓存。
+    配置 FETCHER_DISK_CACHE 后结果还会持久化到磁盘，过期条目通过 ETag/Last-Modified 条件请求重新验证，
+    metadata 中的 cache_source（memory 或 disk）和 revalidated 记录命中来源。
+    浏览器导航超时时（FETCHER_PARTIAL_ON_TIMEOUT 默认开启）停止加载并提取已加载的内容，metadata 中 partial 为 true，
+    部分结果不写入缓存。
+    相同 URL、return_format 和获取选项（fetch_mode、block_resources、readiness）的并发请求共享同一次获取，
+    共享结果的请求 metadata 中 coalesced 为 true，每个请求仍按自己的 timeout 等待。
+
+    正文较长时分页返回：content 只包含从 start_index 开始最多 max_length 个字符，max_length 不传时使用
+    FETCHER_MAX_LENGTH 配置（默认 100000，0 表示不限制）。metadata.pagination 返回 total_length、has_more 和
+    next_start_index，用 next_start_index 作为 start_index 再次调用即可获取下一页，后续页直接读取结果缓存而不重新获取网页；
+    关闭缓存或部分结果时，后续页读取短暂保留的分页缓存。后续页仍需重新获取网页时 pagination.refetched 为 true，
+    内容可能与之前的页不一致。
+    """
+    result = await _fetch_url(
+        url, return_format, timeout, block_resources, readiness, fetch_mode, bypass_cache, start_index, max_length
+    )
+    _log_cache_stats()
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+async def _fetch_url(
+        url: str,
+        return_format: str,
+        timeout: int,
+        block_resources: bool | None,
+        readiness: str | None,
+        fetch_mode: str | None,
+        bypass_cache: bool,
+        start_index: int,
+        max_length: int | None,
+) -> dict:
+    """url_fetcher 的实现，返回结果字典；url_fetcher_batch 直接调用，不经过 JSON 序列化。"""
     logger.info(
-        f"REQUEST - url={url}, return_format={return_format}, timeout={timeout}")
+        f"REQUEST - url={url}, return_format={return_format}, timeout={timeout}, "
+        f"block_resources={block_resources}, readiness={readiness}, fetch_mode={fetch_mode}, "
+        f"bypass_cache={bypass_cache}, start_index={start_index}, max_length={max_length}")
 
     try:
         url = url.strip()
 
         if not url:
             logger.warning("URL 获取请求失败：url 为空")
-            return create_url_fetcher_result(
+            return _url_fetcher_result(
                 success=False,
                 url="",
                 error="URL 不能为空"
@@ -73,7 +346,7 @@ async def url_fetcher(
 
         if not url.startswith(("http://", "https://")):
             logger.warning(f"URL 获取请求失败：无效的 URL 协议 {url}")
-            return create_url_fetcher_result(
+            return _url_fetcher_result(
                 success=False,
                 url=url,
                 error="URL 必须以 http:// 或 https:// 开头"
@@ -81,44 +354,226 @@ async def url_fetcher(
 
         if not (5 <= timeout <= 60):
             logger.warning(f"URL 获取请求失败：timeout 超出范围 ({timeout})")
-            return create_url_fetcher_result(
+            return _url_fetcher_result(
                 success=False,
                 url=url,
                 error="timeout 必须在 5-60 之间"
             )
 
+        if start_index < 0:
+            logger.warning(f"URL 获取请求失败：start_index 为负数 ({start_index})")
+            return _url_fetcher_result(
+                success=False,
+                url=url,
+                error="start_index 不能为负数"
+            )
+
+        if max_length is not None and max_length < 0:
+            logger.warning(f"URL 获取请求失败：max_length 为负数 ({max_length})")
+            return _url_fetcher_result(
+                success=False,
+                url=url,
+                error="max_length 不能为负数"
+            )
+
         url_cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', url)
         if url_cleaned != url:
             logger.warning(f"URL 包含控制字符，已清理")
             url = url_cleaned
 
-        browser_service = await get_global_browser_service()
+        fetcher_config = FetcherConfig.from_env()
+        if fetch_mode is None:
+            fetch_mode = fetcher_config.fetch_mode
+        if max_length is None:
+            max_length = fetcher_config.max_length
+        cache = get_result_cache(fetcher_config)
+        disk_cache = get_disk_cache(fetcher_config)
+        cache_key = make_cache_key(
+            url, return_format, _fetch_options(fetcher_config, fetch_mode, block_resources, readiness)
+        )
+        deadline = Deadline(timeout)
+        if cache is not None and not bypass_cache:
+            hit = cache.get(cache_key)
+            if hit is not None:
+                result, age = hit
+                cache_info = {"cache_hit": True, "cache_source": "memory", "cache_age_s": round(age, 1)}
+                logger.info(f"RESPONSE - SUCCESS - url={url}, title={result['title']}, cache={cache_info}")
+                return _success_response(result, cache_info, start_index, max_length)
+        if start_index > 0 and not bypass_cache:
+            # 结果缓存中没有（关闭缓存或部分结果）时，后续页从第一页保留的同一份结果切片
+            hit = get_pagination_cache().get(cache_key)
+            if hit is not None:
+                result, age = hit
+                cache_info = {"cache_hit": True, "cache_source": "pagination", "cache_age_s": round(age, 1)}
+                logger.info(f"RESPONSE - SUCCESS - url={url}, title={result['title']}, cache={cache_info}")
+                return _success_response(result, cache_info, start_index, max_length)
 
-        web_client = WebClient(config, browser_service=browser_service)
-        article = await web_client.fetch(url, timeout)
+        async def load() -> tuple[dict, dict]:
+            """查询磁盘缓存，仍未命中时获取网页并解析，然后写入缓存；返回 (结果, 需要合并到 metadata 的信息)。
 
-        parser = HTMLParser()
-        result = parser.parse(article, url, return_format)
+            磁盘缓存查询、获取网页和解析共享同一个总时限，各阶段耗时记录在 metadata.timings_ms 中。
+            """
+            timings = {}
+            prefetched = None
+            if disk_cache is not None and not bypass_cache:
+                start = time.perf_counter()
+                cached = None
+                try:
+                    cached, prefetched = await _lookup_disk_cache(disk_cache, cache_key, fetcher_config, deadline)
+                except sqlite3.Error as e:
+                    logger.warning(f"读取磁盘缓存失败：url={url}, error={e!s}")
+                timings["disk_cache"] = round((time.perf_counter() - start) * 1000, 1)
+                if cached is not None:
+                    if cache is not None:
+                        cache.put(cache_key, cached[0])
+                    return cached
 
-        logger.info(f"RESPONSE - SUCCESS - url={url}, title={result['title']}")
-        return create_url_fetcher_result(
-            True,
-            result["url"],
-            result["title"],
-            result["summary"],
-            result["content"],
-            result["metadata"]
-        )
+            fetched = await _fetch_article(
+                url, deadline, fetcher_config, fetch_mode, block_resources, readiness, prefetched
+            )
+
+            start = time.perf_counter()
+            if fetched.document is not None:
+                parsing = parse_document(fetched.document, url, return_format, fetcher_config)
+            else:
+                parsing = parse_article(fetched.article, url, return_format, fetcher_config)
+            result = await deadline.run("parse", parsing)
+            timings.update(fetched.fetch_info.get("timings_ms", {}))
+            timings["parse"] = round((time.perf_counter() - start) * 1000, 1)
+            timings["total"] = deadline.elapsed_ms()
+            result["metadata"].update(fetched.fetch_info)
+            result["metadata"]["timings_ms"] = timings
+            result["metadata"]["cache_hit"] = False
+            if result["metadata"].get("partial"):
+                # 导航超时时的部分结果不写入缓存，之后的请求重新获取完整页面
+                return result, {}
+            if cache is not None:
+                cache.put(cache_key, result)
+            if disk_cache is not None:
+                validators = fetched.validators
+                try:
+                    await disk_cache.put(
+                        cache_key, result, validators.get("url") or url, validators.get("etag"),
+                        validators.get("last_modified"),
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"写入磁盘缓存失败：url={url}, error={e!s}")
+            return result, {}
+
+        # 相同 URL、格式和获取选项的并发请求共享同一次加载；bypass_cache 的请求不加入可能返回磁盘缓存的加载
+        flight_key = f"bypass:{cache_key}" if bypass_cache else cache_key
+        try:
+            (result, extra_metadata), coalesced = await _join_load(flight_key, load, deadline)
+        except DeadlineExceededError:
+            if deadline.remaining() <= 0:
+                raise
+            # 共享的加载用尽了发起者更短的总时限，本请求还有剩余时间，按自己的总时限重新加载
+            (result, extra_metadata), coalesced = await _join_load(flight_key, load, deadline)
+        if coalesced:
+            extra_metadata = {**extra_metadata, "coalesced": True}
+
+        metadata = result["metadata"]
+        logger.info(
+            f"RESPONSE - SUCCESS - url={url}, title={result['title']}, "
+            f"fetch_path={metadata.get('fetch_path')}, timings_ms={metadata.get('timings_ms')}, "
+            f"cache={extra_metadata}")
+        response = _success_response(result, extra_metadata, start_index, max_length)
+        pagination = response["metadata"]["pagination"]
+        if pagination["has_more"] and (cache is None or metadata.get("partial")):
+            get_pagination_cache().put(cache_key, result)
+        if start_index > 0 and not extra_metadata.get("cache_hit"):
+            # 后续页重新获取了网页，内容可能与之前的页不同，start_index 不一定对应之前的偏移
+            pagination["refetched"] = True
+        return response
 
     except URLValidationError as e:
         error_msg = f"{e!s}"
         logger.info(f"RESPONSE - FAILED - url={url}, error={error_msg}")
-        return create_url_fetcher_result(False, url, error=error_msg)
+        return _url_fetcher_result(False, url, error=error_msg)
     except FetchError as e:
         error_msg = f"{e!s}"
         logger.info(f"RESPONSE - FAILED - url={url}, error={error_msg}")
-        return create_url_fetcher_result(False, url, error=error_msg)
+        return _url_fetcher_result(False, url, error=error_msg)
     except Exception as e:
         error_msg = f"{type(e).__name__}: {e!s}"
         logger.info(f"RESPONSE - FAILED - url={url}, error={error_msg}")
-        return create_url_fetcher_result(False, url, error=error_msg)
+        return _url_fetcher_result(False, url, error=error_msg)
+
+
+def create_url_fetcher_batch_result(
+        success: bool,
+        results: list[dict] | None = None,
+        metadata: dict | None = None,
+        error: str | None = None,
+) -> str:
+    result = {
+        "success": success,
+        "results": results,
+        "metadata": metadata,
+        "error": error,
+    }
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+async def url_fetcher_batch(
+        urls: list[str],
+        return_format: Literal["markdown", "text"] = "markdown",
+        timeout: int = config.default_timeout,
+        concurrency: int | None = None,
+        fetch_mode: FetchMode | None = None,
+        bypass_cache: bool = False,
+) -> str:
+    """并发读取多个网页，按输入顺序返回每个 URL 的结果。
+
+    每个 URL 的处理方式与 url_fetcher 相同（缓存、HTTP 快速路径、浏览器回退），单个 URL 失败不影响其他 URL，
+    results 中每一项都有独立的 success 和 error。timeout 是每个 URL 的总超时（秒），范围 5-60。
+
+    concurrency 指定同时获取的 URL 数量（1-10），不传时使用 FETCHER_BATCH_CONCURRENCY 配置（默认 5）；
+    浏览器页面仍由页面池统一调度。单次最多 FETCHER_BATCH_MAX_URLS 个 URL（默认 30）。
+    """
+    logger.info(
+        f"BATCH REQUEST - urls={len(urls)}, return_format={return_format}, timeout={timeout}, "
+        f"concurrency={concurrency}, fetch_mode={fetch_mode}, bypass_cache={bypass_cache}")
+
+    fetcher_config = FetcherConfig.from_env()
+    if concurrency is None:
+        concurrency = fetcher_config.batch_concurrency
+
+    if not urls:
+        logger.warning("批量获取请求失败：urls 为空")
+        return create_url_fetcher_batch_result(False, error="urls 不能为空")
+    if len(urls) > fetcher_config.batch_max_urls:
+        logger.warning(f"批量获取请求失败：URL 数量超出上限 ({len(urls)})")
+        return create_url_fetcher_batch_result(
+            False, error=f"urls 最多 {fetcher_config.batch_max_urls} 个"
+        )
+    if not (5 <= timeout <= 60):
+        logger.warning(f"批量获取请求失败：timeout 超出范围 ({timeout})")
+        return create_url_fetcher_batch_result(False, error="timeout 必须在 5-60 之间")
+    if not (1 <= concurrency <= BATCH_MAX_CONCURRENCY):
+        logger.warning(f"批量获取请求失败：concurrency 超出范围 ({concurrency})")
+        return create_url_fetcher_batch_result(
+            False, error=f"concurrency 必须在 1-{BATCH_MAX_CONCURRENCY} 之间"
+        )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(url: str) -> dict:
+        # 每个 URL 的总时限由 _fetch_url 内部的 Deadline 控制
+        async with semaphore:
+            return await _fetch_url(url, return_format, timeout, None, None, fetch_mode, bypass_cache, 0, None)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch_one(url) for url in urls))
+    succeeded = sum(1 for result in results if result["success"])
+    metadata = {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "concurrency": concurrency,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+    logger.info(f"BATCH RESPONSE - {metadata}")
+    _log_cache_stats()
+    return create_url_fetcher_batch_result(True, results, metadata)
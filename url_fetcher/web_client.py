@@ -1,15 +1,21 @@
 """使用 Playwright + Readability.js 获取网页内容。"""
 
-import ipaddress
+import asyncio
+import html
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Error as PlaywrightError, Page, Route, TimeoutError as PlaywrightTimeoutError
 
-from browser_service import BrowserService
-from url_fetcher.config import FetcherConfig
-from url_fetcher.exceptions import FetchError, URLValidationError, UnsafeURLError
+from browser_service import BrowserCrashedError, BrowserService, PagePriority, PoolExhaustedError
+from url_fetcher.config import FetcherConfig, READINESS_STRATEGIES
+from url_fetcher.deadline import Deadline
+from url_fetcher.documents import document_kind
+from url_fetcher.exceptions import FetchError, NonHTMLContentError, URLValidationError, UnsafeURLError
+from url_fetcher.http_utils import cache_validators, is_safe_url
 
 # 获取项目根目录（从当前文件路径向上两级）
 READABILITY_JS_PATH = Path(__file__).parent.parent / "res" / "Readability.js"
@@ -38,104 +44,468 @@ def _load_readability_js() -> str:
     return _readability_js_cache
 
 
-def _is_safe_url(url: str) -> bool:
-    """验证 URL 是否安全（防止 SSRF 攻击）。
+# Readability.js 在页面第一次用于 url_fetcher 获取时注册为该页面的初始化脚本，随页面保留到页面关闭，
+# 之后复用该页面的获取不再发送源码；没有用于获取的页面（以及共享的 context）不注册。脚本在顶层文档中定义一个
+# 不可枚举的加载函数，首次调用时才执行 Readability 源码，每次获取只需通过 CDP 发送 EXTRACT_ARTICLE_JS
+READABILITY_INIT_SCRIPT_NAME = "url_fetcher.readability"
+READABILITY_LOADER = "__webMcpReadability"
+
+READABILITY_INIT_SCRIPT = """(() => {
+    if (window !== window.top || Object.prototype.hasOwnProperty.call(window, "%(loader)s")) return;
+    let cached = null;
+    Object.defineProperty(window, "%(loader)s", {
+        value: () => cached || (cached = (function () {
+%(source)s
+return Readability;
+})()),
+    });
+})();"""
+
+# 通过加载函数（或回退注入的全局 Readability）运行 Readability；两者都不存在时返回 loaded: false。
+# 元素数超过 maxElemsToParse 时不克隆 DOM，直接返回 reason: "max_elems"
+EXTRACT_ARTICLE_JS = """(options) => {
+    const load = window.%s;
+    const Reader = typeof load === "function" ? load() : (typeof Readability === "function" ? Readability : null);
+    if (!Reader) return { loaded: false };
+    if (options.maxElemsToParse && document.getElementsByTagName("*").length > options.maxElemsToParse) {
+        return { loaded: true, article: null, reason: "max_elems" };
+    }
+    return { loaded: true, article: new Reader(document.cloneNode(true), options).parse(), reason: null };
+}""" % READABILITY_LOADER
+
+# Readability 不可用时的廉价回退：取 article / main / body 的 innerText
+INNER_TEXT_JS = """() => {
+    const meta = (key) => {
+        const el = document.querySelector(`meta[property="${key}"], meta[name="${key}"]`);
+        return el ? el.getAttribute("content") : null;
+    };
+    const root = document.querySelector("article") || document.querySelector("main") || document.body;
+    return {
+        title: document.title,
+        text: root ? root.innerText : "",
+        excerpt: meta("og:description") || meta("description"),
+        byline: meta("author"),
+        siteName: meta("og:site_name"),
+    };
+}"""
+
+_readability_init_script_cache: Optional[str] = None
+
+
+def _load_readability_init_script() -> str:
+    """生成包装 Readability.js 的初始化脚本（使用模块级缓存）。"""
+    global _readability_init_script_cache
+
+    if _readability_init_script_cache is None:
+        _readability_init_script_cache = READABILITY_INIT_SCRIPT % {
+            "loader": READABILITY_LOADER,
+            "source": _load_readability_js(),
+        }
+
+    return _readability_init_script_cache
+
+
+# 在页面中等待 DOM 在 quietMs 内没有结构或文本变化（忽略属性变化，轮播和动画不会阻止稳定），
+# 超过 maxMs 仍未稳定时返回 false
+DOM_STABLE_JS = """({quietMs, maxMs}) => new Promise(resolve => {
+    let timer = null;
+    const finish = (stable) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(cap);
+        resolve(stable);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(() => finish(true), quietMs);
+    const cap = setTimeout(() => finish(false), maxMs);
+})"""
+
+# 导航超时后停止加载（等同于点击浏览器的停止按钮），返回 body 中是否已有内容
+STOP_LOADING_JS = """() => {
+    window.stop();
+    return !!document.body && document.body.childElementCount > 0;
+}"""
+
+# 停止加载的等待上限（秒），页面主线程被阻塞时放弃部分提取
+STOP_LOADING_TIMEOUT = 2.0
+
+
+@dataclass
+class FetchResult:
+    """WebClient.fetch 的返回结果。
+
+    Attributes:
+        article: Readability.js 返回的字典（title、content、textContent、excerpt、byline、length 等）
+        fetch_info: 获取过程信息，合并到 url_fetcher 结果的 metadata 中
+        validators: 最终响应的缓存验证信息（url、etag、last_modified），供磁盘缓存重新验证使用
+        document: 非 HTML 文档（纯文本、JSON、订阅源、PDF）的下载内容，包含 kind、body、charset、truncated，
+            此时 article 为空，由 ``url_fetcher.documents.convert_document`` 转换
+    """
+    article: dict
+    fetch_info: dict = field(default_factory=dict)
+    validators: dict = field(default_factory=dict)
+    document: dict | None = None
+
+
+def _text_article(raw: dict) -> dict:
+    """把 INNER_TEXT_JS 的结果转换为与 Readability 输出字段一致的文章字典（按行分段）。"""
+    text = raw["text"].strip()
+    paragraphs = [line.strip() for line in text.split("\n") if line.strip()]
+    return {
+        "title": raw["title"],
+        "byline": raw["byline"],
+        "excerpt": raw["excerpt"],
+        "siteName": raw["siteName"],
+        "content": "".join(f"<p>{html.escape(paragraph)}</p>" for paragraph in paragraphs),
+        "textContent": text,
+        "length": len(text),
+    }
+
+
+async def _terminate_script(page: Page):
+    """通过 CDP Runtime.terminateExecution 终止页面中正在运行的脚本。"""
+    session = await page.context.new_cdp_session(page)
+    try:
+        await session.send("Runtime.terminateExecution")
+    finally:
+        await session.detach()
 
-    Args:
-        url: 要验证的 URL
 
-    Returns:
-        URL 是否安全
+async def _stop_loading(page: Page) -> bool:
+    """导航超时后停止加载页面，返回是否已有可提取的文档。
+
+    调用方需先确认本次导航已提交（主框架触发了 framenavigated），否则页面中仍是上一次获取的文档。
     """
     try:
-        parsed = urlparse(url)
+        return await asyncio.wait_for(page.evaluate(STOP_LOADING_JS), STOP_LOADING_TIMEOUT)
+    except (asyncio.TimeoutError, PlaywrightError):
+        return False
 
-        # 只允许 http 和 https 协议
-        if parsed.scheme not in ("http", "https"):
-            return False
 
-        hostname = parsed.hostname
-        if not hostname:
-            return False
+def _is_blocked_host(hostname: str | None, blocked_hosts: tuple[str, ...]) -> bool:
+    """域名是否在拦截列表中（精确匹配或子域名匹配）。"""
+    if not hostname:
+        return False
+    hostname = hostname.lower()
+    return any(hostname == host or hostname.endswith("." + host) for host in blocked_hosts)
 
-        # 检查是否是内网 IP 地址
-        try:
-            ip = ipaddress.ip_address(hostname)
-            # 拒绝私有地址、回环地址和链路本地地址
-            if ip.is_private or ip.is_loopback or ip.is_link_local:
-                return False
-        except ValueError:
-            # 不是 IP 地址，是域名，允许通过
-            pass
 
-        return True
+async def _install_resource_blocking(page: Page, config: FetcherConfig):
+    """拦截图片、媒体、字体、样式表和广告/统计域名的请求，返回路由处理函数。
 
-    except Exception:
-        return False
+    只拦截子资源，主文档请求始终放行。关闭页面重置（BROWSER_RESET_PAGES=false）时
+    browser_service 不会移除路由，调用方需在获取结束后用 _remove_resource_blocking 移除，
+    避免复用的页面上路由处理函数不断累积。
+    """
+    blocked_types = frozenset(config.blocked_resource_types)
+
+    async def handle(route: Route):
+        request = route.request
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            await route.continue_()
+        elif request.resource_type in blocked_types or \
+                _is_blocked_host(urlparse(request.url).hostname, config.blocked_hosts):
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    return handle
+
+
+async def _remove_resource_blocking(page: Page, handler):
+    """移除 _install_resource_blocking 安装的路由（页面已关闭或崩溃时忽略）。"""
+    try:
+        await page.unroute("**/*", handler)
+    except PlaywrightError:
+        pass
 
 
 class WebClient:
     """使用 Playwright + Readability.js 获取网页。"""
 
     def __init__(self, config: Optional[FetcherConfig] = None, *, browser_service: BrowserService):
-        self.config = config or FetcherConfig()
+        self.config = config or FetcherConfig.from_env()
         self._browser_service = browser_service
         # 延迟加载，只在使用时才加载 JS
         self._readability_js: Optional[str] = None
 
-    async def fetch(self, url: str, timeout: int) -> dict:
+    async def fetch(
+            self,
+            url: str,
+            timeout: int,
+            block_resources: bool | None = None,
+            readiness: str | None = None,
+            *,
+            deadline: Deadline | None = None,
+    ) -> FetchResult:
         """获取网页的文章内容（使用 Readability.js）。
 
+        获取页面、导航、就绪等待和正文提取共享同一个总时限，每个阶段只使用剩余的时间。
+
+        导航只等待 DOMContentLoaded，之后按就绪策略等待页面渲染完成；就绪等待超时不视为失败，
+        直接提取当前 DOM（fetch_info 中 ready_by 为 "timeout"）。
+
+        启用 partial_on_timeout 时，导航只使用扣除提取预留时间后的预算；导航超时后停止加载，
+        对已加载的 DOM 提取正文，结果标记为 partial（ready_by 为 "navigation_timeout"）。
+
+        Args:
+            url: 网页 URL
+            timeout: 总超时时间（秒），包括获取页面、导航、就绪等待和正文提取
+            block_resources: 是否拦截图片/媒体/字体/样式表和广告域名的请求，默认使用配置
+            readiness: 就绪策略，见 ``url_fetcher.config.ReadinessStrategy``，默认使用配置
+            deadline: 调用方的总时限（已用于其他阶段时只剩余部分时间），不传时按 timeout 新建
+
+        Raises:
+            DeadlineExceededError: 总时限在某个阶段用尽
+            NonHTMLContentError: 导航得到的是纯文本、JSON、订阅源或 PDF 等非 HTML 文档
+            BrowserCrashedError: 获取过程中浏览器或页面崩溃，调用方可以重试
+
         Returns:
-            Readability.js 返回的字典，包含:
-            - title: 标题
-            - content: HTML 格式的正文
-            - textContent: 纯文本正文
-            - excerpt: 摘要
-            - byline: 作者
-            - length: 长度
+            FetchResult，fetch_info 包含:
+            - fetch_path: 固定为 "browser"
+            - readiness: 使用的就绪策略
+            - ready_by: 实际满足的就绪条件（"domcontentloaded"、"stable"、"load"、"networkidle" 或 "timeout"）
+            - partial: 导航超时后从部分加载的页面提取时为 True，同时 partial_reason 为 "navigation_timeout"
+            - extraction_path: 正文提取方式（"readability" 或 "innertext"），改用 innertext 时
+              extraction_fallback_reason 记录原因（"max_elems"、"timeout" 或 "unavailable"）
+            - timings_ms: 各阶段耗时（acquire、navigate、ready、extract）
         """
         # 延迟加载 Readability.js（使用模块级缓存）
         if self._readability_js is None:
             self._readability_js = _load_readability_js()
 
         # 验证 URL 安全性
-        if not _is_safe_url(url):
+        if not is_safe_url(url):
             if not url.startswith(("http://", "https://")):
                 raise URLValidationError(f"无效的 URL 协议：{url}")
             raise UnsafeURLError(f"URL 指向不安全的地址（内网地址等）：{url}")
 
+        if readiness is None:
+            readiness = self.config.readiness
+        if readiness not in READINESS_STRATEGIES:
+            raise FetchError(f"无效的就绪策略：{readiness}")
+        if block_resources is None:
+            block_resources = self.config.block_resources
+        if deadline is None:
+            deadline = Deadline(timeout)
+
+        timings = {}
         page = None
+        blocking_handler = None
         try:
-            page = await self._browser_service.create_page()
-
-            # 导航到页面,等待网络空闲(处理自动跳转)
-            await page.goto(
-                url,
-                timeout=timeout * 1000,
-                wait_until="networkidle"
+            start = time.perf_counter()
+            page = await self._browser_service.create_page(
+                timeout=deadline.budget("acquire", self._browser_service.config.acquire_timeout),
+                priority=PagePriority.FETCH,
             )
-
-            # 注入 Readability.js
-            await page.evaluate(self._readability_js)
-
-            # 在页面中运行 Readability.js 提取文章
-            article = await page.evaluate("""() => {
-                const article = new Readability(document.cloneNode(true)).parse();
-                return article;
-            }""")
+            await self._browser_service.add_page_init_script(
+                page, READABILITY_INIT_SCRIPT_NAME, _load_readability_init_script()
+            )
+            if block_resources:
+                blocking_handler = await _install_resource_blocking(page, self.config)
+            timings["acquire"] = _elapsed_ms(start)
+
+            start = time.perf_counter()
+            remaining = deadline.budget("navigate")
+            navigation_budget = remaining
+            if self.config.partial_on_timeout:
+                # 为导航超时后的部分提取预留时间
+                navigation_budget = max(min(1.0, remaining), remaining - self._extract_reserve(remaining))
+            partial = False
+            # 记录本次导航是否已提交：主框架的 framenavigated 在新文档提交时触发，
+            # 只有已提交时才能确认页面中不是复用页面上一次获取留下的文档
+            committed = []
+
+            def on_frame_navigated(frame):
+                if frame.parent_frame is None:
+                    committed.append(frame.url)
+
+            page.on("framenavigated", on_frame_navigated)
+            try:
+                response = await page.goto(url, timeout=navigation_budget * 1000, wait_until="domcontentloaded")
+            except PlaywrightTimeoutError:
+                if not self.config.partial_on_timeout or not committed or not await _stop_loading(page):
+                    raise
+                response = None
+                partial = True
+            finally:
+                page.remove_listener("framenavigated", on_frame_navigated)
+            timings["navigate"] = _elapsed_ms(start)
+            if response is not None:
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if document_kind(content_type, page.url) is not None:
+                    raise NonHTMLContentError(f"{url} 不是 HTML 页面：{content_type}", content_type)
+
+            start = time.perf_counter()
+            if partial:
+                ready_by = "navigation_timeout"
+            else:
+                ready_by = await self._wait_until_ready(page, readiness, deadline)
+            timings["ready"] = _elapsed_ms(start)
+
+            start = time.perf_counter()
+            article, extraction_path, fallback_reason = await self._extract(page, deadline)
+            timings["extract"] = _elapsed_ms(start)
 
             if not article:
-                raise FetchError("Readability.js 未能提取文章内容")
-
-            return article
+                raise FetchError("未能从页面中提取文章内容")
+
+            fetch_info = {
+                "fetch_path": "browser",
+                "readiness": readiness,
+                "ready_by": ready_by,
+                "extraction_path": extraction_path,
+                "timings_ms": timings,
+            }
+            if fallback_reason is not None:
+                fetch_info["extraction_fallback_reason"] = fallback_reason
+            if partial:
+                fetch_info["partial"] = True
+                fetch_info["partial_reason"] = "navigation_timeout"
+            return FetchResult(
+                article, fetch_info, cache_validators(page.url, response.headers if response is not None else {})
+            )
 
-        except PlaywrightTimeoutError:
-            raise FetchError(f"获取 {url} 时超时")
-        except FetchError:
+        except (FetchError, BrowserCrashedError):
             raise
         except Exception as e:
+            if page is not None and self._browser_service.is_page_lost(page):
+                raise BrowserCrashedError(f"获取 {url} 时浏览器崩溃：{e!s}") from e
+            if isinstance(e, PlaywrightTimeoutError):
+                if deadline.remaining() <= 0:
+                    raise deadline.exceeded("navigate")
+                raise FetchError(f"获取 {url} 时超时")
+            if isinstance(e, PoolExhaustedError):
+                if deadline.remaining() <= 0:
+                    raise deadline.exceeded("acquire")
+                raise FetchError(f"浏览器繁忙，无法获取 {url}：{e!s}")
             raise FetchError(f"获取 {url} 时发生错误：{e!s}")
         finally:
             if page:
+                if blocking_handler is not None:
+                    await _remove_resource_blocking(page, blocking_handler)
                 await self._browser_service.release_page(page)
+
+    async def _extract(self, page: Page, deadline: Deadline) -> tuple[dict | None, str, str | None]:
+        """在时间预算内用 Readability 提取正文，超出元素上限或时间预算时改用 innerText。
+
+        时间预算不超过总时限的剩余时间，且 Readability 最多使用剩余时间的一半，为 innerText 回退保留时间。
+
+        Returns:
+            (文章字典, 提取路径 "readability" / "innertext",
+             回退原因 "max_elems" / "timeout" / "unavailable"（注入源码后仍无法加载 Readability）或 None)
+        """
+        options = {
+            "maxElemsToParse": self.config.readability_max_elems,
+            "nbTopCandidates": self.config.readability_top_candidates,
+            "charThreshold": self.config.readability_char_threshold,
+        }
+        budget = min(self.config.extract_budget, deadline.budget("extract") / 2)
+        extract_deadline = time.monotonic() + budget
+        try:
+            # 通过页面初始化脚本定义的加载函数运行 Readability.js，只发送一小段调用代码
+            extracted = await asyncio.wait_for(page.evaluate(EXTRACT_ARTICLE_JS, options), budget)
+            if not extracted["loaded"]:
+                # 初始化脚本未生效时回退到注入完整的 Readability.js
+                await page.evaluate(self._readability_js)
+                extracted = await asyncio.wait_for(
+                    page.evaluate(EXTRACT_ARTICLE_JS, options), max(0.1, extract_deadline - time.monotonic())
+                )
+            # 未加载时结果中没有 reason，需先检查 loaded
+            if not extracted["loaded"]:
+                reason = "unavailable"
+            elif extracted["reason"] is None:
+                return extracted["article"], "readability", None
+            else:
+                reason = extracted["reason"]
+        except asyncio.TimeoutError:
+            # evaluate 超时不会停止页面中的脚本，需要终止后才能执行回退提取
+            await _terminate_script(page)
+            reason = "timeout"
+
+        fallback_budget = deadline.budget("extract", self.config.extract_budget)
+        try:
+            raw = await asyncio.wait_for(page.evaluate(INNER_TEXT_JS), fallback_budget)
+        except asyncio.TimeoutError:
+            await _terminate_script(page)
+            if deadline.remaining() <= 0:
+                raise deadline.exceeded("extract") from None
+            raise FetchError(f"正文提取超过时间预算（{fallback_budget} 秒）") from None
+        if not raw["text"].strip():
+            return None, "innertext", reason
+        return _text_article(raw), "innertext", reason
+
+    async def _wait_until_ready(self, page: Page, readiness: str, deadline: Deadline) -> str:
+        """DOMContentLoaded 之后按就绪策略等待，返回实际满足的条件，超时返回 "timeout"。
+
+        就绪等待不使用为正文提取预留的时间。
+        """
+        remaining = deadline.remaining()
+        budget = remaining - self._extract_reserve(remaining)
+        if readiness == "adaptive":
+            budget = min(budget, self.config.readiness_max_wait)
+        if readiness == "domcontentloaded" or budget <= 0:
+            return "domcontentloaded" if readiness == "domcontentloaded" else "timeout"
+
+        waiters = {}
+        if readiness in ("adaptive", "stable"):
+            waiters["stable"] = self._wait_dom_stable(page, budget)
+        if readiness in ("adaptive", "networkidle"):
+            waiters["networkidle"] = page.wait_for_load_state("networkidle", timeout=budget * 1000)
+        if readiness == "load":
+            waiters["load"] = page.wait_for_load_state("load", timeout=budget * 1000)
+
+        return await _first_ready(waiters, budget)
+
+    def _extract_reserve(self, remaining: float) -> float:
+        """从剩余时间中为正文提取预留的时间：extract_budget，最多剩余时间的一半。"""
+        return min(self.config.extract_budget, remaining / 2)
+
+    async def _wait_dom_stable(self, page: Page, budget: float) -> bool:
+        """等待 DOM 稳定；页面在等待期间跳转（如客户端重定向）时，在新文档上重新等待。"""
+        deadline = time.monotonic() + budget
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                return await page.evaluate(
+                    DOM_STABLE_JS,
+                    {"quietMs": self.config.dom_quiet_ms, "maxMs": int(remaining * 1000)},
+                )
+            except PlaywrightTimeoutError:
+                return False
+            except PlaywrightError:
+                if page.is_closed():
+                    raise
+                # 执行上下文因跳转被销毁，等待新文档的 DOMContentLoaded
+                await page.wait_for_load_state("domcontentloaded", timeout=max(remaining, 0.001) * 1000)
+        return False
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _first_ready(waiters: dict, budget: float) -> str:
+    """并发等待多个就绪条件，返回第一个成功满足的条件名；全部失败或超时返回 "timeout"。"""
+    pending = {asyncio.ensure_future(coro): name for name, coro in waiters.items()}
+    deadline = time.monotonic() + budget
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, timeout=max(0.0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                name = pending.pop(task)
+                if task.exception() is None and task.result() is not False:
+                    return name
+        return "timeout"
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import ClassVar, Optional
 
-from browser_service import BrowserService, get_global_browser_service
+from browser_service import BrowserService, PagePriority, get_global_browser_service
 from web_dev.dev_session import DevSession
 from web_dev.exceptions import SessionCreationError, SessionNotFoundError
 
@@ -43,7 +43,7 @@ class SessionManager:
     async def create_session(self) -> str:
         async with self._operation_lock:
             try:
-                page = await self._browser_service.create_page()
+                page = await self._browser_service.create_page(priority=PagePriority.INTERACTIVE)
                 session_id = str(uuid.uuid4())
                 dev_session = DevSession(session_id, page)
                 self._sessions[session_id] = dev_session
@@ -5,6 +5,8 @@ from typing import Any
 
 from playwright.async_api import Page
 
+from browser_service import BrowserCrashedError, PagePriority
+
 from .config import BingSearchConfig
 from .exceptions import BingSearchError, PageLoadError, ResultParseError
 
@@ -126,13 +128,16 @@ class BingClient:
 
         Returns:
             搜索结果列表，每个结果包含 title, url, snippet, rank
+
+        Raises:
+            BrowserCrashedError: 搜索过程中浏览器或页面崩溃，调用方可以重试
         """
         all_results: list[dict[str, Any]] = []
         page = None
 
         try:
             # 创建页面（只创建一次，用于翻页）
-            page = await self._browser_service.create_page()
+            page = await self._browser_service.create_page(priority=PagePriority.SEARCH)
 
             # 执行首次搜索，支持重试
             max_retries = 3
@@ -169,9 +174,13 @@ class BingClient:
 
                 all_results.extend(page_results)
 
-        except BingSearchError:
+        except BrowserCrashedError:
             raise
         except Exception as e:
+            if page is not None and self._browser_service.is_page_lost(page):
+                raise BrowserCrashedError(f"搜索时浏览器崩溃: {e}") from e
+            if isinstance(e, BingSearchError):
+                raise
             raise BingSearchError(f"搜索失败: {e}") from e
         finally:
             if page:
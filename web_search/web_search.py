@@ -7,7 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from browser_service import get_global_browser_service
+from browser_service import BrowserCrashedError, get_global_browser_service
 from web_search.bing_client import BingClient
 from web_search.config import BingSearchConfig
 from web_search.exceptions import BingSearchError
@@ -102,10 +102,18 @@ async def web_search(
             browser_service=browser_service
         )
 
-        results = await client.search(
-            query=query,
-            num_results=num_results,
-        )
+        try:
+            results = await client.search(
+                query=query,
+                num_results=num_results,
+            )
+        except BrowserCrashedError as e:
+            # 搜索是幂等操作，浏览器崩溃时等待重启后透明重试一次
+            logger.warning(f"浏览器崩溃，重试一次：query='{query}', 错误: {e!s}")
+            results = await client.search(
+                query=query,
+                num_results=num_results,
+            )
 
         logger.info(f"搜索成功：query='{query}', 返回 {len(results)} 条结果")
         return create_web_search_result(